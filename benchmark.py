@@ -0,0 +1,283 @@
+""" This module benchmarks the hash table, the dictionary and the frequency analysis, saves the results as JSON and
+compares them against a stored baseline to flag regressions.
+Module consist of the following functions:
+Function: best_time, table_benchmarks, resize_benchmarks, dictionary_benchmarks, frequency_benchmarks,
+          run_benchmarks, save_results, load_results, compare, main
+
+Micro benchmarks time LinearProbeHashTable insert, lookup hit, lookup miss and delete on a table held at several
+load factors, and insert and lookups on a table grown from its default size under several resize policies, recording
+the slots it ended with to show the memory each one trades for lookup speed. Macro benchmarks time
+Dictionary.load_dictionary on the word lists and Frequency.add_file and ranking on a reference corpus. Each benchmark
+is repeated and the best time is kept, as the slower runs only measure whatever else the machine was doing. Times are
+compared per operation, so results with a different number of keys can still be compared.
+
+Usage: python benchmark.py [--output results.json] [--baseline benchmark_baseline.json] [--save-baseline]
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import Callable, Dict, List, Tuple
+from hash_table import LinearProbeHashTable
+from dictionary import Dictionary, shared_dictionary
+from frequency import Frequency
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+RESULTS_VERSION = 1  # bumped when the layout of the results changes, older files are then not compared
+REPEATS = 5  # runs of each benchmark, the best one is kept
+TABLE_KEYS = 20000  # keys stored by the micro benchmarks at each load factor
+LOAD_FACTORS = (0.1, 0.25, 0.4, 0.5)  # the table grows past half full
+RESIZE_POLICIES = ((0.5, 1.2), (0.5, 2.0), (0.7, 1.2), (0.7, 2.0), (0.9, 2.0))  # (max load factor, growth factor)
+WORD_LISTS = ('english_small.txt', 'english_large.txt', 'french.txt')
+CORPUS = '215-0.txt'
+BASELINE = 'benchmark_baseline.json'
+DEFAULT_TOLERANCE = 0.2  # slowdown past which a benchmark is flagged, 0.2 being 20% slower than the baseline
+
+
+def best_time(setup: Callable[[], object], run: Callable[[object], object], repeats: int = REPEATS) -> float:
+    """ Function returns the best time in seconds of run(setup()) over repeats runs, setup not being timed
+    :complexity: O(R*(S + T)) where R is the number of repeats, S the cost of setup and T of run
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(seconds: float, operations: int, slots: int = None) -> dict:
+    """ Function returns the JSON entry of a benchmark that ran operations operations in seconds, on a table of slots
+    slots when given
+    """
+    entry = {"seconds": seconds, "operations": operations, "per_operation": seconds / max(1, operations)}
+    if slots is not None:
+        entry["slots"] = slots
+    return entry
+
+
+def table_benchmarks(keys: int = TABLE_KEYS, load_factors: Tuple[float, ...] = LOAD_FACTORS,
+                     repeats: int = REPEATS) -> Dict[str, dict]:
+    """ Function times insert, lookup hit, lookup miss and delete of keys keys in a table sized so they fill it to
+    each load factor, without it growing
+    :raises RuntimeError: when a load factor is too high for the table to hold the keys without growing
+    :complexity: O(L*R*K) where L is the number of load factors, R the number of repeats and K the number of keys
+    """
+    words = ["word" + str(i) for i in range(keys)]
+    missing = ["missing" + str(i) for i in range(keys)]
+    results = {}
+    for load_factor in load_factors:
+        table_size = int(keys / load_factor) + 2  # the table grows once more than half its slots are taken
+
+        def empty() -> LinearProbeHashTable:
+            return LinearProbeHashTable(LinearProbeHashTable.DEFAULT_HASH_BASE, table_size)
+
+        def full() -> LinearProbeHashTable:
+            table = empty()
+            for i, word in enumerate(words):
+                table[word] = i
+            return table
+
+        def insert(table: LinearProbeHashTable) -> None:
+            for i, word in enumerate(words):
+                table[word] = i
+
+        def lookup(keys_looked_up: List[str]) -> Callable[[LinearProbeHashTable], None]:
+            def run(table: LinearProbeHashTable) -> None:
+                for word in keys_looked_up:
+                    _ = word in table
+            return run
+
+        def delete(table: LinearProbeHashTable) -> None:
+            for word in words:
+                del table[word]
+
+        filled = full()
+        if filled.rehash_count != 0:
+            raise RuntimeError("The table grew, the load factor {} is too high".format(load_factor))
+        name = "table.{}[load={}]"
+        results[name.format("insert", load_factor)] = result(best_time(empty, insert, repeats), keys)
+        results[name.format("lookup_hit", load_factor)] = result(best_time(lambda: filled, lookup(words), repeats),
+                                                                 keys)
+        results[name.format("lookup_miss", load_factor)] = result(best_time(lambda: filled, lookup(missing), repeats),
+                                                                  keys)
+        results[name.format("delete", load_factor)] = result(best_time(full, delete, repeats), keys)
+    return results
+
+
+def resize_benchmarks(keys: int = TABLE_KEYS, policies: Tuple[Tuple[float, float], ...] = RESIZE_POLICIES,
+                      repeats: int = REPEATS) -> Dict[str, dict]:
+    """ Function times inserting keys keys in a table of the default size, which grows on the way, and looking them
+    and as many missing keys up, for each (max load factor, growth factor) policy, recording the final table size
+    :complexity: O(P*R*K) where P is the number of policies, R the number of repeats and K the number of keys
+    """
+    words = ["word" + str(i) for i in range(keys)]
+    missing = ["missing" + str(i) for i in range(keys)]
+    results = {}
+    for max_load_factor, growth_factor in policies:
+        def empty() -> LinearProbeHashTable:
+            return LinearProbeHashTable(max_load_factor=max_load_factor, growth_factor=growth_factor)
+
+        def insert(table: LinearProbeHashTable) -> None:
+            for i, word in enumerate(words):
+                table[word] = i
+
+        def lookup(keys_looked_up: List[str]) -> Callable[[LinearProbeHashTable], None]:
+            def run(table: LinearProbeHashTable) -> None:
+                for word in keys_looked_up:
+                    _ = word in table
+            return run
+
+        filled = empty()
+        insert(filled)
+        slots = len(filled.table)
+        name = "resize.{}[max_load={},growth={}]"
+        results[name.format("insert", max_load_factor, growth_factor)] = result(best_time(empty, insert, repeats), keys,
+                                                                                slots)
+        for operation, looked_up in (("lookup_hit", words), ("lookup_miss", missing)):
+            results[name.format(operation, max_load_factor, growth_factor)] = result(
+                best_time(lambda: filled, lookup(looked_up), repeats), keys, slots)
+    return results
+
+
+def dictionary_benchmarks(filenames: Tuple[str, ...] = WORD_LISTS, repeats: int = REPEATS) -> Dict[str, dict]:
+    """ Function times Dictionary.load_dictionary on each word list that exists, the others are skipped
+    :complexity: O(F*R*N) where F is the number of files, R the number of repeats and N the words of a file
+    """
+    results = {}
+    for filename in filenames:
+        if not os.path.isfile(filename):
+            print("Skipping", filename, "which doesn't exist", file=sys.stderr)
+            continue
+        words = []  # words loaded by each run, kept so the file isn't loaded once more just to count them
+        seconds = best_time(lambda: Dictionary(Frequency.HASH_BASE, Frequency.TABLE_SIZE),
+                            lambda dictionary: words.append(dictionary.load_dictionary(filename)), repeats)
+        results["dictionary.load_dictionary[{}]".format(filename)] = result(seconds, words[-1])
+    return results
+
+
+def frequency_benchmarks(corpus: str = CORPUS, word_list: str = 'english_large.txt',
+                         repeats: int = REPEATS) -> Dict[str, dict]:
+    """ Function times Frequency.add_file and ranking on corpus, checked against the words of word_list, which is
+    loaded once and shared by the runs. Nothing is timed when either file doesn't exist
+    :complexity: O(R*N) where R is the number of repeats and N the size of the corpus
+    """
+    if not os.path.isfile(corpus) or not os.path.isfile(word_list):
+        print("Skipping the frequency benchmarks,", corpus, "or", word_list, "doesn't exist", file=sys.stderr)
+        return {}
+    shared = shared_dictionary(word_list, Frequency.HASH_BASE, Frequency.TABLE_SIZE)
+
+    def fresh() -> Frequency:
+        return Frequency(dictionary=shared)
+
+    counted = fresh()
+    counted.add_file(corpus)
+    words = len(counted.hash_table)
+    return {"frequency.add_file[{}]".format(corpus):
+            result(best_time(fresh, lambda frequency: frequency.add_file(corpus), repeats), os.path.getsize(corpus)),
+            "frequency.ranking[{}]".format(corpus):
+            result(best_time(lambda: counted, lambda frequency: frequency.ranking(), repeats), words)}
+
+
+def run_benchmarks(keys: int = TABLE_KEYS, repeats: int = REPEATS, macro: bool = True) -> dict:
+    """ Function runs the micro benchmarks, and the macro benchmarks unless macro is False, and returns the results
+    with the environment they ran in
+    :complexity: see table_benchmarks, dictionary_benchmarks and frequency_benchmarks
+    """
+    benchmarks = table_benchmarks(keys, repeats=repeats)
+    benchmarks.update(resize_benchmarks(keys, repeats=repeats))
+    if macro:
+        benchmarks.update(dictionary_benchmarks(repeats=repeats))
+        benchmarks.update(frequency_benchmarks(repeats=repeats))
+    return {"version": RESULTS_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "repeats": repeats,
+            "benchmarks": benchmarks}
+
+
+def save_results(results: dict, filename: str) -> None:
+    """ Function writes results to filename as JSON """
+    with open(filename, "w", encoding="UTF-8") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def load_results(filename: str) -> dict:
+    """ Function reads results saved by save_results
+    :raises ValueError: when the file holds results of another version
+    """
+    with open(filename, encoding="UTF-8") as handle:
+        results = json.load(handle)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError("Results version {} can't be compared with version {}".format(results.get("version"),
+                                                                                      RESULTS_VERSION))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Tuple[str, float, float]]:
+    """ Function returns a (name, baseline time, time) tuple per operation for each benchmark of results more than
+    tolerance slower than in baseline. Benchmarks that are not in both are ignored
+    :complexity: O(B) where B is the number of benchmarks
+    """
+    regressions = []
+    for name, entry in sorted(results["benchmarks"].items()):
+        if name in baseline["benchmarks"]:
+            before = baseline["benchmarks"][name]["per_operation"]
+            if entry["per_operation"] > before * (1 + tolerance):
+                regressions.append((name, before, entry["per_operation"]))
+    return regressions
+
+
+def main() -> None:
+    """ Command line: runs the benchmarks, prints them against the baseline, exits with status 1 on a regression """
+    parser = argparse.ArgumentParser(description="Hash table, dictionary and frequency benchmarks")
+    parser.add_argument("--output", help="file the results are saved to as JSON")
+    parser.add_argument("--baseline", default=BASELINE, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="slowdown flagged as a regression, 0.2 being 20%% slower")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--keys", type=int, default=TABLE_KEYS, help="keys of the micro benchmarks")
+    parser.add_argument("--micro", action="store_true", help="only run the micro benchmarks")
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(arguments.keys, arguments.repeats, macro=not arguments.micro)
+    if arguments.output:
+        save_results(results, arguments.output)
+
+    baseline = None
+    if os.path.isfile(arguments.baseline) and not arguments.save_baseline:
+        baseline = load_results(arguments.baseline)
+    for name, entry in sorted(results["benchmarks"].items()):
+        line = "{:50} {:12.1f} ns/op".format(name, entry["per_operation"] * 1e9)
+        if "slots" in entry:
+            line += " {:9} slots".format(entry["slots"])
+        if baseline is not None and name in baseline["benchmarks"]:
+            before = baseline["benchmarks"][name]["per_operation"]
+            line += "  {:+7.1%}".format(entry["per_operation"] / before - 1)
+        print(line)
+
+    if arguments.save_baseline:
+        save_results(results, arguments.baseline)
+        print("Saved the baseline to", arguments.baseline)
+    elif baseline is None:
+        print("No baseline to compare against, save one with --save-baseline")
+    else:
+        regressions = compare(results, baseline, arguments.tolerance)
+        for name, before, after in regressions:
+            print("REGRESSION {}: {:.1f} ns/op -> {:.1f} ns/op".format(name, before * 1e9, after * 1e9))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+""" Bloom Filter ADT
+Defines a set of keys answering "definitely not in the set" or "maybe in the set", in a few bits per key,
+used in front of a hash table so most lookups of keys it doesn't hold never touch the table.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import Iterable
+import math
+
+
+class BloomFilter:
+    """
+    Bloom Filter of string keys
+
+    The bit positions of a key are derived from Python's hash of the key by double hashing. That hash is salted
+    per process, which is fine as the filter only lives in memory, and it's computed in C so checking the filter
+    costs much less than probing the table.
+
+    constants:
+        DEFAULT_ERROR_RATE: false positive rate used when none is given
+        HASH_MASK: keeps the 64 low bits of a hash, which are split in two 32 bit hashes
+
+    attributes:
+        capacity: number of keys the filter is sized for, the false positive rate goes up past it
+        error_rate: false positive rate expected at capacity
+        size: number of bits
+        hash_count: number of bits set per key
+        bits: bit array
+        count: number of keys added
+        hits: number of checks answered "maybe", which then have to look the table up
+        misses: number of checks answered "definitely not"
+    """
+    DEFAULT_ERROR_RATE = 0.01
+    HASH_MASK = (1 << 64) - 1
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        """
+        :complexity: O(M) where M is the number of bits
+        :raises ValueError: when the error rate is not strictly between 0 and 1
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate should be between 0 and 1.")
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # ----- optimal number of bits and of hashes for capacity keys at error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __positions(self, key: str) -> Iterable[int]:
+        """
+        Returns the bit positions of key
+        :complexity: O(K + H) where K is the size of the key and H the number of hashes
+        """
+        key_hash = hash(key) & self.HASH_MASK
+        first, second = key_hash & 0xFFFFFFFF, (key_hash >> 32) | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        """
+        Adds key to the filter
+        :complexity: O(K + H) where K is the size of the key and H the number of hashes
+        """
+        for position in self.__positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Returns False when key was definitely not added, True when it may have been, and counts the answer
+        :complexity: O(K + H) where K is the size of the key and H the number of hashes
+        """
+        for position in self.__positions(key):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                self.misses += 1
+                return False
+        self.hits += 1
+        return True
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys added
+        :complexity: O(1)
+        """
+        return self.count
+
+    def is_full(self) -> bool:
+        """
+        Returns whether the filter holds as many keys as it was sized for
+        :complexity: O(1)
+        """
+        return self.count >= self.capacity
+
+    def statistics(self) -> tuple:
+        """
+        Returns the hits and misses of the filter
+        :complexity: O(1)
+        """
+        return self.hits, self.misses
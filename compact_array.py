@@ -0,0 +1,88 @@
+""" Compact Array ADT
+Defines a fixed size array of (key, integer value) pairs stored as parallel columns,
+so no tuple is kept per slot and the values are packed into a typed array.
+Used by LinearProbeHashTable as its compact storage backend.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from array import array
+from typing import Tuple, Union
+
+
+class CompactArray:
+    """
+    Compact Array of (key, value) pairs
+
+    Slots that don't hold a pair (empty slots, or a marker such as a tombstone)
+    are stored as-is in the key column.
+
+    constants:
+        VALUE_TYPECODE: array typecode of the value column, signed 64 bit integers
+
+    attributes:
+        keys: key of each slot, or whatever non pair object was stored in it
+        values: value of each slot holding a pair
+        occupied: 1 for each slot holding a pair, 0 otherwise
+    """
+    VALUE_TYPECODE = 'q'
+
+    def __init__(self, length: int) -> None:
+        """
+        :complexity: O(N) where N is the length
+        :raises ValueError: when the length is not positive
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        self.keys = [None] * length
+        self.values = array(self.VALUE_TYPECODE, bytes(array(self.VALUE_TYPECODE).itemsize * length))
+        self.occupied = bytearray(length)
+
+    def __len__(self) -> int:
+        """
+        Returns the length of the array
+        :complexity: O(1)
+        """
+        return len(self.keys)
+
+    def __getitem__(self, index: int) -> Union[Tuple[str, int], object]:
+        """
+        Returns the (key, value) pair at index, or the object stored there if it isn't a pair
+        :complexity: O(1)
+        """
+        if self.occupied[index]:
+            return self.keys[index], self.values[index]
+        return self.keys[index]
+
+    def __setitem__(self, index: int, item: Union[Tuple[str, int], object]) -> None:
+        """
+        Stores a (key, value) pair, or any other object such as None, at index
+        :raises TypeError: when the value of the pair is not an integer
+        :raises OverflowError: when the value of the pair doesn't fit in 64 bits
+        :complexity: O(1)
+        """
+        if isinstance(item, tuple):
+            self.values[index] = item[1]
+            self.keys[index] = item[0]
+            self.occupied[index] = 1
+        else:
+            self.keys[index] = item
+            self.values[index] = 0
+            self.occupied[index] = 0
+
+    def __iter__(self):
+        """
+        Iterates over the slots of the array
+        :complexity: O(N) where N is the length
+        """
+        for index in range(len(self.keys)):
+            yield self[index]
+
+
+def hash_array(length: int) -> array:
+    """
+    Returns a zeroed typed array able to hold length full width hashes
+    :complexity: O(N) where N is the length
+    """
+    return array('q', bytes(array('q').itemsize * length))
@@ -1,16 +1,26 @@
 """ This module implements the dictionary by a Hash Table using Linear Probing for conflict resolution.
 Module consist of the following class and methods:
-Class: Dictionary, Statistics
-Method: load_dictionary, add_word, find_word, delete_word, menu
+Class: Dictionary, SharedDictionary, Statistics
+Method: load_dictionary, save_snapshot, load_snapshot, freeze, add_word, find_word, delete_word, add_words,
+        find_words, delete_words, menu, get
+Function: load_statistics_job, shared_dictionary
 """
 
 __author__ = "Derek Chukwudi Anyanwu"
 
 
-from typing import Tuple
+from typing import Iterable, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from hash_table import LinearProbeHashTable
+from snapshot import SnapshotHashTable, save_snapshot
+from perfect_hash import PerfectHashTable
+from bloom_filter import BloomFilter
+from sharded_hash_table import ShardedHashTable
+from profiled_hash_table import ProfiledHashTable
 import timeit
+import time
 import string
+import threading
 import csv
 import os
 
@@ -24,14 +34,43 @@ class Dictionary:
     """Creates a new Hash Table with the given hash base and initial table size"""
     VALUE = 1  # associated data of the item in the hash table
     
-    def __init__(self, hash_base: int, table_size: int) -> None:
-        """ Construction function that initialize an instance of class LinearProbeTable with variable self.hash_table"""
+    def __init__(self, hash_base: int, table_size: int, robin_hood: bool = False, tombstones: bool = False,
+                 incremental_resize: bool = False, compact: bool = False, collect_statistics: bool = True,
+                 bloom_error_rate: float = None, probe_sequence: str = LinearProbeHashTable.LINEAR_PROBING,
+                 shards: int = None, hash_function: str = LinearProbeHashTable.POLYNOMIAL_HASH,
+                 profile: bool = False) -> None:
+        """ Construction function that initialize an instance of class LinearProbeTable with variable self.hash_table,
+        and a Bloom filter of the words with the given false positive rate in front of find_word when one is given.
+        With a number of shards, the hash table is a thread-safe ShardedHashTable instead, so find_word, add_word
+        and delete_word can be called from several threads at once. hash_function is one of
+        LinearProbeHashTable.HASH_FUNCTIONS. With profile, the hash table is a ProfiledHashTable recording its
+        operations in hash_table.profile
+        :raises ValueError: when shards are asked with a Bloom filter, which is not thread-safe, or with profile
+        """
+        if shards is not None and bloom_error_rate is not None:
+            raise ValueError("The Bloom filter of a dictionary can't be shared between threads")
+        if shards is not None and profile:
+            raise ValueError("Sharded dictionaries can't be profiled")
         self.count = 0  # how many items have been stored
         self.hash_base = hash_base
         self.table_size = table_size
         
         # created a Dictionary instance of LinearProbeHashTable
-        self.hash_table = LinearProbeHashTable(self.hash_base, self.table_size)
+        if profile:
+            self.hash_table = ProfiledHashTable(self.hash_base, self.table_size, robin_hood, tombstones,
+                                                incremental_resize, compact, collect_statistics, probe_sequence,
+                                                hash_function=hash_function)
+        elif shards is None:
+            self.hash_table = LinearProbeHashTable(self.hash_base, self.table_size, robin_hood, tombstones,
+                                                   incremental_resize, compact, collect_statistics, probe_sequence,
+                                                   hash_function=hash_function)
+        else:
+            self.hash_table = ShardedHashTable(self.hash_base, self.table_size, shards, robin_hood, tombstones,
+                                               incremental_resize, compact, collect_statistics, probe_sequence,
+                                               hash_function)
+        self.frozen = None  # perfect hash table of the words find_word uses, until a word is added or deleted
+        # Bloom filter of the words, sized like the table which holds up to half its size before it grows
+        self.bloom = None if bloom_error_rate is None else BloomFilter(table_size // 2, bloom_error_rate)
         self.duration = 0  # Total time taken to add item from file to dictionary
     
     def load_dictionary(self, filename: str, time_limit: int = None) -> int:
@@ -43,6 +82,7 @@ class Dictionary:
         """
         startTime = timeit.default_timer()  # starting time counter
         deltaTime = 0
+        self.frozen = None
         try:
             # with the with-statement, no need to call file.close()
             with open(filename, 'r', encoding="UTF-8") as handle:  # Open file on read mode
@@ -55,6 +95,7 @@ class Dictionary:
                         deltaTime = time_limit  #
                         raise TimeoutError
                     self.hash_table[key] = self.VALUE  # assigning 1 to the key and storing it in the dictionary
+                    self.__filter_add(key)
                     self.count += 1  # increment the number of words in the dictionary
         except TimeoutError:  # catches error when time run out reading a file into a dictionary
             raise TimeoutError
@@ -65,6 +106,59 @@ class Dictionary:
             self.duration = deltaTime  # Total time it took to read the file
             return self.count  # always runs
     
+    def save_snapshot(self, filename: str) -> int:
+        """ Saves the words of the dictionary to a binary snapshot file which load_snapshot can map straight
+        back in, and returns the number of words saved.
+        @complexity: O(N + n*m) where N is the snapshot table size, n the number of words and m their length
+        """
+        return save_snapshot(self.hash_table, filename)
+    
+    def load_snapshot(self, filename: str) -> int:
+        """ Replaces the hash table by a read-only, memory mapped snapshot saved by save_snapshot, so nothing is
+        parsed or inserted and processes loading the same file share its pages. Returns the number of words.
+        
+        :post-condition: add_word and delete_word raise TypeError as the snapshot is read-only
+        :raises ValueError: when the file is not a snapshot
+        @complexity: O(1)
+        """
+        self.hash_table = SnapshotHashTable(filename)
+        self.frozen = None
+        self.count = len(self.hash_table)
+        if self.bloom is not None:
+            self.__rebuild_filter(self.count)
+        return self.count
+    
+    def __filter_add(self, word: str) -> None:
+        """ Adds word to the Bloom filter, when there is one, rebuilding it twice as big once it is full
+        @complexity: O(m) amortised where m is the length of the word
+        """
+        if self.bloom is None:
+            return
+        if self.bloom.is_full():
+            self.__rebuild_filter(2 * self.bloom.capacity)
+        self.bloom.add(word)
+    
+    def __rebuild_filter(self, capacity: int) -> None:
+        """ Replaces the Bloom filter by one of the words of the hash table sized for capacity words,
+        keeping the hit and miss counts
+        @complexity: O(N + n*m) where N is the table size, n the number of words and m their length
+        """
+        bloom = BloomFilter(capacity, self.bloom.error_rate)
+        bloom.hits, bloom.misses = self.bloom.hits, self.bloom.misses
+        for item in self.hash_table:
+            if item is not None:
+                bloom.add(item[0])
+        self.bloom = bloom
+    
+    def freeze(self) -> PerfectHashTable:
+        """ Builds a minimal perfect hash table of the words that find_word then uses, so each lookup reads a single
+        slot of a table with no empty slot. The hash table is kept as is: adding or deleting a word goes to it and
+        drops the frozen table, and freeze can be called again to rebuild it from the hash table.
+        @complexity: O(N + n*m) expected, where N is the table size, n the number of words and m their length
+        """
+        self.frozen = PerfectHashTable(self.hash_table)
+        return self.frozen
+    
     def add_word(self, word: str) -> None:
         """ Method adds the given word to the Hash Table with integer 1 as their associated data.
 
@@ -75,6 +169,8 @@ class Dictionary:
         if word not in string.ascii_lowercase:
             word = word.lower()  # convert all the char to its lowercase
         self.hash_table[word] = self.VALUE
+        self.__filter_add(word)
+        self.frozen = None
     
     def utility(self, filename, max_time: int = None):
         """ Utility method of hash table returns the hash table, total time adding item to hash table
@@ -85,13 +181,15 @@ class Dictionary:
         return self.hash_table, self.duration, self.count
     
     def find_word(self, word: str) -> bool:
-        """Determines whether the item is in the hash table
+        """Determines whether the item is in the hash table, words the Bloom filter rules out are not looked up
          :complexity: O(1) in best case, O(N) in worst case as n the number of char to convert to lower
          """
         if word not in string.ascii_lowercase:
             word = word.lower()
+        if self.bloom is not None and word not in self.bloom:
+            return False
         try:
-            _ = self.hash_table[word]
+            _ = (self.hash_table if self.frozen is None else self.frozen)[word]
         except KeyError:
             return False
         else:
@@ -113,6 +211,44 @@ class Dictionary:
             # del self.hash_table[word]
             
             self.hash_table.__delitem__(word)
+            self.frozen = None
+    
+    def add_words(self, words: Iterable[str]) -> None:
+        """ Method adds every word in lower case to the Hash Table with integer 1 as their associated data, growing
+        the table once for all of them
+        @complexity: O(n*m) where n is the number of words and m their length, plus O(N) to grow the table
+        """
+        words = [word.lower() for word in words]
+        self.hash_table.insert_many((word, self.VALUE) for word in words)
+        for word in words:
+            self.__filter_add(word)
+        self.frozen = None
+    
+    def find_words(self, words: Iterable[str]) -> List[bool]:
+        """ Determines whether each word, in lower case, is in the hash table, looking up all the words the Bloom
+        filter doesn't rule out in one batch
+        @complexity: O(n*m) in best case, O(n*(m + N)) in worst case, where n is the number of words, m their
+        length and N the table size
+        """
+        words = [word.lower() for word in words]
+        if self.bloom is None:
+            return (self.hash_table if self.frozen is None else self.frozen).contains_many(words)
+        candidates = [index for index, word in enumerate(words) if word in self.bloom]
+        results = [False] * len(words)
+        found = (self.hash_table if self.frozen is None else self.frozen).contains_many(
+            [words[index] for index in candidates])
+        for index, result in zip(candidates, found):
+            results[index] = result
+        return results
+    
+    def delete_words(self, words: Iterable[str]) -> List[bool]:
+        """ Deletes every word, in lower case, from the Hash Table and returns whether each one was in it
+        @complexity: see delete_word, per word
+        """
+        results = self.hash_table.delete_many([word.lower() for word in words])
+        if any(results):
+            self.frozen = None
+        return results
     
     def command_read_file(self, filename: str) -> None:
         """Read a file into a dictionary.
@@ -243,48 +379,147 @@ class Dictionary:
         self.menu()  # call menu back until user enter 5, exit
 
 
+class SharedDictionary:
+    """ Read-only dictionary loaded lazily from a word list the first time it is asked for, and loaded again when the
+    modification time of the word list changes. Readers must only look words up in the Dictionary returned by get,
+    so any number of threads can use it at once: a reload builds a new Dictionary and swaps it in whole, readers
+    still holding the previous one carry on with it.
+    
+    attributes:
+        filename: word list, one word per line
+        hash_base: base prime used in hash function
+        table_size: initial table size of the dictionary
+        bloom_error_rate: false positive rate of the Bloom filter put in front of the dictionary, None for no filter
+        lock: lock held while the dictionary is loaded, so concurrent first readers load it once
+        loaded: (Dictionary, modification time of the word list) pair, None until the first get
+    """
+    
+    def __init__(self, filename: str, hash_base: int, table_size: int, bloom_error_rate: float = None) -> None:
+        """ Nothing is loaded until the first get
+        :complexity: O(1)
+        """
+        self.filename = filename
+        self.hash_base = hash_base
+        self.table_size = table_size
+        self.bloom_error_rate = bloom_error_rate
+        self.lock = threading.Lock()
+        self.loaded = None
+    
+    def get(self) -> Dictionary:
+        """ Returns the dictionary of the word list, loading it when it hasn't been or the word list was modified
+        since. The word list is not checked again while it doesn't exist, the last loaded dictionary is kept.
+        
+        :post-condition: the returned Dictionary must not be modified
+        @complexity: O(1) when loaded, O(n*m) to load n words of length m
+        """
+        try:
+            modified = os.stat(self.filename).st_mtime_ns
+        except OSError:
+            modified = None
+        loaded = self.loaded
+        if loaded is not None and (modified is None or loaded[1] == modified):
+            return loaded[0]
+        
+        with self.lock:
+            loaded = self.loaded  # another reader may have loaded it while this one waited
+            if loaded is None or (modified is not None and loaded[1] != modified):
+                # the word list fills a good part of the table, so its slots are kept in compact arrays, and
+                # no probe statistics are recorded as nothing is written once loaded
+                dictionary = Dictionary(self.hash_base, self.table_size, compact=True, collect_statistics=False,
+                                        bloom_error_rate=self.bloom_error_rate)
+                dictionary.load_dictionary(self.filename, time_limit=None)
+                loaded = (dictionary, modified)
+                self.loaded = loaded
+        return loaded[0]
+
+
+shared_dictionaries = {}  # process-wide SharedDictionary of each (filename, hash_base, table_size, bloom_error_rate)
+shared_dictionaries_lock = threading.Lock()
+
+
+def shared_dictionary(filename: str, hash_base: int, table_size: int,
+                      bloom_error_rate: float = None) -> SharedDictionary:
+    """ Function returns the process-wide SharedDictionary of the word list filename, creating it on first use,
+    so every caller asking for the same word list, table and Bloom filter shares one loaded dictionary.
+    @complexity: O(1)
+    """
+    key = (os.path.abspath(filename), hash_base, table_size, bloom_error_rate)
+    with shared_dictionaries_lock:
+        if key not in shared_dictionaries:
+            shared_dictionaries[key] = SharedDictionary(*key)
+        return shared_dictionaries[key]
+
+
 class Statistics:
     """ Class collect, organize, analyze, interprete and present words, time, collision_count,
     probe_total, probe_max, rehash_count.
     """
     
-    def load_statistics(self, hash_base: int, table_size: int, filename: str, max_time: int) -> Tuple:
-        """ Method creates a new dictionary with hash_base and table_size
+    def load_statistics(self, hash_base: int, table_size: int, filename: str, max_time: int,
+                        robin_hood: bool = False, probe_sequence: str = LinearProbeHashTable.LINEAR_PROBING) -> Tuple:
+        """ Method creates a new dictionary with hash_base, table_size and probe_sequence
         :@complexity: Best O(n*m) and worst O(n*m) from reading the file in the hash table
         """
-        container = Dictionary(hash_base, table_size)  # creating object of the Dictionary
+        # creating object of the Dictionary
+        container = Dictionary(hash_base, table_size, robin_hood, probe_sequence=probe_sequence)
         hash_table, deltaTime, table_length = container.utility(filename, max_time)
         collision_count, probe_total, probe_max, rehash_count = hash_table.statistics()
         return table_length, deltaTime, collision_count, probe_total, probe_max, rehash_count
     
-    def table_load_statistics(self, max_time: int) -> None:
+    def probing_comparison(self, hash_base: int, table_size: int, filename: str, max_time: int) -> list:
+        """ Method loads the file with plain linear probing, Robin Hood insertion, quadratic probing and double
+        hashing and returns a row (mode, words, displacement total, displacement max, time) for each, where the
+        displacements are the probe lengths needed to look up the stored words.
+        :@complexity: Best O(n*m) and worst O(n*m) from reading the file in the hash table
+        """
+        modes = [(LinearProbeHashTable.LINEAR_PROBING, False, LinearProbeHashTable.LINEAR_PROBING),
+                 ("robin hood", True, LinearProbeHashTable.LINEAR_PROBING),
+                 (LinearProbeHashTable.QUADRATIC_PROBING, False, LinearProbeHashTable.QUADRATIC_PROBING),
+                 (LinearProbeHashTable.DOUBLE_HASHING, False, LinearProbeHashTable.DOUBLE_HASHING)]
+        rows = []
+        for mode, robin_hood, probe_sequence in modes:
+            container = Dictionary(hash_base, table_size, robin_hood, probe_sequence=probe_sequence)
+            hash_table, deltaTime, table_length = container.utility(filename, max_time)
+            displacement_total, displacement_max = hash_table.displacement_statistics()
+            rows.append((mode, table_length, displacement_total, displacement_max, deltaTime))
+        return rows
+    
+    def table_load_statistics(self, max_time: int, workers: int = None, sweep_time: int = None,
+                              probe_sequences: tuple = None) -> None:
         """ method for each of these dictionaries and each combination of the values specified in the table below for TABLESIZE
         and b in the universal hash function, uses load_statistics to time how long it takes for load_dictionary to run
         and prints a line to file output task2.csv
+        The combinations run in a pool of workers processes (one per CPU by default, in this process when 1) and
+        the lines keep the order of the combinations. max_time limits each combination, sweep_time the whole sweep.
+        With probe_sequences, e.g. LinearProbeHashTable.PROBE_SEQUENCES, each combination is also run with each
+        probe sequence, which is added as a last column.
         @complexity: Best O(1) and worst O(n) as n complexity of summing the prochainlength
         """
         files = ['english_small.txt', 'english_large.txt', 'french.txt']
         bases = [1, 27183, 250726]
         table_sizes = [250727, 402221, 1000081]
-        combination_list = []
-        for file in files:
-            for base in bases:
-                for table_size in table_sizes:
-                    table_length, elapsed_time, collision_count, probe_total, probe_max, rehash_count = self.load_statistics(
-                        base, table_size, file, max_time)
-                    
-                    # append to combinationsList at each iteration
-                    combination_list.append((file, table_size, base, table_length, collision_count, probe_total,
-                                             probe_max, rehash_count, elapsed_time))
+        deadline = None if sweep_time is None else time.time() + sweep_time
+        jobs = [(file, base, table_size, max_time, deadline)
+                for file in files for base in bases for table_size in table_sizes]
+        header = ["File Name", "Table Size", "Hash Base", "Words", "Collisions", "Probes", "Probe Max", "Rehash",
+                  "Time"]
+        if probe_sequences is not None:
+            jobs = [job + (probe_sequence,) for job in jobs for probe_sequence in probe_sequences]
+            header.append("Probe Sequence")
+        
+        if workers == 1:
+            combination_list = [load_statistics_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map hands back the results in the order of the jobs, whichever finishes first
+                combination_list = list(executor.map(load_statistics_job, jobs))
         
         filename = "output_task2.csv"
         if os.path.isfile(filename):  # if the file already exists, remove it.
             os.remove(filename)
             outfile2 = open('./output_task2.csv', 'w')
             writer = csv.writer(outfile2)
-            writer.writerow(
-                ["File Name", "Table Size", "Hash Base", "Words", "Collisions", "Probes",
-                 "Probe Max", "Rehash", "Time"])  # Heading of the csv file
+            writer.writerow(header)  # Heading of the csv file
             writer.writerows(combination_list)
             outfile2.close()
         
@@ -292,13 +527,31 @@ class Statistics:
             # Saving to csv
             outfile2 = open('./output_task2.csv', 'w')
             writer = csv.writer(outfile2)
-            writer.writerow(
-                ["File Name", "Table Size", "Hash Base", "Words", "Collisions", "Probes",
-                 "Probe Max", "Rehash", "Time"])  # Heading of the csv file
+            writer.writerow(header)  # Heading of the csv file
             writer.writerows(combination_list)
             outfile2.close()
 
 
+def load_statistics_job(job: Tuple) -> Tuple:
+    """ Function runs Statistics.load_statistics for one (file, base, table_size, max_time, deadline) combination of
+    Statistics.table_load_statistics and returns its line of output_task2.csv. The time limit is cut short so the
+    load ends by the deadline (a time.time() value, or None). Kept at module level so worker processes can run it.
+    A probe sequence can follow the deadline in the job, it is then used for the load and added to the line.
+    @complexity: Best O(n*m) and worst O(n*m) from reading the file in the hash table
+    """
+    file, base, table_size, max_time, deadline = job[:5]
+    probe_sequence = job[5] if len(job) > 5 else LinearProbeHashTable.LINEAR_PROBING
+    time_limit = max_time
+    if deadline is not None:
+        remaining = max(0, deadline - time.time())
+        time_limit = remaining if time_limit is None else min(time_limit, remaining)
+    
+    table_length, elapsed_time, collision_count, probe_total, probe_max, rehash_count = Statistics().load_statistics(
+        base, table_size, file, time_limit, probe_sequence=probe_sequence)
+    line = file, table_size, base, table_length, collision_count, probe_total, probe_max, rehash_count, elapsed_time
+    return line + job[5:]
+
+
 #
 # if __name__ == '__main__':
 #     "The main function to test time consumed for each combination of the values for table size and b"
@@ -0,0 +1,191 @@
+""" This module serves a Dictionary over a local TCP or Unix socket with asyncio, and load tests such a server.
+Module consist of the following class and functions:
+Class: DictionaryServer
+Function: serve, load_test, main
+
+Protocol: one request per line, "FIND word", "ADD word" or "DELETE word", answered in order by one line each:
+"1" or "0" for FIND, "OK" for ADD, "OK" or "MISSING" for DELETE and "ERROR message" for anything else.
+Clients may pipeline requests, sending more before reading the answers.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import List, Optional, Tuple
+from dictionary import Dictionary
+import argparse
+import asyncio
+import random
+import time
+
+
+class DictionaryServer:
+    """ Answers the requests of any number of connections against one Dictionary. The requests received by all the
+    connections are queued and answered together once per event loop tick, so pipelined requests are handled in
+    batches and the dictionary is only ever used from the event loop thread.
+
+    constants:
+        READ_SIZE: most bytes read from a connection at a time
+
+    attributes:
+        dictionary: dictionary the requests are answered from
+        pending: (request line, future of its answer) pairs waiting for the next batch
+        request_count: number of requests answered
+        batch_count: number of batches the requests were answered in
+    """
+    READ_SIZE = 1 << 16
+
+    def __init__(self, dictionary: Dictionary) -> None:
+        self.dictionary = dictionary
+        self.pending = []
+        self.request_count = 0
+        self.batch_count = 0
+
+    def answer(self, line: str) -> str:
+        """ Returns the answer to one request line
+        :complexity: see Dictionary.find_word, add_word and delete_word
+        """
+        command, _, word = line.strip().partition(" ")
+        command = command.upper()
+        if not word:
+            return "ERROR expected a command and a word"
+        if command == "FIND":
+            return "1" if self.dictionary.find_word(word) else "0"
+        if command == "ADD":
+            self.dictionary.add_word(word)
+            return "OK"
+        if command == "DELETE":
+            try:
+                self.dictionary.delete_word(word)
+            except KeyError:
+                return "MISSING"
+            return "OK"
+        return "ERROR unknown command " + command
+
+    def __flush(self) -> None:
+        """ Answers every pending request as one batch. A request that fails, such as a write to a read-only
+        dictionary, is answered with an error, so the rest of the batch is still answered
+        :complexity: O(R) dictionary operations where R is the number of pending requests
+        """
+        batch, self.pending = self.pending, []
+        for line, answer in batch:
+            if not answer.cancelled():
+                try:
+                    result = self.answer(line)
+                except Exception as error:  # reported to the client that sent the request
+                    result = "ERROR " + str(error)
+                answer.set_result(result)
+        self.request_count += len(batch)
+        self.batch_count += 1
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Queues the complete request lines of each read of the connection for the next batch and writes their
+        answers back together, until the client closes the connection
+        """
+        loop = asyncio.get_running_loop()
+        partial = b""  # start of a request line cut off at the end of the previous read
+        try:
+            while True:
+                data = await reader.read(self.READ_SIZE)
+                if not data:
+                    break
+                lines = (partial + data).split(b"\n")
+                partial = lines.pop()
+                answers = []
+                for line in lines:
+                    if not self.pending:
+                        loop.call_soon(self.__flush)  # first request of the batch, answer them on the next tick
+                    answers.append(loop.create_future())
+                    self.pending.append((line.decode("UTF-8", "replace"), answers[-1]))
+                if answers:
+                    writer.write(("\n".join(await asyncio.gather(*answers)) + "\n").encode("UTF-8"))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(dictionary: Dictionary, host: str = "127.0.0.1", port: int = 0, path: str = None) \
+        -> Tuple[DictionaryServer, asyncio.AbstractServer]:
+    """ Function starts serving dictionary on a TCP port of host (a free one when port is 0), or on the Unix socket
+    path when one is given, and returns the DictionaryServer and the listening asyncio server
+    """
+    server = DictionaryServer(dictionary)
+    if path is not None:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=path)
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host=host, port=port)
+    return server, listener
+
+
+async def load_test(words: List[str], clients: int, requests: int, pipeline: int = 16, host: str = "127.0.0.1",
+                    port: int = None, path: str = None, seed: Optional[int] = 0) -> dict:
+    """ Function runs clients concurrent connections, each sending requests FIND requests of random words in windows
+    of pipeline requests, and returns the throughput (requests per second) and the p50 and p99 latencies (seconds
+    from sending a window to receiving the answer of a request of it) over all the requests
+    """
+    generator = random.Random(seed)
+    latencies = []
+
+    async def client() -> None:
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for start in range(0, requests, pipeline):
+                window = min(pipeline, requests - start)
+                batch = "".join("FIND " + generator.choice(words) + "\n" for _ in range(window))
+                sent = time.perf_counter()
+                writer.write(batch.encode("UTF-8"))
+                await writer.drain()
+                for _ in range(window):
+                    await reader.readline()
+                    latencies.append(time.perf_counter() - sent)
+        finally:
+            writer.close()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start_time
+    latencies.sort()
+    return {"requests": len(latencies),
+            "throughput": len(latencies) / elapsed if elapsed > 0 else 0,
+            "p50": latencies[len(latencies) // 2] if latencies else 0,
+            "p99": latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] if latencies else 0}
+
+
+def main() -> None:
+    """ Command line: "serve" a word list, or "load" test a running server with the words of a word list """
+    parser = argparse.ArgumentParser(description="Dictionary server and load generator")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("--words", default="english_large.txt", help="word list, one word per line")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", help="Unix socket to use instead of a TCP port")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per client")
+    parser.add_argument("--pipeline", type=int, default=16, help="requests sent before reading the answers")
+    arguments = parser.parse_args()
+
+    if arguments.mode == "serve":
+        async def run_server() -> None:
+            dictionary = Dictionary(250726, 1000081)
+            dictionary.load_dictionary(arguments.words)
+            server, listener = await serve(dictionary, arguments.host, arguments.port, arguments.path)
+            print("Serving", dictionary.count, "words on", arguments.path or (arguments.host, arguments.port))
+            async with listener:
+                await listener.serve_forever()
+        asyncio.run(run_server())
+    else:
+        with open(arguments.words, encoding="UTF-8") as handle:
+            words = [line.strip() for line in handle if line.strip()]
+        result = asyncio.run(load_test(words, arguments.clients, arguments.requests, arguments.pipeline,
+                                       arguments.host, arguments.port, arguments.path))
+        print("Requests: {requests}  Throughput: {throughput:.0f} requests/s  p50: {p50_ms:.2f} ms  "
+              "p99: {p99_ms:.2f} ms".format(p50_ms=result["p50"] * 1000, p99_ms=result["p99"] * 1000, **result))
+
+
+if __name__ == '__main__':
+    main()
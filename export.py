@@ -0,0 +1,121 @@
+""" This module streams the items of a hash table, or of any other (key, value) iterable such as a Frequency ranking,
+to an open file in chunks, so the memory used stays the same however big the table is.
+Module consist of the following functions:
+Function: write_items, binary_record, export_table, read_binary
+
+Formats:
+    text: one "(key,value)" line per item, as printed by LinearProbeHashTable.__str__, to a text file
+    csv: a header row then one key,value row per item, to a text file opened with newline=""
+    binary: to a binary file, little endian
+        header: magic, version
+        records: (key length, value) then the UTF-8 bytes of the key, for every item
+        end: a record of key length END whose value is the number of items, with no key bytes
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import BinaryIO, Iterable, Iterator, TextIO, Tuple, Union
+from itertools import islice
+import csv
+import struct
+
+TEXT = "text"
+CSV = "csv"
+BINARY = "binary"
+FORMATS = (TEXT, CSV, BINARY)
+CHUNK_SIZE = 4096  # items written to the file at once
+HEADER_ROW = ("Key", "Value")
+
+MAGIC = b'LPHX'
+VERSION = 1
+HEADER = struct.Struct('<4sI')
+RECORD = struct.Struct('<Iq')
+END = 0xFFFFFFFF
+
+
+def write_items(items: Iterable[Tuple[str, object]], handle: Union[TextIO, BinaryIO], export_format: str = TEXT,
+                chunk_size: int = CHUNK_SIZE, header: Tuple[str, str] = HEADER_ROW) -> int:
+    """ Writes the (key, value) items to the open file handle in export_format, chunk_size items at a time, and
+    returns the number of items written. header is the header row of the csv format.
+
+    :pre-condition: every value is an integer for the binary format
+    :raises ValueError: when the format is not one of FORMATS or the chunk size is not positive
+    :raises TypeError: when a value is not an integer in the binary format
+    :complexity: O(C*K) where C is the number of items and K the size of an item, in O(chunk_size) memory
+    """
+    if export_format not in FORMATS:
+        raise ValueError("Export format should be one of " + ", ".join(FORMATS) + ", got " + str(export_format))
+    if chunk_size <= 0:
+        raise ValueError("Chunk size should be larger than 0.")
+    items = iter(items)
+    count = 0
+    if export_format == CSV:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+    elif export_format == BINARY:
+        handle.write(HEADER.pack(MAGIC, VERSION))
+
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        if export_format == TEXT:
+            handle.write("".join("(" + str(key) + "," + str(value) + ")\n" for key, value in chunk))
+        elif export_format == CSV:
+            writer.writerows(chunk)
+        else:
+            handle.write(b"".join(binary_record(key, value) for key, value in chunk))
+        count += len(chunk)
+        chunk = list(islice(items, chunk_size))
+
+    if export_format == BINARY:
+        handle.write(RECORD.pack(END, count))
+    return count
+
+
+def binary_record(key: str, value: int) -> bytes:
+    """ Returns the binary record of an item
+    :raises TypeError: when the value is not an integer
+    :complexity: O(K) where K is the size of the key
+    """
+    if not isinstance(value, int):
+        raise TypeError("Only integer values can be exported in binary, got " + type(value).__name__)
+    key_bytes = str(key).encode("UTF-8")
+    return RECORD.pack(len(key_bytes), value) + key_bytes
+
+
+def export_table(hash_table, handle: Union[TextIO, BinaryIO], export_format: str = TEXT,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """ Writes the items of hash_table to the open file handle and returns the number of items written, through
+    items() when the table has it so the empty slots are skipped, or else its slots
+    :see: #write_items
+    """
+    if hasattr(hash_table, "items"):
+        items = hash_table.items()
+    else:
+        items = (item for item in hash_table if item is not None)
+    return write_items(items, handle, export_format, chunk_size)
+
+
+def read_binary(handle: BinaryIO) -> Iterator[Tuple[str, int]]:
+    """ Iterates over the (key, value) items of a binary export, reading one record at a time
+    :raises ValueError: when the file is not a binary export, or is cut short
+    :complexity: O(C*K) where C is the number of items and K the size of a key
+    """
+    header = handle.read(HEADER.size)
+    if len(header) != HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION):
+        raise ValueError("Not a binary export of version " + str(VERSION))
+    count = 0
+    while True:
+        record = handle.read(RECORD.size)
+        if len(record) != RECORD.size:
+            raise ValueError("Binary export cut short after " + str(count) + " items")
+        key_length, value = RECORD.unpack(record)
+        if key_length == END:
+            if value != count:
+                raise ValueError("Binary export ends after {} items instead of {}".format(count, value))
+            return
+        key_bytes = handle.read(key_length)
+        if len(key_bytes) != key_length:
+            raise ValueError("Binary export cut short after " + str(count) + " items")
+        yield key_bytes.decode("UTF-8"), value
+        count += 1
@@ -1,29 +1,37 @@
 """ This module implements the Hash Table to read and maintain a dictionary of words.
 Module consist of the following class, methods and function:
 Classes: Frequency, Rarity
-Methods: load_dictionary, normalize_word, add_file, rarity, ranking, custom_sort
-Function: frequency_analysis,
+Methods: load_dictionary, normalize_word, add_file, refresh_dictionary, add_files, read_words, rarity, ranking,
+         export_ranking, top_k, custom_sort
+Function: frequency_analysis, count_words
 """
 
 __author__ = "Derek Chukwudi Anyanwu"
 
 
 from enum import Enum
-from typing import Tuple
-from dictionary import Dictionary
+from typing import Iterator, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dictionary import Dictionary, SharedDictionary
 from hash_table import LinearProbeHashTable
+from snapshot import SnapshotHashTable, save_snapshot, snapshot_table_size
+from export import TEXT, write_items
 from list import ArrayList
 import sys
 import string
+import timeit
+import tempfile
+import heapq
+import os
 
 sys.setrecursionlimit(50000)  # recursion limit increase
 
 
 def frequency_analysis() -> None:
     """Function create an object of the Frequecny class and add file to the hash table using the add_file method of
-     the Frequency class, reads from the cmd prompt the number of ranking the user wants to display, calls the ranking
+     the Frequency class, reads from the cmd prompt the number of ranking the user wants to display, calls the top_k
      method and print the ranking, the word, frequency and the rarity of the word.
-     :complexity: O(1) in best case, O(1) in worst case
+     :complexity: O(N*log(K)) where N is the table size and K the number of ranking to display
     """
     
     frequent = Frequency()
@@ -33,12 +41,34 @@ def frequency_analysis() -> None:
     except ValueError:
         print("Please enter a  valid number!")
     else:
-        array_output = frequent.ranking()
-        for item in range(user_input):
+        array_output = frequent.top_k(user_input)
+        for item in range(len(array_output)):
             print("Ranking: " + str(item) + "   " + "Word: " + str(array_output[item][0]) + "   " + "Frequency: "
                   + str(array_output[item][1]) + "   " + "Rarity: " + str(frequent.rarity(array_output[item][0])))
 
 
+def count_words(job: Tuple[str, int, int, str]) -> List[Tuple[str, int]]:
+    """Function counts the words found in the bytes start to end of a file that are in the dictionary mapped from the
+    snapshot file, for a (filename, start, end, snapshot) job of Frequency.add_files, and returns the (word, count)
+    pairs. Kept at module level so worker processes can run it.
+    :complexity: O(N) where N is the number of words in the chunk
+    """
+    filename, start, end, snapshot = job
+    with SnapshotHashTable(snapshot) as warehouse, open(filename, 'rb') as handle:
+        # sized for every word of the chunk being different, which can't be more than the dictionary
+        table_size = snapshot_table_size(min(len(warehouse), (end - start) // 2))
+        counts = LinearProbeHashTable(Frequency.HASH_BASE, table_size, collect_statistics=False)
+        handle.seek(start)
+        for word in handle.read(end - start).decode("UTF-8").split():
+            key = Frequency.normalize_word(word)
+            if key in warehouse:
+                try:
+                    counts[key] += 1
+                except KeyError:
+                    counts[key] = 1
+    return [item for item in counts if item is not None]
+
+
 class Rarity(Enum):
     """ Class initialize enum members that composed of name and a value."""
     COMMON = 1
@@ -51,16 +81,45 @@ class Frequency:
     """ Class uses Linear Probing hash table to create dictionary and perform frequency analysis on a set of files."""
     HASH_BASE = 250726  # constant
     TABLE_SIZE = 1000081  # constant
+    CHUNK_SIZE = 1 << 16  # number of characters read from a file at a time
+    FILE_CHUNK_SIZE = 1 << 23  # number of bytes of a file counted by one worker process in add_files
+    WHITESPACE = b" \t\n\r\x0b\x0c"  # bytes a file can be split after without cutting a word
     
-    def __init__(self) -> None:
-        self.hash_table = LinearProbeHashTable(self.HASH_BASE, self.TABLE_SIZE)  # storage for new words to be read in
-        self.dictionary = Dictionary(self.HASH_BASE, self.TABLE_SIZE)  # instance of the DIctionary object
-        self.dictionary.load_dictionary("english_large.txt", time_limit=None)  # read in filenameto the dictionary
+    def __init__(self, snapshot: str = None, dictionary: SharedDictionary = None,
+                 bloom_error_rate: float = None) -> None:
+        """ Loads the dictionary of words from english_large.txt, or maps it from a snapshot file saved
+        by Dictionary.save_snapshot when one is given, or uses the shared dictionary when one is given so
+        the word list is only loaded once for all the instances sharing it. With a bloom_error_rate, the loaded
+        dictionary gets a Bloom filter with that false positive rate, which rules out most words that are not in
+        the dictionary before the warehouse is looked up
+        :raises ValueError: when both a snapshot and a shared dictionary are given, as add_file would look words up
+                            in one and add_files in the other, or a bloom_error_rate with a shared dictionary,
+                            whose filter is set by shared_dictionary instead"""
+        if snapshot is not None and dictionary is not None:
+            raise ValueError("Give either a snapshot or a shared dictionary, not both")
+        if bloom_error_rate is not None and dictionary is not None:
+            raise ValueError("Give the Bloom filter error rate to shared_dictionary when sharing a dictionary")
+        # storage for new words to be read in, no probe statistics are needed for the counts
+        self.hash_table = LinearProbeHashTable(self.HASH_BASE, self.TABLE_SIZE, collect_statistics=False)
+        self.shared = dictionary  # shared dictionary the words are looked up in, if one was given
+        if self.shared is not None:
+            self.dictionary = self.shared.get()
+        else:
+            # the word list fills a good part of the table, so its slots are kept in compact arrays
+            self.dictionary = Dictionary(self.HASH_BASE, self.TABLE_SIZE, compact=True, collect_statistics=False,
+                                         bloom_error_rate=bloom_error_rate)  # instance of the DIctionary object
+            if snapshot is not None:
+                self.dictionary.load_snapshot(snapshot)
+            else:
+                self.dictionary.load_dictionary("english_large.txt", time_limit=None)  # read in the dictionary
         self.warehouse = self.dictionary.hash_table  # storage for the dictionary of words
+        self.snapshot = snapshot  # snapshot file of the dictionary, if it was mapped from one
         self.max_word = (None, 0)  # tuple containing max word and its frequency
         self.highest_occurrence = 0  # frequency of most occuring word in the read file
+        self.ingestion_rate = 0  # MB/s at which the last file was read into the hash table
     
-    def normalize_word(self, text: str) -> str:
+    @staticmethod
+    def normalize_word(text: str) -> str:
         """Method returns the lower case of a word, remove punctuation at the start and end of a word, whitespace
         and strip away all unwanted characters
         
@@ -90,36 +149,137 @@ class Frequency:
             print("'" + filename + "'", 'File is not accessible')
             pass
         else:
+            self.refresh_dictionary()
             self.words_in_dictionary(filename)
     
+    def refresh_dictionary(self) -> None:
+        """Method takes the current dictionary of the shared dictionary, which is loaded again when its word list was
+        modified. Nothing is done when the instance has its own dictionary.
+        :complexity: O(1) when the shared dictionary is loaded, see SharedDictionary.get otherwise
+        """
+        if self.shared is not None:
+            self.dictionary = self.shared.get()
+            self.warehouse = self.dictionary.hash_table
+    
+    def add_files(self, filenames: List[str], workers: int = None, chunk_size: int = FILE_CHUNK_SIZE) -> None:
+        """Method counts the dictionary words of several files in a pool of workers processes (one per CPU by default),
+        each one counting a chunk of at most about chunk_size bytes of a file, then merges the counts into the hash
+        table and updates max_word and highest_occurrence. Files that are not accessible are skipped like in add_file.
+        The workers look words up in the snapshot of the dictionary, which is saved to a temporary file when the
+        dictionary was not mapped from one.
+        :complexity: O(N/W) where N is the number of words in the files and W the number of workers, plus
+        O(D) to save the snapshot of a dictionary of D words
+        """
+        chunks = []
+        for filename in filenames:
+            try:
+                chunks += [(filename, start, end) for start, end in self.file_chunks(filename, chunk_size)]
+            except IOError:
+                print("'" + filename + "'", 'File is not accessible')
+        if not chunks:
+            return
+        
+        self.refresh_dictionary()
+        snapshot = self.snapshot
+        if snapshot is None:
+            handle, snapshot = tempfile.mkstemp(suffix=".snapshot")
+            os.close(handle)
+            save_snapshot(self.warehouse, snapshot)
+        jobs = [(filename, start, end, snapshot) for filename, start, end in chunks]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partial_counts = list(executor.map(count_words, jobs))
+        finally:
+            if snapshot != self.snapshot:
+                os.remove(snapshot)
+        
+        for counts in partial_counts:
+            for key, count in counts:
+                try:
+                    total = self.hash_table[key] + count
+                except KeyError:
+                    total = count
+                self.hash_table[key] = total
+                # counts only go up, so the most occurring word is either the old one or one of the merged ones
+                if total > self.highest_occurrence:
+                    self.highest_occurrence = total
+                    self.max_word = (key, total)
+    
+    def file_chunks(self, filename: str, chunk_size: int) -> List[Tuple[int, int]]:
+        """Method splits a file into (start, end) byte ranges of about chunk_size bytes, each one ending just after
+        an ASCII whitespace so no word or UTF-8 character is cut in two.
+        :raises IOError: when the file is not accessible
+        :complexity: O(C*L) where C is the number of chunks and L the length of the longest word
+        """
+        size = os.path.getsize(filename)
+        chunks = []
+        with open(filename, 'rb') as handle:
+            start = 0
+            while start < size:
+                end = min(start + chunk_size, size)
+                handle.seek(end)
+                byte = handle.read(1)
+                while byte and byte not in self.WHITESPACE:  # carry on to the end of the word
+                    byte = handle.read(1)
+                end = handle.tell()
+                chunks.append((start, end))
+                start = end
+        return chunks
+    
     def words_in_dictionary(self, filename: str) -> None:
         """Method reads words from a valid file into a hash table only if it exit in the dictionary of words called the
         warehouse and updates its occurence in such a way that the data associated to the word is its “occurrence count.
+        The file is streamed by read_words and the rate it was read at is kept in ingestion_rate.
         :complexity: O(N) in best case, O(N)* Complexity of normalize_word method  in worst case as n is the numbe od words
         """
-        with open(filename, 'r', encoding="UTF-8") as handle:  # Open file on read mode
-            for word in handle.read().split():
-                key = self.normalize_word(word)  # removes unwanted characters and punctuations
+        startTime = timeit.default_timer()
+        bloom = self.dictionary.bloom  # Bloom filter of the dictionary, if it has one
+        for word in self.read_words(filename):
+            key = self.normalize_word(word)  # removes unwanted characters and punctuations
+            if bloom is not None and key not in bloom:
+                continue  # definitely not in the dictionary
+            try:
+                # NOTE: key here is a word
+                self.warehouse[key]  # checking if word exit in the dictionary
+            except KeyError:
+                pass
+            else:
                 try:
-                    # NOTE: key here is a word
-                    self.warehouse[key]  # checking if word exit in the dictionary
+                    # At this stage the word exit inthe dictionary which is the warehouse,
+                    # So now we check if the word exit in hash table already or not.
+                    # if this word is already exist in the table, increment the count by 1
+                    if self.hash_table[key]:
+                        self.hash_table[key] += 1
                 except KeyError:
+                    self.hash_table[key] = 1  # first occurrence of this word, frequency set to 1
                     pass
                 else:
-                    try:
-                        # At this stage the word exit inthe dictionary which is the warehouse,
-                        # So now we check if the word exit in hash table already or not.
-                        # if this word is already exist in the table, increment the count by 1
-                        if self.hash_table[key]:
-                            self.hash_table[key] += 1
-                    except KeyError:
-                        self.hash_table[key] = 1  # first occurrence of this word, frequency set to 1
-                        pass
-                    else:
-                        # keeps track of the highest occurence, and the associated word.
-                        if self.hash_table[key] > self.highest_occurrence:
-                            self.highest_occurrence += 1
-                            self.max_word = (key, self.hash_table[key])
+                    # keeps track of the highest occurence, and the associated word.
+                    if self.hash_table[key] > self.highest_occurrence:
+                        self.highest_occurrence += 1
+                        self.max_word = (key, self.hash_table[key])
+        
+        deltaTime = timeit.default_timer() - startTime
+        if deltaTime > 0:
+            self.ingestion_rate = os.path.getsize(filename) / 1e6 / deltaTime
+    
+    def read_words(self, filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """Method yields the whitespace separated words of a file, reading it chunk_size characters at a time so only
+        one chunk (plus a word cut in two at its end) is held in memory, whatever the size of the file.
+        :complexity: O(N) where N is the number of characters in the file
+        """
+        with open(filename, 'r', encoding="UTF-8") as handle:  # Open file on read mode
+            partial = ""  # start of a word cut off at the end of the previous chunk
+            chunk = handle.read(chunk_size)
+            while chunk:
+                words = (partial + chunk).split()
+                partial = ""
+                if words and not chunk[-1].isspace():
+                    partial = words.pop()  # the word may carry on in the next chunk
+                yield from words
+                chunk = handle.read(chunk_size)
+            if partial:
+                yield partial
     
     def rarity(self, word: str) -> Rarity:
         """ Method accept a word as arqument and returns its rarity score as an enumerated value
@@ -140,23 +300,59 @@ class Frequency:
     
     def ranking(self) -> ArrayList[Tuple]:
         """Method create storage space of ArrayList type of same size of the hash table and transfers not None items of
-        the hash table into it and calls the sorting method to sort it based on sorting type.
-        :complexity: Nlog(N)*CompEq in best case when the pivot is the median value, O(N2)*CompEq in worst case
-        when the pivot is max/ min
+        the hash table into it in descending order of frequency with a counting sort: the items are bucketed by
+        frequency, so it needs no recursion and no comparisons, and words of equal frequency keep the order they have
+        in the table.
+        :complexity: O(N + F) where N is the table size and F the highest frequency
         """
-        # 1 is sorting by descending order and 2 is sorting by ascending order(Not implemented here though)
-        # Only run is hash table is not empty. 
+        # Only run is hash table is not empty.
         if not self.hash_table.is_empty():
-            order_by = 1  # sorting by descending order
-            ranking_array = ArrayList(len(self.hash_table))
-            index = 0
-            for item in self.hash_table:
-                if item is not None:
-                    ranking_array.insert(index, item)
-                    index += 1
-            self.custom_sort(ranking_array, order_by)
+            # ----- first pass: number of words of each frequency, the items skip the empty slots
+            items = list(self.hash_table.items())
+            highest = max(item[1] for item in items)
+            bucket_sizes = [0] * (highest + 1)
+            for item in items:
+                bucket_sizes[item[1]] += 1
+            
+            # ----- position of the first word of each frequency, highest frequency first
+            bucket_starts = [0] * (highest + 1)
+            position = 0
+            for frequency in range(highest, -1, -1):
+                bucket_starts[frequency] = position
+                position += bucket_sizes[frequency]
+            
+            # ----- second pass: place each word after the previous ones of the same frequency
+            ranking_array = ArrayList(position)
+            for _ in range(position):
+                ranking_array.append(None)
+            for item in items:
+                ranking_array[bucket_starts[item[1]]] = item
+                bucket_starts[item[1]] += 1
             return ranking_array
     
+    def export_ranking(self, handle, export_format: str = TEXT) -> int:
+        """Method streams the ranking to the open file handle as text, csv with a Word,Frequency header or binary, a
+        chunk at a time, and returns the number of words written. Only the ranking itself is held in memory.
+        :raises ValueError: when the format is not one of export.FORMATS
+        :complexity: O(N + F + C*K) where N is the table size, F the highest frequency, C the number of words and
+                     K the size of a word
+        """
+        ranking = self.ranking()
+        words = () if ranking is None else (ranking[index] for index in range(len(ranking)))
+        return write_items(words, handle, export_format, header=("Word", "Frequency"))
+    
+    def top_k(self, k: int) -> ArrayList[Tuple]:
+        """Method returns the k most occurring words of the hash table as (word, frequency) tuples in descending order
+        of frequency, scanning the table once and keeping only a heap of the k best items seen so far. Words of equal
+        frequency keep the order they have in the table. Less than k items are returned when the table holds less.
+        :complexity: O(N*log(K)) where N is the table size
+        """
+        items = self.hash_table.items()
+        top_array = ArrayList(max(k, 0))
+        for item in heapq.nlargest(k, items, key=lambda item: item[1]):
+            top_array.append(item)
+        return top_array
+    
     def custom_sort(self, the_array: ArrayList, order_by: int) -> ArrayList:
         """method sort an ArrayList in descending order using quick sort
         :complexity: Nlog(N)*CompEq in best case when the pivot is the median value, O(N2)*CompEq in worst case
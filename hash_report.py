@@ -0,0 +1,133 @@
+""" This module reports how well each hash function spreads the words of word lists over a hash table.
+Module consist of the following functions:
+Function: read_words, hash_quality, hash_report, main
+
+For each word list, hash function and hash base, the report gives the share of buckets used, the biggest bucket, the
+chi-square statistic of the bucket sizes against a uniform spread (divided by its degrees of freedom, so about 1 for
+a good hash and far more when keys pile up), the mean and longest probe chain the words get with linear probing,
+next to the mean a uniform hash is expected to give at that load, and the time taken to hash a word.
+
+Usage: python hash_report.py [word lists...] [--table-size 250727] [--bases 1 27183 250726] [--functions ...]
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import List, Tuple
+from hash_table import LinearProbeHashTable, hash_key
+import argparse
+import csv
+import os
+import sys
+import time
+
+WORD_LISTS = ('english_small.txt', 'english_large.txt', 'french.txt')
+BASES = (1, 27183, 250726)
+TABLE_SIZE = 250727
+COLUMNS = ("File Name", "Hash Function", "Hash Base", "Words", "Buckets Used", "Max Bucket", "Chi-Square Ratio",
+           "Probe Mean", "Uniform Probe Mean", "Probe Max", "Hash ns")
+
+
+def read_words(filename: str) -> List[str]:
+    """ Function returns the distinct lower case words of a word list, one per line, in file order
+    :complexity: O(n*m) where n is the number of words and m their length
+    """
+    with open(filename, encoding="UTF-8") as handle:
+        return list(dict.fromkeys(line.strip().lower() for line in handle if line.strip()))
+
+
+def hash_quality(words: List[str], hash_function: str, hash_base: int, table_size: int) -> dict:
+    """ Function measures how hash_function with hash_base spreads words over table_size buckets, and the probe
+    chains they get when inserted in that order in a linear probing table of that size that doesn't grow
+    :raises ValueError: when there are more words than buckets
+    :complexity: O(n*m + N) expected, where n is the number of words, m their length and N the table size,
+                 O(n*(m + N)) worst case when the words cluster
+    """
+    if len(words) > table_size:
+        raise ValueError("{} words don't fit in a table of {} slots".format(len(words), table_size))
+    start = time.perf_counter()
+    hashes = [hash_key(word, hash_base, hash_function) for word in words]
+    elapsed = time.perf_counter() - start
+
+    # ----- bucket distribution
+    buckets = [0] * table_size
+    for key_hash in hashes:
+        buckets[key_hash % table_size] += 1
+    expected = len(words) / table_size
+    chi_square = sum((size - expected) ** 2 for size in buckets) / expected if words else 0
+
+    # ----- probe chains of linear probing, in insertion order
+    taken = bytearray(table_size)
+    probe_total = probe_max = 0
+    for key_hash in hashes:
+        position = key_hash % table_size
+        probes = 0
+        while taken[position]:
+            position = (position + 1) % table_size
+            probes += 1
+        taken[position] = 1
+        probe_total += probes
+        probe_max = max(probe_max, probes)
+    load = len(words) / table_size
+
+    return {"words": len(words),
+            "buckets_used": sum(1 for size in buckets if size) / table_size,
+            "max_bucket": max(buckets),
+            "chi_square": chi_square,
+            "chi_square_ratio": chi_square / max(1, table_size - 1),
+            "probe_mean": probe_total / max(1, len(words)),
+            # Knuth: a successful search probes 1/2 (1 + 1/(1 - load)) slots, one less past the home slot
+            "uniform_probe_mean": load / (2 * (1 - load)),
+            "probe_max": probe_max,
+            "hash_ns": elapsed / max(1, len(words)) * 1e9}
+
+
+def hash_report(filenames: Tuple[str, ...] = WORD_LISTS, hash_functions: Tuple[str, ...] = None,
+                bases: Tuple[int, ...] = BASES, table_size: int = TABLE_SIZE) -> List[tuple]:
+    """ Function returns a row of COLUMNS for each word list that exists, hash function and hash base, the hash base
+    being left out for FNV-1a, which doesn't use one
+    :complexity: O(F*H*B) runs of hash_quality, where F is the number of files, H of hash functions and B of bases
+    """
+    rows = []
+    for filename in filenames:
+        if not os.path.isfile(filename):
+            print("Skipping", filename, "which doesn't exist", file=sys.stderr)
+            continue
+        words = read_words(filename)
+        for hash_function in hash_functions or LinearProbeHashTable.HASH_FUNCTIONS:
+            function_bases = bases[:1] if hash_function == LinearProbeHashTable.FNV1A_HASH else bases
+            for hash_base in function_bases:
+                quality = hash_quality(words, hash_function, hash_base, table_size)
+                rows.append((filename, hash_function,
+                             "-" if hash_function == LinearProbeHashTable.FNV1A_HASH else hash_base,
+                             quality["words"], round(quality["buckets_used"], 4), quality["max_bucket"],
+                             round(quality["chi_square_ratio"], 3), round(quality["probe_mean"], 3),
+                             round(quality["uniform_probe_mean"], 3), quality["probe_max"],
+                             round(quality["hash_ns"])))
+    return rows
+
+
+def main() -> None:
+    """ Command line: prints the report, or writes it to a CSV file """
+    parser = argparse.ArgumentParser(description="Hash function quality report")
+    parser.add_argument("filenames", nargs="*", default=list(WORD_LISTS), help="word lists, one word per line")
+    parser.add_argument("--table-size", type=int, default=TABLE_SIZE)
+    parser.add_argument("--bases", type=int, nargs="+", default=list(BASES))
+    parser.add_argument("--functions", nargs="+", choices=LinearProbeHashTable.HASH_FUNCTIONS)
+    parser.add_argument("--csv", help="file the report is written to instead")
+    arguments = parser.parse_args()
+
+    rows = hash_report(tuple(arguments.filenames), arguments.functions, tuple(arguments.bases), arguments.table_size)
+    if arguments.csv:
+        with open(arguments.csv, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(COLUMNS)
+            writer.writerows(rows)
+    else:
+        widths = [max(len(str(value)) for value in column) for column in zip(COLUMNS, *rows)]
+        for row in [COLUMNS] + rows:
+            print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
+
+
+if __name__ == '__main__':
+    main()
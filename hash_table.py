@@ -1,6 +1,15 @@
 """ Hash Table ADT
 Defines a Hash Table using Linear Probing for conflict resolution.
 That rehashes the primary cluster to handle deletion.
+Optionally uses Robin Hood insertion, which then deletes by shifting the cluster back,
+or marks deleted slots with tombstones that are reused on insert and dropped on resize.
+Resizing can also be done incrementally, migrating a few slots of the old table per operation.
+Integer valued tables can keep their slots in compact parallel arrays instead of tuples.
+The probe sequence can also be quadratic or double hashing instead of linear, deleting with tombstones.
+The load factor the table grows at, how much it grows by and the load factor it shrinks at are configurable.
+The hash function can be the polynomial hash, FNV-1a, a multiply-shift hash or Python's built-in hash with a salt.
+keys(), values() and items() skip the empty slots, and an optional dense index of the items in insertion order
+makes them cost O(count) instead of O(table size). Iterating fails fast when the table changes meanwhile.
 
 comments starting with # ----- has been added by student to keep track of collision, probes...
 and are used in statistics method
@@ -13,10 +22,139 @@ __modified__ = '21/05/2020'
 __since__ = '14/05/2020'
 
 from referential_array import ArrayR
-from typing import TypeVar, Generic
+from compact_array import CompactArray, hash_array
+from typing import Generic, Iterable, Iterator, List, Tuple, TypeVar
+from itertools import chain, permutations
+import bisect
+import time
 import unittest
 
 T = TypeVar('T')
+POLYNOMIAL_HASH_DEFERRED_LENGTH = 32  # keys up to this length are reduced once, at the end of polynomial_hash
+FNV_OFFSET_BASIS = 0xCBF29CE484222325  # 64 bit FNV-1a parameters
+FNV_PRIME = 0x100000001B3
+WORD_MASK = (1 << 64) - 1
+MULTIPLY_SHIFT_MIX = 0x9E3779B97F4A7C15  # spreads the hash base into the odd multiplier of multiply_shift_hash
+
+
+def polynomial_hash(key: str, hash_base: int) -> int:
+    """
+    Universal Hash function reduced by LinearProbeHashTable.HASH_MODULUS
+    :post: returns a value 0 <= value < LinearProbeHashTable.HASH_MODULUS
+    :complexity: O(K) where K is the size of the key
+    """
+    modulus = LinearProbeHashTable.HASH_MODULUS
+    value = 0
+    if len(key) <= POLYNOMIAL_HASH_DEFERRED_LENGTH:
+        # short keys only make a few hundred bit integer, so it's cheaper to reduce once at the end
+        for c in key:
+            value = value * hash_base + ord(c)
+        return value % modulus
+    for c in key:
+        value = (value * hash_base + ord(c)) % modulus
+    return value
+
+
+def fnv1a_hash(key: str) -> int:
+    """
+    64 bit FNV-1a hash of the UTF-8 bytes of key, reduced by LinearProbeHashTable.HASH_MODULUS.
+    Every byte is mixed in with one xor and one multiplication, with no modulo per character
+    :post: returns a value 0 <= value < LinearProbeHashTable.HASH_MODULUS
+    :complexity: O(K) where K is the size of the key
+    """
+    value = FNV_OFFSET_BASIS
+    for byte in key.encode("UTF-8"):
+        value = ((value ^ byte) * FNV_PRIME) & WORD_MASK
+    return value % LinearProbeHashTable.HASH_MODULUS
+
+
+def multiply_shift_hash(key: str, hash_base: int) -> int:
+    """
+    Multiply-shift hash of the UTF-8 bytes of key read 8 at a time, each word being mixed in with one
+    multiplication by an odd multiplier derived from hash_base, keeping the high bits of the last product,
+    which depend on all the bits below them
+    :post: returns a value 0 <= value < LinearProbeHashTable.HASH_MODULUS
+    :complexity: O(K) where K is the size of the key, with one step per 8 bytes, trailing zero words skipped
+    """
+    multiplier = (hash_base * MULTIPLY_SHIFT_MIX) & WORD_MASK | 1
+    data = key.encode("UTF-8")
+    words = int.from_bytes(data, "little")  # the 8 byte words are taken off the low end of one integer
+    value = len(data)
+    while True:
+        value = ((value ^ (words & WORD_MASK)) * multiplier) & WORD_MASK
+        words >>= 64
+        if not words:
+            return (value >> 3) % LinearProbeHashTable.HASH_MODULUS
+
+
+def salted_hash(key: str, hash_base: int) -> int:
+    """
+    Python's built-in hash of key salted with hash_base, which is computed in C and cached by the string.
+    Python salts string hashes per process too, so these hashes can't be saved for another process
+    :post: returns a value 0 <= value < LinearProbeHashTable.HASH_MODULUS
+    :complexity: O(K) where K is the size of the key, O(1) once the string has cached its hash
+    """
+    return hash((hash_base, key)) % LinearProbeHashTable.HASH_MODULUS
+
+
+def hash_key(key: str, hash_base: int, hash_function: str) -> int:
+    """
+    Returns the full width hash of key by the named hash function, one of LinearProbeHashTable.HASH_FUNCTIONS
+    :raises ValueError: when the hash function is unknown
+    :complexity: see the hash function
+    """
+    if hash_function == LinearProbeHashTable.POLYNOMIAL_HASH:
+        return polynomial_hash(key, hash_base)
+    if hash_function == LinearProbeHashTable.FNV1A_HASH:
+        return fnv1a_hash(key)
+    if hash_function == LinearProbeHashTable.MULTIPLY_SHIFT_HASH:
+        return multiply_shift_hash(key, hash_base)
+    if hash_function == LinearProbeHashTable.SALTED_HASH:
+        return salted_hash(key, hash_base)
+    raise ValueError("Unknown hash function " + repr(hash_function))
+
+
+def is_prime(number: int) -> bool:
+    """
+    Returns whether number is prime, by a Miller-Rabin test whose bases make it exact below 3.3 * 10**24
+    :complexity: O(log(N)) multiplications where N is the number
+    """
+    if number < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    for base in bases:
+        if number % base == 0:
+            return number == base
+    odd, twos = number - 1, 0
+    while odd % 2 == 0:
+        odd //= 2
+        twos += 1
+    for base in bases:
+        witness = pow(base, odd, number)
+        if witness == 1 or witness == number - 1:
+            continue
+        for _ in range(twos - 1):
+            witness = witness * witness % number
+            if witness == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def prime_at_least(number: int) -> int:
+    """
+    Returns the smallest prime of LinearProbeHashTable.PRIMES at least number, or past the end
+    of the list the smallest prime at least number, generated on demand
+    :complexity: O(log(P)) within the list where P is the number of primes, O(log(N)**2) expected past it
+    """
+    index = bisect.bisect_left(LinearProbeHashTable.PRIMES, number)
+    if index < len(LinearProbeHashTable.PRIMES):
+        return LinearProbeHashTable.PRIMES[index]
+    candidate = number | 1
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
 
 
 class LinearProbeHashTable(Generic[T]):
@@ -27,14 +165,57 @@ class LinearProbeHashTable(Generic[T]):
         MIN_CAPACITY: smallest valid table size
         DEFAULT_TABLE_SIZE: default table size used in the __init__
         DEFAULT_HASH_TABLE: default hash base used for the hash function
-        PRIMES: list of prime numbers to use for resizing
+        PRIMES: list of prime numbers to use for resizing, larger primes are generated by prime_at_least
+        DEFAULT_MAX_LOAD_FACTOR: load factor the table grows past by default
+        DEFAULT_GROWTH_FACTOR: factor the table grows by by default, about the ratio between neighbouring PRIMES
+        TOMBSTONE: marker left in the slot of a deleted item (tombstone mode only)
+        MIGRATION_SLOTS: number of old table slots migrated per operation during an incremental resize
+        HASH_MODULUS: Mersenne prime the cached full width hashes are reduced by
+        PROBE_HISTOGRAM_EXACT: probe chain lengths below this get a histogram bucket each
+        PROBE_HISTOGRAM_SIZE: number of histogram buckets, the ones past PROBE_HISTOGRAM_EXACT double in width
+        LINEAR_PROBING: probe sequence trying the next slot each time
+        QUADRATIC_PROBING: probe sequence trying the slots 1, 4, 9, ... past the home position
+        DOUBLE_HASHING: probe sequence moving by a step taken from the key's hash each time
+        PROBE_SEQUENCES: the probe sequences a table can use
+        POLYNOMIAL_HASH: polynomial hash of the characters in base hash_base, reduced by HASH_MODULUS
+        FNV1A_HASH: 64 bit FNV-1a hash of the UTF-8 bytes, which doesn't use the hash base
+        MULTIPLY_SHIFT_HASH: multiply-shift hash of the UTF-8 bytes, 8 at a time, with a multiplier from the hash base
+        SALTED_HASH: Python's built-in hash salted with the hash base, only valid within one process
+        HASH_FUNCTIONS: the hash functions a table can use
 
     attributes:
         count: number of elements in the hash table
         table: used to represent our internal array
         hash_base: base prime used in hash function
+        hash_function: hash function the keys are hashed with, one of HASH_FUNCTIONS
         table_size: current size of the hash table
-        next_prime: next prime number to use when resizing
+        max_load_factor: share of the slots, tombstones included, that can be taken before the table is resized
+        growth_factor: factor the table size is multiplied by when it grows, then rounded up to a prime
+        min_load_factor: share of the slots below which deletes shrink the table, or None to never shrink
+        min_table_size: table size given at construction, which the table never shrinks below
+        robin_hood: whether entries are inserted using the Robin Hood policy
+        hashes: full width hash of the key in each slot of table, so it is only computed once
+        tombstones: whether deletion leaves a tombstone instead of rehashing the primary cluster
+        tombstone_count: number of tombstones currently in the table
+        incremental_resize: whether resizing migrates the old table a few slots per operation
+        old_table: table being migrated during an incremental resize, otherwise None
+        old_hashes: cached hashes of the old table
+        migrate_position: next slot of old_table to migrate
+        compact: whether keys, integer values and hashes are kept in compact parallel arrays
+        probe_sequence: probe sequence followed from the home position of a key, one of PROBE_SEQUENCES
+        collect_statistics: whether probe chain lengths are recorded for statistics()
+        collision_count: number of recorded probe chains longer than 0
+        probe_total: sum of all recorded probe chain lengths
+        probe_max: longest recorded probe chain
+        probe_histogram: number of recorded probe chains falling in each histogram bucket
+        rehash_hook: None, or called as rehash_hook(old size, new size, seconds) after each rehash
+                     or start of an incremental resize, e.g. by ProfiledHashTable
+        ordered: whether the items are kept in a dense index in insertion order
+        order: the (key, data) items in insertion order, None where a key was deleted, when ordered, otherwise None
+        order_holes: number of deleted items in order
+        orders: index in order of the key in each slot of table, when ordered, otherwise None
+        old_orders: indexes in order of the keys of the old table
+        modifications: number of changes to the slots so far, which iterators check to fail fast
     """
     MIN_CAPACITY = 1
     
@@ -45,20 +226,88 @@ class LinearProbeHashTable(Generic[T]):
               25229, 30313, 36353, 43627, 52361, 62851, 75521, 90523, 108631, 130363, 156437, 187751, 225307, 270371,
               324449, 389357, 467237, 560689, 672827, 807403, 968897, 1162687, 1395263, 1674319, 2009191, 2411033,
               2893249, 3471899, 4166287, 4999559, 5999471, 7199369]
+    TOMBSTONE = object()
+    MIGRATION_SLOTS = 64
+    HASH_MODULUS = 2 ** 61 - 1
+    PROBE_HISTOGRAM_EXACT = 32
+    PROBE_HISTOGRAM_SIZE = 64
+    LINEAR_PROBING = "linear"
+    QUADRATIC_PROBING = "quadratic"
+    DOUBLE_HASHING = "double hashing"
+    PROBE_SEQUENCES = (LINEAR_PROBING, QUADRATIC_PROBING, DOUBLE_HASHING)
+    POLYNOMIAL_HASH = "polynomial"
+    FNV1A_HASH = "fnv-1a"
+    MULTIPLY_SHIFT_HASH = "multiply-shift"
+    SALTED_HASH = "salted builtin"
+    HASH_FUNCTIONS = (POLYNOMIAL_HASH, FNV1A_HASH, MULTIPLY_SHIFT_HASH, SALTED_HASH)
+    DEFAULT_MAX_LOAD_FACTOR = 0.5
+    DEFAULT_GROWTH_FACTOR = 1.2
     
-    def __init__(self, hash_base: int = DEFAULT_HASH_BASE, table_size: int = DEFAULT_TABLE_SIZE) -> None:
+    def __init__(self, hash_base: int = DEFAULT_HASH_BASE, table_size: int = DEFAULT_TABLE_SIZE,
+                 robin_hood: bool = False, tombstones: bool = False, incremental_resize: bool = False,
+                 compact: bool = False, collect_statistics: bool = True,
+                 probe_sequence: str = LINEAR_PROBING, max_load_factor: float = DEFAULT_MAX_LOAD_FACTOR,
+                 growth_factor: float = DEFAULT_GROWTH_FACTOR, min_load_factor: float = None,
+                 hash_function: str = POLYNOMIAL_HASH, ordered: bool = False) -> None:
         """
+        Quadratic probing and double hashing always delete with tombstones, as rehashing the rest of
+        the primary cluster only works for linear probing.
+        When ordered, keys(), values() and items() follow the insertion order and cost O(count).
+        The minimum load factor has to stay under max_load_factor / growth_factor, the load right after
+        growing, or the table would shrink straight back
         :complexity: O(N) where N is the table_size
+        :raises ValueError: when both robin_hood and tombstones are requested, when the probe sequence
+                            or hash function is unknown, when Robin Hood insertion is asked with another
+                            one than linear or when the load factors or growth factor are out of range,
+                            the maximum load factor of quadratic probing being at most 0.5 as its probes
+                            only reach half the slots of a prime sized table
         """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Maximum load factor should be between 0 and 1.")
+        if probe_sequence == self.QUADRATIC_PROBING and max_load_factor > 0.5:
+            raise ValueError("Maximum load factor of quadratic probing should be at most 0.5.")
+        if growth_factor <= 1:
+            raise ValueError("Growth factor should be larger than 1.")
+        if min_load_factor is not None and not 0 <= min_load_factor < max_load_factor / growth_factor:
+            raise ValueError("Minimum load factor should be between 0 and max_load_factor / growth_factor.")
+        if probe_sequence not in self.PROBE_SEQUENCES:
+            raise ValueError("Unknown probe sequence " + repr(probe_sequence))
+        if hash_function not in self.HASH_FUNCTIONS:
+            raise ValueError("Unknown hash function " + repr(hash_function))
+        if robin_hood and tombstones:
+            raise ValueError("Robin Hood tables delete by backward shifting and don't use tombstones")
+        if robin_hood and probe_sequence != self.LINEAR_PROBING:
+            raise ValueError("Robin Hood tables use linear probing")
         self.count = 0
-        self.table = ArrayR(max(self.MIN_CAPACITY, table_size))
+        self.compact = compact
+        self.table, self.hashes = self.__new_arrays(max(self.MIN_CAPACITY, table_size))
         self.hash_base = hash_base
-        self.next_prime = 0
-        self.probeChains = []
+        self.hash_function = hash_function
+        self.max_load_factor = max_load_factor
+        self.growth_factor = growth_factor
+        self.min_load_factor = min_load_factor
+        self.min_table_size = len(self.table)
+        self.collect_statistics = collect_statistics
+        self.collision_count = 0
+        self.probe_total = 0
+        self.probe_max = 0
+        self.probe_histogram = [0] * self.PROBE_HISTOGRAM_SIZE
         self.rehash_count = 0
-        
-        while LinearProbeHashTable.PRIMES[self.next_prime] <= table_size:
-            self.next_prime += 1
+        self.rehash_hook = None
+        self.robin_hood = robin_hood
+        self.probe_sequence = probe_sequence
+        self.tombstones = tombstones or probe_sequence != self.LINEAR_PROBING
+        self.tombstone_count = 0
+        self.incremental_resize = incremental_resize
+        self.old_table = None
+        self.old_hashes = None
+        self.migrate_position = 0
+        self.ordered = ordered
+        self.order = [] if ordered else None
+        self.order_holes = 0
+        self.orders = self.__new_orders(len(self.table))
+        self.old_orders = None
+        self.modifications = 0
     
     def __len__(self) -> int:
         """
@@ -71,68 +320,461 @@ class LinearProbeHashTable(Generic[T]):
         """
         Deletes an item from our hash table by rehashing the
         remaining items in the current primary cluster
+        (or by leaving a tombstone in its slot in tombstone mode),
+        then shrinks the table when it fell under the minimum load factor
         :raises KeyError: when the key doesn't exist
         :complexity best: O(K) finds the position straight away and doesn't have to rehash
                           where K is the size of the key
         :complexity worst: O(K + N) when it has to rehash all items in the hash table
                           where N is the table size
         """
-        position = self.__linear_probe(key, False)
-        self.table[position] = None
+        self.__migrate(self.MIGRATION_SLOTS)
+        self.__remove(key)
+        if self.min_load_factor is not None and self.count < len(self.table) * self.min_load_factor:
+            self.__shrink()
+    
+    def __remove(self, key: str) -> None:
+        """
+        Removes the item of key from the table or the old table
+        :raises KeyError: when the key doesn't exist
+        :see: #self.__delitem__(key: str)
+        """
+        self.probeChainLength = 0
+        key_hash = self.full_hash(key)
+        try:
+            position = self.__probe(key, key_hash, False)
+        except KeyError:
+            if self.old_table is None:
+                raise
+            # still waiting to be migrated, the old table keeps its clusters intact with a tombstone
+            position = self.__old_probe(key, key_hash)
+            self.old_table[position] = self.TOMBSTONE
+            self.count -= 1
+            self.modifications += 1
+            if self.ordered:
+                self.__forget(self.old_orders[position])
+            return
         self.count -= 1
+        self.modifications += 1
+        if self.ordered:
+            self.__forget(self.orders[position])
+        
+        if self.tombstones:
+            self.table[position] = self.TOMBSTONE
+            self.tombstone_count += 1
+            return
+        
+        self.table[position] = None
+        
+        if self.robin_hood:
+            self.__backward_shift(position)
+            return
         
         position = (position + 1) % len(self.table)
         while self.table[position] is not None:
             item = self.table[position]
             self.table[position] = None
             self.count -= 1
-            self[str(item[0])] = item[1]
+            self.probeChainLength = 0
+            self.__insert(str(item[0]), item[1], self.hashes[position],
+                          None if self.orders is None else self.orders[position])
+            self.__record_probe_chain()  # ----record probeChainLength
             position = (position + 1) % len(self.table)
     
-    def __rehash(self) -> None:
+    def __forget(self, index: int) -> None:
         """
-        Need to resize table and reinsert all values
-        :complexity:
+        Leaves a hole at index of the insertion order of a deleted key, and compacts the order
+        once it is more holes than keys
+        :complexity: O(1) amortised, as compacting costs O(K) per key where K is the size of the key
         """
-        new_hash = LinearProbeHashTable(self.hash_base, LinearProbeHashTable.PRIMES[self.next_prime])
-        self.next_prime += 1
-        
-        for i in range(len(self.table)):
-            if self.table[i] is not None:
-                new_hash[str(self.table[i][0])] = self.table[i][1]
+        self.order[index] = None
+        self.order_holes += 1
+        if self.order_holes > len(self.order) // 2:
+            order, self.order, self.order_holes = self.order, [], 0
+            for item in order:
+                if item is not None:
+                    table, position = self.__locate(item[0])
+                    (self.orders if table is self.table else self.old_orders)[position] = len(self.order)
+                    self.order.append(item)
+    
+    def __shrink(self) -> None:
+        """
+        Resizes the table to the smallest prime bringing the load halfway between the minimum and
+        maximum load factors, but never below the table size given at construction
+        :complexity: O(N) where N is the table size
+        """
+        target_load = (self.min_load_factor + self.max_load_factor) / 2
+        new_size = max(self.min_table_size, prime_at_least(int(self.count / target_load) + 1))
+        if new_size >= len(self.table):
+            return
+        if self.incremental_resize:
+            self.__start_resize(False, new_size)
+        else:
+            self.__rehash(False, new_size)
+    
+    def __backward_shift(self, position: int) -> None:
+        """
+        Fills the hole left at position by moving every following entry of the cluster
+        one slot back, stopping at an empty slot or an entry already in its home position
+        :complexity: O(C) where C is the length of the rest of the cluster
+        """
+        next_position = (position + 1) % len(self.table)
+        while self.table[next_position] is not None and self.__distance(next_position) > 0:
+            self.table[position] = self.table[next_position]
+            self.hashes[position] = self.hashes[next_position]
+            if self.orders is not None:
+                self.orders[position] = self.orders[next_position]
+            self.table[next_position] = None
+            position = next_position
+            next_position = (position + 1) % len(self.table)
+    
+    def __distance(self, position: int) -> int:
+        """
+        Returns how far the entry at position sits past its home position
+        :complexity: O(1)
+        """
+        return (position - self.hashes[position] % len(self.table)) % len(self.table)
+    
+    def __rehash(self, grow: bool = True, new_size: int = None) -> None:
+        """
+        Need to resize table and reinsert all values, dropping any tombstones.
+        When grow is False the table is rebuilt at its current size, which is
+        enough when it is mostly filled by tombstones, or at new_size when given.
+        The items still in the old table of an incremental resize are moved in too.
+        Reinserted values reuse their cached hash. When the probe sequence misses
+        every free slot for an item, the rebuild starts over at the next larger size
+        :complexity: O(N) where N is the table size
+        """
+        start = time.perf_counter()
+        sources = [(self.table, self.hashes, self.orders)]
+        if self.old_table is not None:
+            sources.append((self.old_table, self.old_hashes, self.old_orders))
+        old_size = len(self.table)
+        new_size = self.__new_size(grow) if new_size is None else new_size
         
-        self.count = new_hash.count
-        self.table = new_hash.table
+        while True:
+            self.table, self.hashes = self.__new_arrays(new_size)
+            self.orders = self.__new_orders(new_size)
+            self.count = 0
+            self.tombstone_count = 0
+            try:
+                for old_table, old_hashes, old_orders in sources:
+                    for i in range(len(old_table)):
+                        if old_table[i] is not None and old_table[i] is not self.TOMBSTONE:
+                            self.__insert(old_table[i][0], old_table[i][1], old_hashes[i],
+                                          None if old_orders is None else old_orders[i])
+                break
+            except KeyError:
+                # quadratic probing only reaches half the slots, so the load was too high for some item
+                new_size = prime_at_least(max(new_size + 1, int(new_size * self.growth_factor)))
+        self.old_table = None
+        self.old_hashes = None
+        self.old_orders = None
     
         self.rehash_count += 1   # ----update rehash_count
+        self.modifications += 1
+        if self.rehash_hook is not None:
+            self.rehash_hook(old_size, new_size, time.perf_counter() - start)
+    
+    def __new_arrays(self, size: int) -> tuple:
+        """
+        Returns an empty (table, hashes) pair of arrays of the given size, typed
+        arrays when the table is compact
+        :complexity: O(N) where N is the size
+        """
+        if self.compact:
+            return CompactArray(size), hash_array(size)
+        return ArrayR(size), ArrayR(size)
+    
+    def __new_orders(self, size: int) -> object:
+        """
+        Returns an array of the given size for the insertion order indexes of the slots, a typed
+        array when the table is compact, or None when the table is not ordered
+        :complexity: O(N) where N is the size
+        """
+        if not self.ordered:
+            return None
+        return hash_array(size) if self.compact else ArrayR(size)
+    
+    def __new_size(self, grow: bool) -> int:
+        """
+        Returns the size of the table to resize to, when growing the first prime at least
+        growth_factor times the current size
+        :complexity: O(log(P)) within PRIMES, see prime_at_least past it
+        """
+        if not grow:
+            return len(self.table)
+        return prime_at_least(max(len(self.table) + 1, int(len(self.table) * self.growth_factor)))
+    
+    def __start_resize(self, grow: bool, new_size: int = None) -> None:
+        """
+        Swaps in an empty table and keeps the current one as the old table, whose
+        items are then moved across by __migrate a few slots per operation
+        :complexity: O(N) where N is the new table size, to allocate it
+        """
+        start = time.perf_counter()
+        if self.old_table is not None:  # an earlier resize is still running, so finish it first
+            self.__migrate(len(self.old_table))
         
-    def __linear_probe(self, key: str, is_insert: bool) -> int:
+        new_size = self.__new_size(grow) if new_size is None else new_size
+        self.old_table = self.table
+        self.old_hashes = self.hashes
+        self.old_orders = self.orders
+        self.migrate_position = 0
+        self.table, self.hashes = self.__new_arrays(new_size)
+        self.orders = self.__new_orders(new_size)
+        self.tombstone_count = 0
+        
+        self.rehash_count += 1   # ----update rehash_count
+        self.modifications += 1
+        if self.rehash_hook is not None:
+            self.rehash_hook(len(self.old_table), new_size, time.perf_counter() - start)
+    
+    def __migrate(self, slots: int) -> None:
         """
-        Find the correct position for this key in the hash table using linear probing
-        :complexity best: O(K) first position is empty
-                          where K is the size of the key
-        :complexity worst: O(K + N) when we've searched the entire table
+        Moves the items in the next slots of the old table into the table, leaving
+        tombstones behind so the old clusters can still be probed, and drops the
+        old table once all of it has been migrated. When the probe sequence misses
+        every free slot for an item, it goes back to its old slot and the resize is
+        finished at once by a rehash into a larger table, so no item is lost
+        :complexity: O(S) where S is slots, as the cached hashes are reused,
+                     O(N) when the resize is finished by a rehash where N is the table size
+        """
+        if self.old_table is None:
+            return
+        
+        end = min(self.migrate_position + slots, len(self.old_table))
+        for position in range(self.migrate_position, end):
+            item = self.old_table[position]
+            if item is not None and item is not self.TOMBSTONE:
+                self.old_table[position] = self.TOMBSTONE
+                self.count -= 1
+                try:
+                    self.__insert(item[0], item[1], self.old_hashes[position],
+                                  None if self.old_orders is None else self.old_orders[position])
+                except KeyError:
+                    self.old_table[position] = item
+                    self.count += 1
+                    self.__rehash()
+                    return
+        self.migrate_position = end
+        
+        if self.migrate_position == len(self.old_table):
+            self.old_table = None
+            self.old_hashes = None
+            self.old_orders = None
+    
+    def __old_probe(self, key: str, key_hash: int) -> int:
+        """
+        Find the position of this key in the old table, which is left in a valid probing
+        state while it is migrated
+        :complexity best: O(1) first position is empty or holds the key
+        :complexity worst: O(M) where M is the size of the old table
+        :raises KeyError: When the key is not in the old table
+        """
+        size = len(self.old_table)
+        position = key_hash % size
+        step, step_increase = self.__probe_steps(key_hash, size)
+        
+        for _ in range(size):
+            item = self.old_table[position]
+            if item is None:
+                raise KeyError(key)
+            elif item is not self.TOMBSTONE and self.old_hashes[position] == key_hash and item[0] == key:
+                return position
+            position = (position + step) % size
+            step += step_increase
+            self.probeChainLength += 1  # ----update probeChainLength
+        
+        raise KeyError(key)
+    
+    def __probe_steps(self, key_hash: int, size: int) -> tuple:
+        """
+        Returns the (first step, step increase) of the probe sequence of a key in a table of the given size:
+        every probe moves by the step, which then grows by the step increase
+        :complexity: O(1)
+        """
+        if self.probe_sequence == self.QUADRATIC_PROBING:
+            return 1, 2  # the slots 1, 4, 9, ... past home, half the slots of a prime sized table
+        if self.probe_sequence == self.DOUBLE_HASHING and size > 1:
+            return 1 + (key_hash // size) % (size - 1), 0  # coprime with a prime size, so every slot is visited
+        return 1, 0
+    
+    def __probe(self, key: str, key_hash: int, is_insert: bool) -> int:
+        """
+        Find the correct position for this key in the hash table following the probe sequence.
+        Keys are only compared once their cached hashes match
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N) when we've searched the entire table
                            where N is the table_size
         :raises KeyError: When a position can't be found
         """
-        position = self.hash(key)  # get the position using hash
+        if not is_insert:
+            position = self.__find(key, key_hash)
+            if position < 0:
+                raise KeyError(key)  # so the key is not in
+            return position
+        
+        position = key_hash % len(self.table)  # get the position using hash
+        step, step_increase = self.__probe_steps(key_hash, len(self.table))
+        first_tombstone = None  # inserts reuse the first tombstone once the key is known to be absent
         
-        if is_insert and self.is_full():
+        if self.is_full():
             raise KeyError(key)
         
         for _ in range(len(self.table)):  # start traversing
             if self.table[position] is None:  # found empty slot
-                if is_insert:
-                    return position
-                else:
-                    raise KeyError(key)  # so the key is not in
-            elif self.table[position][0] == key:  # found key
+                return position if first_tombstone is None else first_tombstone
+            elif self.table[position] is self.TOMBSTONE:  # deleted item, the cluster carries on
+                if first_tombstone is None:
+                    first_tombstone = position
+                position = (position + step) % len(self.table)
+                step += step_increase
+                self.probeChainLength += 1  # ----update probeChainLength
+            elif self.hashes[position] == key_hash and self.table[position][0] == key:  # found key
                 return position
             else:  # there is something but not the key, try next
-                position = (position + 1) % len(self.table)
+                position = (position + step) % len(self.table)
+                step += step_increase
                 self.probeChainLength += 1  # ----update probeChainLength
         
+        if first_tombstone is not None:
+            return first_tombstone
+        raise KeyError(key)
+    
+    def __find(self, key: str, key_hash: int) -> int:
+        """
+        Returns the position of this key in the table following the probe sequence, or -1 when it is
+        not in the table, without raising so lookups of missing keys stay cheap
+        :complexity best: O(1) first position is empty or holds the key
+        :complexity worst: O(N) where N is the table_size
+        """
+        table = self.table
+        hashes = self.hashes
+        size = len(table)
+        position = key_hash % size
+        step, step_increase = self.__probe_steps(key_hash, size)
+        
+        for probes in range(size):
+            item = table[position]
+            if item is None:
+                break
+            elif item is not self.TOMBSTONE and hashes[position] == key_hash and item[0] == key:
+                self.probeChainLength += probes  # ----update probeChainLength
+                return position
+            position = (position + step) % size
+            step += step_increase
+        else:
+            probes = size
+        self.probeChainLength += probes  # ----update probeChainLength
+        return -1
+    
+    def __robin_hood_probe(self, key: str, key_hash: int) -> int:
+        """
+        Find the position of this key, stopping as soon as we pass an entry closer to its home
+        position than the key would be, since Robin Hood insertion would have displaced it
+        :complexity best: O(1) first position is empty or holds the key
+        :complexity worst: O(D) where D is the longest probe distance in the table
+        :raises KeyError: When the key is not in the table
+        """
+        position = key_hash % len(self.table)
+        
+        for distance in range(len(self.table)):
+            if self.table[position] is None or self.__distance(position) < distance:
+                raise KeyError(key)
+            elif self.hashes[position] == key_hash and self.table[position][0] == key:
+                return position
+            position = (position + 1) % len(self.table)
+            self.probeChainLength += 1  # ----update probeChainLength
+        
+        raise KeyError(key)
+    
+    def __robin_hood_insert(self, key: str, data: T, key_hash: int, order: int = None) -> None:
+        """
+        Insert or update this key, swapping the entry we carry with any richer entry
+        (one closer to its home position) we meet on the way, order being the index in the
+        insertion order of a key being moved, None for a key being set
+        :complexity best: O(1) first position is empty or holds the key
+        :complexity worst: O(N) where N is the table_size
+        :raises KeyError: When the table is full
+        """
+        if self.is_full():
+            raise KeyError(key)
+        
+        position = key_hash % len(self.table)
+        item = (key, data)
+        item_hash = key_hash
+        item_order = order
+        distance = 0
+        displacing = False
+        
+        for _ in range(len(self.table)):
+            if self.table[position] is None:
+                self.table[position] = item
+                self.hashes[position] = item_hash
+                if self.ordered:
+                    self.orders[position] = self.__order_index(item) if item_order is None else item_order
+                self.count += 1
+                self.modifications += 1
+                return
+            elif not displacing and self.hashes[position] == key_hash and self.table[position][0] == key:
+                self.table[position] = item
+                if self.ordered:
+                    self.order[self.orders[position]] = item
+                return
+            elif self.__distance(position) < distance:
+                # the resident is richer than the item we carry, so it gives up its slot
+                resident_distance = self.__distance(position)
+                item, self.table[position] = self.table[position], item
+                item_hash, self.hashes[position] = self.hashes[position], item_hash
+                if self.ordered:
+                    if item_order is None:
+                        item_order = self.__order_index((key, data))
+                    item_order, self.orders[position] = self.orders[position], item_order
+                distance = resident_distance
+                displacing = True
+            position = (position + 1) % len(self.table)
+            distance += 1
+            self.probeChainLength += 1  # ----update probeChainLength
+        
         raise KeyError(key)
+    
+    def __insert(self, key: str, data: T, key_hash: int, order: int = None) -> None:
+        """
+        Insert or update this key in the table, without checking whether it needs resizing.
+        order is the index in the insertion order of a key being moved, None for a key being set
+        :see: #self.__probe(key: str, key_hash: int, is_insert: bool)
+        :see: #self.__robin_hood_insert(key: str, data: T, key_hash: int, order: int)
+        """
+        if self.robin_hood:
+            self.__robin_hood_insert(key, data, key_hash, order)
+            return
+        
+        # here the probeChainLength is updated depending how many slot it has to go through
+        # in finding an empty slot of the same key
+        position = self.__probe(key, key_hash, True)
+        previous = self.table[position]
+        self.table[position] = (key, data)
+        self.hashes[position] = key_hash
+        
+        if previous is self.TOMBSTONE:
+            self.tombstone_count -= 1
+        elif previous is not None:
+            if self.ordered:   # updated in place, it keeps its insertion order
+                self.order[self.orders[position]] = (key, data)
+            return
+        self.count += 1
+        self.modifications += 1
+        if self.ordered:
+            self.orders[position] = self.__order_index((key, data)) if order is None else order
+    
+    def __order_index(self, item: Tuple[str, T]) -> int:
+        """
+        Appends the item of a newly set key to the insertion order and returns its index
+        :complexity: O(1) amortised
+        """
+        self.order.append(item)
+        return len(self.order) - 1
 
     def __contains__(self, key: str) -> bool:
         """
@@ -149,33 +791,66 @@ class LinearProbeHashTable(Generic[T]):
     def __getitem__(self, key: str) -> T:
         """
         Get the item at a certain key
-        :see: #self.__linear_probe(key: str, is_insert: bool)
+        :see: #self.__probe(key: str, key_hash: int, is_insert: bool)
         :raises KeyError: when the item doesn't exist
         """
-        position = self.__linear_probe(key, False)
+        self.__migrate(self.MIGRATION_SLOTS)
+        self.probeChainLength = 0
+        key_hash = self.full_hash(key)
+        try:
+            if self.robin_hood:
+                position = self.__robin_hood_probe(key, key_hash)
+            else:
+                position = self.__probe(key, key_hash, False)
+        except KeyError:
+            if self.old_table is None:
+                raise
+            return self.old_table[self.__old_probe(key, key_hash)][1]
         return self.table[position][1]
     
     def __setitem__(self, key: str, data: T) -> None:
         """
         Set an (key, data) pair in our hash table
-        :see: #self.__linear_probe(key: str, is_insert: bool)
+        :see: #self.__probe(key: str, key_hash: int, is_insert: bool)
         :see: #self.__rehash()
         """
-        self.probeChainLength = 0   # -----initialize probe length to 0
-        if self.count > len(self.table)//2:
-            self.__rehash()
+        self.__migrate(self.MIGRATION_SLOTS)
+        limit = int(len(self.table) * self.max_load_factor)
+        if self.count + self.tombstone_count > limit:
+            # only grow when the live items need it, otherwise just clear out the tombstones
+            grow = self.count > limit // 2 or self.tombstone_count == 0
+            if self.incremental_resize:
+                self.__start_resize(grow)
+            else:
+                self.__rehash(grow)
         # if self.is_full():
         #     self.__rehash()
-            
-        # here the probeChainLength is updated depending how many slot it has to go through
-        # in finding an empty slot of the same key
-        position = self.__linear_probe(key, True)
         
-        if self.table[position] is None:
-            self.count += 1
-        # here probeChain list append probeChainLength
-        self.probeChains.append(self.probeChainLength)  # ----append probeChainLength
-        self.table[position] = (key, data)
+        self.probeChainLength = 0   # -----initialize probe length to 0
+        key_hash = self.full_hash(key)
+        if self.old_table is not None:
+            try:
+                position = self.__old_probe(key, key_hash)
+            except KeyError:
+                pass
+            else:  # not migrated yet, so update it where it is
+                self.old_table[position] = (key, data)
+                if self.ordered:
+                    self.order[self.old_orders[position]] = (key, data)
+                self.__record_probe_chain()  # ----record probeChainLength
+                return
+        
+        try:
+            self.__insert(key, data, key_hash)
+        except KeyError:
+            if self.probe_sequence == self.LINEAR_PROBING:
+                raise
+            # the sequence missed every free slot, which can happen when the table size is not a prime
+            self.__rehash()
+            self.probeChainLength = 0
+            self.__insert(key, data, key_hash)
+        # here the probeChainLength is added to the statistics
+        self.__record_probe_chain()  # ----record probeChainLength
     
     def is_empty(self):
         """
@@ -200,10 +875,18 @@ class LinearProbeHashTable(Generic[T]):
         :post: returns a valid position (0 <= value < table_size)
         :complexity: O(K) where K is the size of the key
         """
-        value = 0
-        for c in key:
-            value = (value * self.hash_base + ord(c)) % len(self.table)
-        return value
+        return self.full_hash(key) % len(self.table)
+    
+    def full_hash(self, key: str) -> int:
+        """
+        Hash function of the table reduced by HASH_MODULUS instead of the table size, so it can be
+        cached next to the item and turned into a position for a table of any size
+        :post: returns a value 0 <= value < HASH_MODULUS
+        :complexity: O(K) where K is the size of the key
+        """
+        if self.hash_function == self.POLYNOMIAL_HASH:
+            return polynomial_hash(key, self.hash_base)
+        return hash_key(key, self.hash_base, self.hash_function)
     
     def insert(self, key: str, data: T) -> None:
         """
@@ -212,31 +895,273 @@ class LinearProbeHashTable(Generic[T]):
         """
         self[key] = data
     
-    def statistics(self) -> tuple:
-        """ Method which re- turns a tuple (collision count, probe total, probe max, rehash count).
-        :complexity: O(K) where K is the size of the key
+    def reserve(self, extra: int) -> None:
+        """
+        Grows the table at once to the first prime size keeping extra more items under the maximum
+        load factor, instead of rehashing several times while they are inserted
+        :complexity: O(N) where N is the table size, when it has to grow, O(1) otherwise
+        """
+        if self.old_table is not None:
+            self.__migrate(len(self.old_table))
+        needed = self.count + self.tombstone_count + extra
+        if needed <= int(len(self.table) * self.max_load_factor):
+            return
+        new_size = self.__new_size(True)
+        if int(new_size * self.max_load_factor) < needed:
+            new_size = prime_at_least(int(needed / self.max_load_factor) + 1)
+        self.__rehash(True, new_size)
+    
+    def __locate(self, key: str) -> tuple:
+        """
+        Returns the (table, position) of this key, in the old table when it is still waiting to be
+        migrated, or (None, -1) when it is not in the hash table
+        :complexity: see __find
+        """
+        key_hash = self.full_hash(key)
+        if self.robin_hood:
+            try:
+                position = self.__robin_hood_probe(key, key_hash)
+            except KeyError:
+                position = -1
+        else:
+            position = self.__find(key, key_hash)
+        if position >= 0:
+            return self.table, position
+        if self.old_table is not None:
+            try:
+                return self.old_table, self.__old_probe(key, key_hash)
+            except KeyError:
+                pass
+        return None, -1
+    
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Returns the data of each key, or default for the keys not in the table, with the per lookup
+        work of __getitem__ (migrating, the exception of a missing key) done once for the batch
+        :complexity: O(K) per key in the best case, O(K + N) in the worst case, where K is the size
+                     of the key and N the table size
+        """
+        self.__migrate(self.MIGRATION_SLOTS)
+        self.probeChainLength = 0
+        results = []
+        if self.robin_hood or self.old_table is not None or self.probe_sequence != self.LINEAR_PROBING:
+            for key in keys:
+                table, position = self.__locate(key)
+                results.append(default if table is None else table[position][1])
+            return results
+        
+        # ----- plain linear probing, the probe loop is run inline with the table in local variables
+        table = self.table
+        hashes = self.hashes
+        size = len(table)
+        full_hash = self.full_hash
+        for key in keys:
+            key_hash = full_hash(key)
+            position = key_hash % size
+            data = default
+            for _ in range(size):
+                item = table[position]
+                if item is None:
+                    break
+                elif item is not self.TOMBSTONE and hashes[position] == key_hash and item[0] == key:
+                    data = item[1]
+                    break
+                position += 1
+                if position == size:
+                    position = 0
+            results.append(data)
+        return results
+    
+    def contains_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Returns whether each key is in the table
+        :see: #self.get_many(keys: Iterable[str], default: T)
+        """
+        missing = object()
+        return [data is not missing for data in self.get_many(keys, missing)]
+    
+    def insert_many(self, items: Iterable[Tuple[str, T]]) -> None:
+        """
+        Sets every (key, data) pair, after growing the table once for all of them
+        :complexity: O(N) to grow the table where N is its new size, plus the complexity of __insert per item
+        """
+        items = list(items)
+        self.reserve(len(items))
+        for key, data in items:
+            self.probeChainLength = 0
+            key_hash = self.full_hash(key)
+            try:
+                self.__insert(key, data, key_hash)
+            except KeyError:  # see __setitem__, which also deals with it
+                self[key] = data
+                continue
+            self.__record_probe_chain()  # ----record probeChainLength
+    
+    def delete_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Deletes every key and returns whether each one was in the table
+        :complexity: see __delitem__, per key
+        """
+        results = []
+        for key in keys:
+            try:
+                del self[key]
+            except KeyError:
+                results.append(False)
+            else:
+                results.append(True)
+        return results
+    
+    def __record_probe_chain(self) -> None:
+        """
+        Adds the current probeChainLength to the running statistics
+        :complexity: O(1)
+        """
+        if not self.collect_statistics:
+            return
+        if self.probeChainLength != 0:
+            self.collision_count += 1
+        self.probe_total += self.probeChainLength
+        self.probe_max = max(self.probe_max, self.probeChainLength)
+        self.probe_histogram[self.__histogram_bucket(self.probeChainLength)] += 1
+    
+    def __histogram_bucket(self, length: int) -> int:
+        """
+        Returns the histogram bucket of a probe chain length, one per length below
+        PROBE_HISTOGRAM_EXACT and then one per power of two
+        :complexity: O(1)
+        """
+        if length < self.PROBE_HISTOGRAM_EXACT:
+            return length
+        bucket = self.PROBE_HISTOGRAM_EXACT + length.bit_length() - self.PROBE_HISTOGRAM_EXACT.bit_length()
+        return min(bucket, self.PROBE_HISTOGRAM_SIZE - 1)
+    
+    def probe_percentile(self, percent: float) -> int:
+        """ Method which returns the probe chain length that percent % of the recorded probe chains don't exceed.
+        Past PROBE_HISTOGRAM_EXACT the histogram only knows the bucket, so the bucket's upper bound is returned
+        (never more than the probe max).
+        :complexity: O(1) as the histogram has a fixed size
+        """
+        recorded = sum(self.probe_histogram)
+        if recorded == 0:
+            return 0
+        needed = percent / 100 * recorded
+        seen = 0
+        for bucket in range(self.PROBE_HISTOGRAM_SIZE):
+            seen += self.probe_histogram[bucket]
+            if seen > 0 and seen >= needed:
+                if bucket < self.PROBE_HISTOGRAM_EXACT:
+                    return bucket
+                upper = (self.PROBE_HISTOGRAM_EXACT << (bucket - self.PROBE_HISTOGRAM_EXACT + 1)) - 1
+                return min(upper, self.probe_max)
+        return self.probe_max
+    
+    def statistics(self, percentiles: tuple = ()) -> tuple:
+        """ Method which re- turns a tuple (collision count, probe total, probe max, rehash count),
+        followed by the probe chain length at each of the given percentiles, e.g. (50, 99).
+        :complexity: O(1) as the counters are kept up to date on insert
         """
-        # self.probeChains is list of different probechainLength
-        collision_count = sum([1 for chain in self.probeChains if chain != 0])  # the total number of collisions
-        probe_total = sum(self.probeChains)     # the sum of all the probe chain lengths
-        probe_max = max(self.probeChains)   # the length of the longest probe chain
+        collision_count = self.collision_count  # the total number of collisions
+        probe_total = self.probe_total     # the sum of all the probe chain lengths
+        probe_max = self.probe_max   # the length of the longest probe chain
         rehashCount = self.rehash_count     # the number of times rehash has been called
-        return collision_count, probe_total, probe_max, rehashCount
+        return (collision_count, probe_total, probe_max, rehashCount) + \
+            tuple(self.probe_percentile(percent) for percent in percentiles)
+    
+    def displacement_statistics(self) -> tuple:
+        """ Method which returns a tuple (displacement total, displacement max) over the stored entries,
+        where the displacement of an entry is how many slots it sits past its home position, i.e. the
+        probe length needed to look it up (the number of steps from its home position for the other
+        probe sequences than linear).
+        :complexity: O(N) where N is the table size, O(N*D) for the other probe sequences where D is the
+                     longest displacement
+        """
+        displacement_total = 0
+        displacement_max = 0
+        for table, hashes in ((self.old_table, self.old_hashes), (self.table, self.hashes)):
+            if table is None:
+                continue
+            for position in range(len(table)):
+                if table[position] is not None and table[position] is not self.TOMBSTONE:
+                    displacement = self.__displacement(position, hashes[position], len(table))
+                    displacement_total += displacement
+                    displacement_max = max(displacement_max, displacement)
+        return displacement_total, displacement_max
+    
+    def __displacement(self, position: int, key_hash: int, size: int) -> int:
+        """
+        Returns the number of probe steps from the home position of a key to position
+        :complexity: O(1) for linear probing, O(D) otherwise where D is the displacement
+        """
+        home = key_hash % size
+        if self.probe_sequence == self.LINEAR_PROBING:
+            return (position - home) % size
+        step, step_increase = self.__probe_steps(key_hash, size)
+        displacement = 0
+        while home != position and displacement < size:
+            home = (home + step) % size
+            step += step_increase
+            displacement += 1
+        return displacement
      
     def __str__(self) -> str:
         """
-        Returns all they key/value pairs in our hash table (no particular order)
-        :complexity: O(N) where N is the table size
+        Returns all they key/value pairs in our hash table (no particular order, insertion order when ordered),
+        joined once rather than added up, which copied the result for every item; export.export_table streams them
+        to a file instead
+        :complexity: see items()
+        """
+        return "".join("(" + str(key) + "," + str(value) + ")\n" for (key, value) in self.items())
+    
+    def items(self) -> Iterator[Tuple[str, T]]:
         """
-        result = ""
-        for item in self.table:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
-        return result
+        Iterates over the (key, data) items of the table, in insertion order when ordered
+        :raises RuntimeError: when the table is changed during the iteration, lookups that migrate
+                              slots of an incremental resize included
+        :complexity: O(C) when ordered where C is the number of items, O(N) otherwise where N is the table size
+        """
+        modifications = self.modifications
+        if self.ordered:
+            for item in self.order:
+                if item is not None:
+                    yield item
+                    if self.modifications != modifications:
+                        raise RuntimeError("Hash table changed during iteration")
+            return
+        for table in (self.old_table, self.table):
+            if table is not None:
+                for item in table:
+                    if item is not None and item is not self.TOMBSTONE:
+                        yield item
+                        if self.modifications != modifications:
+                            raise RuntimeError("Hash table changed during iteration")
+    
+    def keys(self) -> Iterator[str]:
+        """
+        Iterates over the keys of the table
+        :see: #self.items()
+        """
+        return (item[0] for item in self.items())
+    
+    def values(self) -> Iterator[T]:
+        """
+        Iterates over the data of the table
+        :see: #self.items()
+        """
+        return (item[1] for item in self.items())
 
     def __iter__(self):
-        return iter(self.table)
+        """
+        Iterates over the slots of the table (and of the old table during an incremental resize),
+        with None for empty slots and tombstones. This is the raw view of the slots, which is not checked
+        for changes to the table; items() skips the empty slots and fails fast instead
+        :complexity: O(N) where N is the table size
+        """
+        if self.old_table is not None:
+            return (None if item is self.TOMBSTONE else item for item in chain(self.old_table, self.table))
+        if self.tombstone_count == 0:
+            return iter(self.table)
+        return (None if item is self.TOMBSTONE else item for item in self.table)
 
 
 class TestLinearProbeHashTable(unittest.TestCase):
@@ -309,5 +1234,581 @@ class TestLinearProbeHashTable(unittest.TestCase):
             self.assertIn("(" + str(i) + "," + str(i) + ")", str(dictionary))
 
 
+class TestRobinHoodHashTable(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(2000)]
+    
+    def test_get_set(self):
+        """ Testing inserts, updates and lookups through several resizes """
+        dictionary = LinearProbeHashTable(31, 5, robin_hood=True)
+        for i, word in enumerate(self.WORDS):
+            dictionary[word] = i
+        dictionary["word0"] = -1
+        
+        self.assertEqual(len(dictionary), len(self.WORDS))
+        self.assertEqual(dictionary["word0"], -1)
+        for i, word in enumerate(self.WORDS[1:], 1):
+            self.assertEqual(dictionary[word], i, "Could not find item: " + word)
+        self.assertFalse("missing" in dictionary)
+    
+    def test_del(self):
+        """ Deleting half of the items, the rest must still be reachable """
+        dictionary = LinearProbeHashTable(31, 5, robin_hood=True)
+        for i, word in enumerate(self.WORDS):
+            dictionary[word] = i
+        for word in self.WORDS[::2]:
+            del dictionary[word]
+        
+        self.assertEqual(len(dictionary), len(self.WORDS) // 2)
+        for i, word in enumerate(self.WORDS):
+            if i % 2 == 0:
+                with self.assertRaises(KeyError):
+                    _ = dictionary[word]
+            else:
+                self.assertEqual(dictionary[word], i, "Could not find item: " + word)
+    
+    def test_statistics(self):
+        """ Robin Hood keeps the same entries with a shorter longest probe than plain linear probing """
+        linear = LinearProbeHashTable(31, 4049)
+        robin_hood = LinearProbeHashTable(31, 4049, robin_hood=True)
+        for word in self.WORDS:
+            linear[word] = 1
+            robin_hood[word] = 1
+        
+        self.assertEqual(len(robin_hood.statistics()), 4)
+        linear_total, linear_max = linear.displacement_statistics()
+        robin_hood_total, robin_hood_max = robin_hood.displacement_statistics()
+        self.assertEqual(linear_total, robin_hood_total)
+        self.assertLess(robin_hood_max, linear_max)
+
+
+class TestTombstoneHashTable(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(200)]
+    
+    def test_del(self):
+        """ Deleted items leave tombstones and the rest of the cluster is still reachable """
+        dictionary = LinearProbeHashTable(1, 1103, tombstones=True)
+        for i, word in enumerate(self.WORDS):
+            dictionary[word] = i
+        for word in self.WORDS[::2]:
+            del dictionary[word]
+        
+        self.assertEqual(len(dictionary), len(self.WORDS) // 2)
+        self.assertEqual(dictionary.tombstone_count, len(self.WORDS) // 2)
+        for i, word in enumerate(self.WORDS):
+            if i % 2 == 0:
+                self.assertFalse(word in dictionary)
+                with self.assertRaises(KeyError):
+                    del dictionary[word]
+            else:
+                self.assertEqual(dictionary[word], i, "Could not find item: " + word)
+        self.assertNotIn(LinearProbeHashTable.TOMBSTONE, list(dictionary))
+    
+    def test_reuse(self):
+        """ Inserting after a delete reuses the tombstone and never duplicates a key """
+        dictionary = LinearProbeHashTable(1, 1103, tombstones=True)
+        for i, word in enumerate(self.WORDS):
+            dictionary[word] = i
+        del dictionary["word0"]
+        dictionary["word0"] = 0
+        self.assertEqual(dictionary.tombstone_count, 0)
+        
+        del dictionary["word12"]
+        dictionary["word21"] = -1  # same hash as word12 with base 1, so it sits past the tombstone
+        self.assertEqual(dictionary.tombstone_count, 1)
+        self.assertEqual(dictionary["word21"], -1)
+        del dictionary["word21"]
+        self.assertFalse("word21" in dictionary)
+        self.assertEqual(len(dictionary), len(self.WORDS) - 2)
+    
+    def test_rehash(self):
+        """ Resizing drops the tombstones and a delete heavy load doesn't keep growing the table """
+        dictionary = LinearProbeHashTable(31, 17, tombstones=True)
+        for i in range(1000):
+            dictionary[str(i)] = i
+            del dictionary[str(i)]
+        
+        self.assertEqual(len(dictionary), 0)
+        self.assertLessEqual(dictionary.tombstone_count, len(dictionary.table) // 2)
+        self.assertEqual(len(dictionary.table), 17)
+        
+        for i in range(100):
+            dictionary[str(i)] = i
+        self.assertEqual(dictionary.tombstone_count, 0)
+        for i in range(100):
+            self.assertEqual(dictionary[str(i)], i)
+
+
+class TestIncrementalResizeHashTable(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(3000)]
+    
+    def test_get_set(self):
+        """ Items are found in either table while a resize is running """
+        dictionary = LinearProbeHashTable(31, 5, incremental_resize=True)
+        migrating = 0
+        for i, word in enumerate(self.WORDS):
+            dictionary[word] = i
+            if dictionary.old_table is not None:
+                migrating += 1
+                self.assertEqual(dictionary[self.WORDS[i // 2]], i // 2)
+        
+        self.assertGreater(migrating, 0)
+        self.assertEqual(len(dictionary), len(self.WORDS))
+        for i, word in enumerate(self.WORDS):
+            self.assertEqual(dictionary[word], i, "Could not find item: " + word)
+        self.assertEqual(len([item for item in dictionary if item is not None]), len(self.WORDS))
+    
+    def test_bounded_migration(self):
+        """ Starting a resize only moves a bounded number of slots, the rest follows later operations """
+        dictionary = LinearProbeHashTable(31, 4049, incremental_resize=True)
+        for word in self.WORDS[:2025]:
+            dictionary[word] = 1
+        self.assertIsNone(dictionary.old_table)
+        
+        dictionary["extra"] = 1
+        self.assertIsNotNone(dictionary.old_table)
+        self.assertEqual(dictionary.rehash_count, 1)
+        self.assertEqual(dictionary.migrate_position, 0)
+        
+        _ = dictionary["extra"]
+        self.assertEqual(dictionary.migrate_position, LinearProbeHashTable.MIGRATION_SLOTS)
+        for _ in range(4049 // LinearProbeHashTable.MIGRATION_SLOTS + 1):
+            _ = "extra" in dictionary
+        self.assertIsNone(dictionary.old_table)
+        self.assertEqual(len(dictionary), 2026)
+    
+    def test_update_del(self):
+        """ Updating and deleting items that haven't been migrated yet """
+        for tombstones in (False, True):
+            dictionary = LinearProbeHashTable(31, 4049, tombstones=tombstones, incremental_resize=True)
+            for i, word in enumerate(self.WORDS[:2026]):
+                dictionary[word] = i
+            self.assertIsNotNone(dictionary.old_table)
+            
+            for word in self.WORDS[:1000:2]:
+                del dictionary[word]
+            for word in self.WORDS[1:1000:2]:
+                dictionary[word] = -1
+            
+            self.assertEqual(len(dictionary), 2026 - 500)
+            for i, word in enumerate(self.WORDS[:2026]):
+                if i < 1000 and i % 2 == 0:
+                    self.assertFalse(word in dictionary)
+                elif i < 1000:
+                    self.assertEqual(dictionary[word], -1)
+                else:
+                    self.assertEqual(dictionary[word], i)
+
+
+class TestHashCaching(unittest.TestCase):
+    class CountingHashTable(LinearProbeHashTable):
+        """ Counts how many times a key gets hashed """
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.hash_calls = 0
+        
+        def full_hash(self, key: str) -> int:
+            self.hash_calls += 1
+            return super().full_hash(key)
+    
+    def test_rehash_reuses_hash(self):
+        """ Every key is hashed once on insert, however many times the table is resized or clusters are moved """
+        for options in ({}, {"robin_hood": True}, {"incremental_resize": True}):
+            dictionary = self.CountingHashTable(31, 3, **options)
+            for i in range(500):
+                dictionary[str(i)] = i
+            self.assertGreater(dictionary.rehash_count, 5)
+            self.assertEqual(dictionary.hash_calls, 500)
+            
+            for i in range(0, 500, 2):
+                del dictionary[str(i)]
+            self.assertEqual(dictionary.hash_calls, 750)
+    
+    def test_hash(self):
+        """ The position is the cached full width hash reduced to the table size """
+        dictionary = LinearProbeHashTable(31, 17)
+        self.assertEqual(dictionary.hash("abc"), dictionary.full_hash("abc") % 17)
+        self.assertEqual(dictionary.full_hash("abc"), (97 * 31 + 98) * 31 + 99)
+        self.assertLess(dictionary.full_hash("a" * 100), LinearProbeHashTable.HASH_MODULUS)
+
+
+class TestCompactHashTable(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(2000)]
+    
+    def test_get_set_del(self):
+        """ The compact storage behaves like the default one in every mode """
+        for options in ({}, {"robin_hood": True}, {"tombstones": True}, {"incremental_resize": True}):
+            dictionary = LinearProbeHashTable(31, 5, compact=True, **options)
+            for i, word in enumerate(self.WORDS):
+                dictionary[word] = i
+            dictionary["word1"] += 1
+            for word in self.WORDS[::2]:
+                del dictionary[word]
+            
+            self.assertEqual(len(dictionary), len(self.WORDS) // 2)
+            self.assertEqual(dictionary["word1"], 2)
+            for i, word in enumerate(self.WORDS[3::2], 1):
+                self.assertEqual(dictionary[word], 2 * i + 1, "Could not find item: " + word)
+            self.assertFalse("word0" in dictionary)
+            self.assertEqual(len([item for item in dictionary if item is not None]), len(self.WORDS) // 2)
+            self.assertIn("(word3,3)", str(dictionary))
+    
+    def test_integer_values(self):
+        """ Only integer values can be stored """
+        dictionary = LinearProbeHashTable(31, 17, compact=True)
+        with self.assertRaises(TypeError):
+            dictionary["test"] = "test"
+        self.assertEqual(len(dictionary), 0)
+
+
+class TestProbeStatistics(unittest.TestCase):
+    # anagrams share a home position with hash base 1, so the i-th insert probes i slots
+    WORDS = ["".join(chars) for chars in permutations("abcde")]
+    
+    def test_statistics(self):
+        """ The counters match the probe chains of the inserts """
+        dictionary = LinearProbeHashTable(1, 1103)
+        self.assertEqual(dictionary.statistics(), (0, 0, 0, 0))
+        for word in self.WORDS:
+            dictionary[word] = 1
+        
+        self.assertEqual(dictionary.statistics(), (119, sum(range(120)), 119, 0))
+        self.assertEqual(sum(dictionary.probe_histogram), 120)
+    
+    def test_percentiles(self):
+        """ Percentiles are exact for short chains and bounded by the bucket for long ones """
+        dictionary = LinearProbeHashTable(1, 1103)
+        for word in self.WORDS:
+            dictionary[word] = 1
+        
+        self.assertEqual(dictionary.probe_percentile(0), 0)
+        self.assertEqual(dictionary.probe_percentile(10), 11)
+        self.assertEqual(dictionary.probe_percentile(50), 63)
+        self.assertEqual(dictionary.probe_percentile(100), 119)
+        self.assertEqual(dictionary.statistics((10, 100)), (119, sum(range(120)), 119, 0, 11, 119))
+    
+    def test_bounded(self):
+        """ Updates don't grow the statistics and collection can be turned off """
+        dictionary = LinearProbeHashTable(31, 17)
+        for i in range(10000):
+            dictionary["test"] = i
+        self.assertEqual(len(dictionary.probe_histogram), LinearProbeHashTable.PROBE_HISTOGRAM_SIZE)
+        self.assertEqual(dictionary.probe_histogram[0], 10000)
+        
+        dictionary = LinearProbeHashTable(1, 1103, collect_statistics=False)
+        for word in self.WORDS:
+            dictionary[word] = 1
+        self.assertEqual(dictionary.statistics((99,)), (0, 0, 0, 0, 0))
+
+
+class TestProbeSequences(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(2000)]
+    
+    def test_get_set_del(self):
+        """ Every probe sequence finds its items through resizes, deletes and reinserts """
+        for probe_sequence in LinearProbeHashTable.PROBE_SEQUENCES:
+            for options in ({}, {"incremental_resize": True}, {"compact": True}):
+                dictionary = LinearProbeHashTable(31, 17, probe_sequence=probe_sequence, **options)
+                for i, word in enumerate(self.WORDS):
+                    dictionary[word] = i
+                for word in self.WORDS[::3]:
+                    del dictionary[word]
+                for word in self.WORDS[:100:3]:
+                    dictionary[word] = -1
+                
+                for i, word in enumerate(self.WORDS):
+                    if i % 3 != 0:
+                        self.assertEqual(dictionary[word], i, probe_sequence + " could not find item: " + word)
+                    elif i < 100:
+                        self.assertEqual(dictionary[word], -1)
+                    else:
+                        self.assertFalse(word in dictionary)
+                self.assertEqual(len(dictionary), len(self.WORDS) - len(self.WORDS[::3]) + len(self.WORDS[:100:3]))
+                self.assertEqual(len([item for item in dictionary if item is not None]), len(dictionary))
+    
+    def test_tombstones(self):
+        """ The other probe sequences than linear delete with tombstones and can't be Robin Hood tables """
+        self.assertFalse(LinearProbeHashTable().tombstones)
+        self.assertTrue(LinearProbeHashTable(probe_sequence=LinearProbeHashTable.QUADRATIC_PROBING).tombstones)
+        self.assertTrue(LinearProbeHashTable(probe_sequence=LinearProbeHashTable.DOUBLE_HASHING).tombstones)
+        with self.assertRaises(ValueError):
+            LinearProbeHashTable(robin_hood=True, probe_sequence=LinearProbeHashTable.DOUBLE_HASHING)
+        with self.assertRaises(ValueError):
+            LinearProbeHashTable(probe_sequence="cubic")
+    
+    def test_clustering(self):
+        """ Keys sharing a home position don't pile up in one cluster with double hashing """
+        displacements = {}
+        for probe_sequence in LinearProbeHashTable.PROBE_SEQUENCES:
+            dictionary = LinearProbeHashTable(31, 1103, probe_sequence=probe_sequence)
+            for i in range(500):
+                dictionary[str(i * 1103)] = i
+            displacements[probe_sequence] = dictionary.displacement_statistics()
+            self.assertEqual(displacements[probe_sequence][0], dictionary.statistics()[1])
+        self.assertLess(displacements[LinearProbeHashTable.DOUBLE_HASHING][0],
+                        displacements[LinearProbeHashTable.LINEAR_PROBING][0])
+    
+    def test_table_size_not_prime(self):
+        """ A quadratic sequence that misses the free slots of a table whose size isn't prime makes it grow """
+        # anagrams share a home position with hash base 1, and the squares only reach 4 slots modulo 16
+        words = ["".join(chars) for chars in permutations("abc")]
+        dictionary = LinearProbeHashTable(1, 16, probe_sequence=LinearProbeHashTable.QUADRATIC_PROBING)
+        for i, word in enumerate(words):
+            dictionary[word] = i
+        self.assertEqual(dictionary.rehash_count, 1)
+        for i, word in enumerate(words):
+            self.assertEqual(dictionary[word], i)
+    
+    def test_unreachable_slot_on_resize(self):
+        """ An item the quadratic sequence can't place while migrating or rehashing makes the table grow, not vanish """
+        for options in ({"incremental_resize": True}, {}):
+            dictionary = LinearProbeHashTable(31, 2, probe_sequence=LinearProbeHashTable.QUADRATIC_PROBING, **options)
+            for word in ("dbca", "abdc", "k24"):
+                dictionary[word] = len(word)
+            self.assertEqual(len(dictionary), 3)
+            self.assertEqual(sorted(dictionary.items()), [("abdc", 4), ("dbca", 4), ("k24", 3)])
+            for word in ("dbca", "abdc", "k24"):
+                self.assertTrue(word in dictionary, word)
+
+
+class TestBatchOperations(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(1000)]
+    
+    def test_insert_many(self):
+        """ Inserting a batch grows the table at most once up front and matches inserting one by one """
+        for options in ({}, {"robin_hood": True}, {"compact": True},
+                        {"probe_sequence": LinearProbeHashTable.DOUBLE_HASHING}):
+            dictionary = LinearProbeHashTable(31, 17, **options)
+            dictionary.insert_many((word, i) for i, word in enumerate(self.WORDS))
+            self.assertLessEqual(dictionary.rehash_count, 1)
+            self.assertEqual(len(dictionary), len(self.WORDS))
+            for i, word in enumerate(self.WORDS):
+                self.assertEqual(dictionary[word], i)
+            dictionary.insert_many([(self.WORDS[0], -1)])
+            self.assertEqual(dictionary[self.WORDS[0]], -1)
+            self.assertEqual(len(dictionary), len(self.WORDS))
+    
+    def test_get_contains_delete_many(self):
+        """ The batch lookups and deletes give the same answers as the single key ones, also mid migration """
+        for options in ({}, {"robin_hood": True}, {"tombstones": True}, {"incremental_resize": True},
+                        {"probe_sequence": LinearProbeHashTable.QUADRATIC_PROBING}):
+            dictionary = LinearProbeHashTable(31, 17, **options)
+            for i, word in enumerate(self.WORDS):
+                dictionary[word] = i
+            keys = self.WORDS[::7] + ["missing" + str(i) for i in range(50)]
+            self.assertEqual(dictionary.get_many(keys, -1), [dictionary[key] if key in dictionary else -1
+                                                             for key in keys])
+            self.assertEqual(dictionary.contains_many(keys), [key.startswith("word") for key in keys])
+            self.assertEqual(dictionary.delete_many(keys), [key.startswith("word") for key in keys])
+            self.assertEqual(dictionary.contains_many(keys), [False] * len(keys))
+            self.assertEqual(len(dictionary), len(self.WORDS) - len(self.WORDS[::7]))
+            self.assertEqual(dictionary.get_many(self.WORDS[1:7]), list(range(1, 7)))
+    
+    def test_reserve(self):
+        """ Reserving room for more items grows the table once so they fit without a rehash """
+        dictionary = LinearProbeHashTable(31, 17)
+        dictionary.reserve(len(self.WORDS))
+        self.assertEqual(dictionary.rehash_count, 1)
+        for word in self.WORDS:
+            dictionary[word] = 1
+        self.assertEqual(dictionary.rehash_count, 1)
+        dictionary.reserve(0)
+        self.assertEqual(dictionary.rehash_count, 1)
+
+
+class TestResizePolicy(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(2000)]
+    
+    def test_max_load_factor(self):
+        """ The table only grows once the maximum load factor is exceeded, so higher ones need fewer slots """
+        sizes = {}
+        for max_load_factor in (0.25, 0.5, 0.9):
+            dictionary = LinearProbeHashTable(31, 17, max_load_factor=max_load_factor)
+            for i, word in enumerate(self.WORDS):
+                dictionary[word] = i
+                self.assertLessEqual(len(dictionary), int(len(dictionary.table) * max_load_factor) + 1)
+            sizes[max_load_factor] = len(dictionary.table)
+            for i, word in enumerate(self.WORDS):
+                self.assertEqual(dictionary[word], i)
+        self.assertGreater(sizes[0.25], sizes[0.5])
+        self.assertGreater(sizes[0.5], sizes[0.9])
+    
+    def test_probe_sequences(self):
+        """ Every probe sequence keeps its items under the resize policies the benchmarks sweep, apart from
+        quadratic probing past a load of 0.5, which it can't fill """
+        for max_load_factor, growth_factor in ((0.5, 1.2), (0.5, 2.0), (0.7, 1.2), (0.7, 2.0), (0.9, 2.0)):
+            for probe_sequence in LinearProbeHashTable.PROBE_SEQUENCES:
+                options = {"probe_sequence": probe_sequence, "max_load_factor": max_load_factor,
+                           "growth_factor": growth_factor}
+                if probe_sequence == LinearProbeHashTable.QUADRATIC_PROBING and max_load_factor > 0.5:
+                    with self.assertRaises(ValueError):
+                        LinearProbeHashTable(31, 5, **options)
+                    continue
+                for resize in ({}, {"incremental_resize": True}):
+                    dictionary = LinearProbeHashTable(31, 5, **options, **resize)
+                    for i, word in enumerate(self.WORDS + ["dacb"]):
+                        dictionary[word] = i
+                    self.assertEqual(len(dictionary), len(self.WORDS) + 1)
+                    self.assertEqual(len(list(dictionary.items())), len(self.WORDS) + 1)
+                    for i, word in enumerate(self.WORDS + ["dacb"]):
+                        self.assertEqual(dictionary[word], i, str(options))
+    
+    def test_growth_factor(self):
+        """ The table grows to the first prime at least growth factor times its size """
+        dictionary = LinearProbeHashTable(31, 17, growth_factor=2)
+        for word in self.WORDS[:10]:
+            dictionary[word] = 1
+        self.assertEqual(len(dictionary.table), 37)
+        self.assertEqual(dictionary.rehash_count, 1)
+        dictionary = LinearProbeHashTable(31, 17)
+        for word in self.WORDS:
+            dictionary[word] = 1
+        fewer_rehashes = LinearProbeHashTable(31, 17, growth_factor=4)
+        for word in self.WORDS:
+            fewer_rehashes[word] = 1
+        self.assertLess(fewer_rehashes.rehash_count, dictionary.rehash_count)
+    
+    def test_primes(self):
+        """ Primes past the end of PRIMES are generated """
+        sieve = [True] * 1000
+        for number in range(2, 1000):
+            if sieve[number]:
+                for multiple in range(number * number, 1000, number):
+                    sieve[multiple] = False
+        self.assertEqual([number for number in range(1000) if is_prime(number)],
+                         [number for number in range(2, 1000) if sieve[number]])
+        self.assertEqual(prime_at_least(18), 23)
+        self.assertEqual(prime_at_least(LinearProbeHashTable.PRIMES[-1]), LinearProbeHashTable.PRIMES[-1])
+        self.assertEqual(prime_at_least(LinearProbeHashTable.PRIMES[-1] + 1), 7199371)
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertFalse(is_prime(3215031751))  # strong pseudoprime to the bases 2, 3, 5 and 7
+    
+    def test_shrink(self):
+        """ Deleting most items shrinks the table, but never below its initial size """
+        for options in ({}, {"robin_hood": True}, {"tombstones": True}, {"incremental_resize": True},
+                        {"probe_sequence": LinearProbeHashTable.DOUBLE_HASHING}):
+            dictionary = LinearProbeHashTable(31, 17, min_load_factor=0.1, **options)
+            for i, word in enumerate(self.WORDS):
+                dictionary[word] = i
+            grown = len(dictionary.table)
+            for word in self.WORDS[10:]:
+                del dictionary[word]
+            self.assertLess(len(dictionary.table), grown)
+            self.assertGreaterEqual(len(dictionary.table), 17)
+            self.assertEqual(len(dictionary), 10)
+            for i, word in enumerate(self.WORDS[:10]):
+                self.assertEqual(dictionary[word], i)
+            for word in self.WORDS[:10]:
+                del dictionary[word]
+            self.assertEqual(len(dictionary.table), 17)
+        self.assertEqual(len(LinearProbeHashTable(31, 17).table), 17)
+    
+    def test_invalid(self):
+        """ Load factors and growth factors out of range are refused """
+        for options in ({"max_load_factor": 0}, {"max_load_factor": 1}, {"growth_factor": 1},
+                        {"max_load_factor": 0.6, "probe_sequence": LinearProbeHashTable.QUADRATIC_PROBING},
+                        {"min_load_factor": -0.1}, {"min_load_factor": 0.45}):
+            with self.assertRaises(ValueError):
+                LinearProbeHashTable(**options)
+
+
+class TestHashFunctions(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(1000)] + ["café", "naïve", "", "a" * 100]
+    
+    def test_get_set_del(self):
+        """ Every hash function finds its items through resizes and deletes """
+        for hash_function in LinearProbeHashTable.HASH_FUNCTIONS:
+            for options in ({}, {"robin_hood": True}, {"compact": True}):
+                dictionary = LinearProbeHashTable(31, 17, hash_function=hash_function, **options)
+                for i, word in enumerate(self.WORDS):
+                    dictionary[word] = i
+                for word in self.WORDS[::2]:
+                    del dictionary[word]
+                for i, word in enumerate(self.WORDS):
+                    self.assertEqual(word in dictionary, i % 2 == 1, hash_function)
+                self.assertEqual(dictionary.get_many(self.WORDS[1:8:2]), [1, 3, 5, 7])
+        with self.assertRaises(ValueError):
+            LinearProbeHashTable(hash_function="md5")
+    
+    def test_hash(self):
+        """ The hashes fit under HASH_MODULUS and the ones taking a base depend on it """
+        for hash_function in LinearProbeHashTable.HASH_FUNCTIONS:
+            for word in self.WORDS[:100]:
+                value = hash_key(word, 31, hash_function)
+                self.assertTrue(0 <= value < LinearProbeHashTable.HASH_MODULUS)
+                self.assertEqual(value, LinearProbeHashTable(31, hash_function=hash_function).full_hash(word))
+        self.assertEqual(fnv1a_hash(""), FNV_OFFSET_BASIS % LinearProbeHashTable.HASH_MODULUS)
+        self.assertEqual(fnv1a_hash("a"), 0xAF63DC4C8601EC8C % LinearProbeHashTable.HASH_MODULUS)
+        self.assertNotEqual(multiply_shift_hash("word", 31), multiply_shift_hash("word", 37))
+        self.assertNotEqual(salted_hash("word", 31), salted_hash("word", 37))
+    
+    def test_base_one(self):
+        """ Anagrams all collide with the polynomial hash in base 1, but not with the other hash functions """
+        words = ["".join(chars) for chars in permutations("abcdef")]
+        for hash_function in LinearProbeHashTable.HASH_FUNCTIONS:
+            hashes = set(hash_key(word, 1, hash_function) for word in words)
+            if hash_function == LinearProbeHashTable.POLYNOMIAL_HASH:
+                self.assertEqual(len(hashes), 1)
+            else:
+                self.assertEqual(len(hashes), len(words), hash_function)
+
+
+class TestIteration(unittest.TestCase):
+    OPTIONS = ({}, {"robin_hood": True}, {"tombstones": True}, {"incremental_resize": True}, {"compact": True},
+               {"probe_sequence": LinearProbeHashTable.DOUBLE_HASHING},
+               {"robin_hood": True, "incremental_resize": True})
+    
+    def test_items(self):
+        """ keys(), values() and items() give every item once, in insertion order when ordered """
+        for options in self.OPTIONS:
+            for ordered in (False, True):
+                dictionary = LinearProbeHashTable(31, 17, ordered=ordered, **options)
+                for i in range(300):
+                    dictionary[str(i)] = i
+                for i in range(0, 300, 3):
+                    del dictionary[str(i)]
+                dictionary["1"] = -1   # updating keeps its place
+                dictionary["0"] = 0       # setting again goes last
+                expected = [(str(i), -1 if i == 1 else i) for i in range(300) if i % 3] + [("0", 0)]
+                if not ordered:
+                    expected.sort()
+                items = list(dictionary.items())
+                self.assertEqual(items if ordered else sorted(items), expected, options)
+                self.assertEqual(list(dictionary.keys()), [item[0] for item in items])
+                self.assertEqual(list(dictionary.values()), [item[1] for item in items])
+                self.assertEqual(len(items), len(dictionary))
+    
+    def test_order_compaction(self):
+        """ The insertion order drops the holes of deleted keys and stays right through resizes """
+        for options in self.OPTIONS:
+            dictionary = LinearProbeHashTable(31, 17, ordered=True, **options)
+            for i in range(200):
+                dictionary[str(i)] = i
+            for i in range(150):
+                del dictionary[str(i)]
+            self.assertLessEqual(len(dictionary.order), 2 * len(dictionary))
+            for i in range(200, 250):
+                dictionary[str(i)] = i
+            self.assertEqual(list(dictionary.keys()), [str(i) for i in range(150, 250)], options)
+            self.assertEqual(str(dictionary), "".join("(" + str(i) + "," + str(i) + ")\n" for i in range(150, 250)))
+    
+    def test_fail_fast(self):
+        """ Changing the table while iterating over it raises RuntimeError, updating a value doesn't """
+        for ordered in (False, True):
+            dictionary = LinearProbeHashTable(31, 17, ordered=ordered)
+            for i in range(10):
+                dictionary[str(i)] = i
+            for key in dictionary.keys():
+                dictionary[key] = -1
+            self.assertEqual(set(dictionary.values()), {-1})
+            for iterator in (dictionary.keys(), dictionary.values(), dictionary.items()):
+                with self.assertRaises(RuntimeError):
+                    for _ in iterator:
+                        dictionary["new"] = 0
+                del dictionary["new"]
+            with self.assertRaises(RuntimeError):
+                for key in dictionary.keys():
+                    del dictionary[key]
+
+
 if __name__ == '__main__':
     unittest.main()
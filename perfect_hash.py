@@ -0,0 +1,221 @@
+""" This module freezes the items of a hash table into a read-only minimal perfect hash table, built by hash and
+displace (CHD): the keys are spread over small buckets, and each bucket, biggest first, gets the displacement that
+sends all its keys to free slots. Every slot then holds exactly one item and a lookup reads exactly one slot.
+Module consist of the following class and function:
+Class: PerfectHashTable
+Function: freeze
+
+A key with full hash h (polynomial hash of the key, mixed) goes to bucket h % B, and with f1 = (h // B) % N and
+f2 = (h // B // N) % N to the slot (f1 + d0 * f2 + d1) % N, where (d0, d1) = divmod(d, N) for the displacement d
+of its bucket, B being the number of buckets and N the number of slots.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
+from hash_table import LinearProbeHashTable, polynomial_hash
+from referential_array import ArrayR
+
+T = TypeVar('T')
+
+
+class PerfectHashTable:
+    """ Read-only minimal perfect hash table of the items of a hash table.
+
+    constants:
+        BUCKET_SIZE: average number of keys per bucket
+        SEED_BASE: first hash base tried, the next ones are tried when the buckets can't all be placed
+        MAX_SEEDS: number of hash bases tried before giving up
+        MIX: odd multiplier spreading the bits of short keys' small polynomial hashes, the hash base is multiplied
+             in too so single character keys, whose polynomial hash doesn't depend on the base, move between bases
+
+    attributes:
+        hash_base: hash base the table was built with
+        count: number of items, also the number of slots
+        bucket_count: number of buckets
+        displacements: displacement of each bucket
+        table: slots holding one (key, data) item each
+    """
+    BUCKET_SIZE = 2
+    SEED_BASE = 1000003
+    MAX_SEEDS = 32
+    MIX = 0x9E3779B97F4A7C15
+
+    def __init__(self, items: Iterable[Optional[Tuple[str, T]]]) -> None:
+        """ Builds the table from the items of a hash table, None items (empty slots) are skipped
+        :raises ValueError: when a key appears twice, or no hash base places every bucket
+        :complexity: O(N*K) expected, where N is the number of items and K the size of a key
+        """
+        items = [item for item in items if item is not None]
+        self.count = len(items)
+        self.bucket_count = max(1, -(-self.count // self.BUCKET_SIZE))
+        self.table = ArrayR(max(1, self.count))
+
+        for attempt in range(self.MAX_SEEDS):
+            self.hash_base = self.SEED_BASE + 2 * attempt
+            displacements = self.__place(items)
+            if displacements is not None:
+                self.displacements = displacements
+                return
+        raise ValueError("No perfect hash found for the items, are some keys duplicated?")
+
+    def full_hash(self, key: str) -> int:
+        """ Returns the mixed full width hash of key
+        :complexity: O(K) where K is the size of the key
+        """
+        return polynomial_hash(key, self.hash_base) * self.hash_base * self.MIX % LinearProbeHashTable.HASH_MODULUS
+
+    def __slot(self, key_hash: int, displacement: int) -> int:
+        """ Returns the slot of a key with full hash key_hash in a bucket displaced by displacement
+        :complexity: O(1)
+        """
+        rest = key_hash // self.bucket_count
+        first, second = rest % self.count, rest // self.count % self.count
+        multiplier, offset = divmod(displacement, self.count)
+        return (first + multiplier * second + offset) % self.count
+
+    def __place(self, items: List[Tuple[str, T]]) -> Optional[array]:
+        """ Places the items with the current hash base and returns the displacements of the buckets,
+        or None when a bucket can't be placed
+        :complexity: O(N*K) expected, where N is the number of items and K the size of a key
+        """
+        buckets = [[] for _ in range(self.bucket_count)]
+        for item in items:
+            key_hash = self.full_hash(item[0])
+            buckets[key_hash % self.bucket_count].append((key_hash, item))
+        displacements = array('q', bytes(array('q').itemsize * self.bucket_count))
+        taken = bytearray(self.count)
+
+        # ----- biggest buckets first, while most slots are still free
+        order = sorted(range(self.bucket_count), key=lambda index: len(buckets[index]), reverse=True)
+        position = 0
+        while position < len(order) and len(buckets[order[position]]) > 1:
+            bucket = buckets[order[position]]
+            pairs = [self.__slot(key_hash, 0) for key_hash, _ in bucket], \
+                    [(key_hash // self.bucket_count) // self.count % self.count for key_hash, _ in bucket]
+            if len(set(zip(*pairs))) < len(bucket):
+                # keys going to the same slot whatever the displacement
+                if len(set(item[0] for _, item in bucket)) < len(bucket):
+                    raise ValueError("Keys of a perfect hash table must be unique")
+                return None  # a different hash base may tell them apart
+            displacement = self.__displacement(pairs, taken)
+            if displacement is None:
+                return None
+            for (key_hash, item) in bucket:
+                slot = self.__slot(key_hash, displacement)
+                taken[slot] = 1
+                self.table[slot] = item
+            displacements[order[position]] = displacement
+            position += 1
+
+        # ----- buckets of one key can go straight to any free slot
+        free = (slot for slot in range(self.count) if not taken[slot])
+        while position < len(order) and buckets[order[position]]:
+            key_hash, item = buckets[order[position]][0]
+            slot = next(free)
+            self.table[slot] = item
+            displacements[order[position]] = (slot - self.__slot(key_hash, 0)) % self.count
+            position += 1
+        return displacements
+
+    def __displacement(self, pairs: Tuple[List[int], List[int]], taken: bytearray) -> Optional[int]:
+        """ Returns the first displacement sending every key of a bucket to a different free slot, or None,
+        where pairs are the f1 and f2 values of its keys
+        :complexity: O(N*N*M) worst case, where M is the bucket size, expected O(M) while few slots are taken
+        """
+        firsts, seconds = pairs
+        size = self.count
+        for multiplier in range(size):
+            starts = [(first + multiplier * second) % size for first, second in zip(firsts, seconds)]
+            if len(set(starts)) < len(starts):
+                continue  # the offset moves all the keys together, they would still collide
+            for offset in range(size):
+                for start in starts:
+                    if taken[(start + offset) % size]:
+                        break
+                else:
+                    return multiplier * size + offset
+        return None
+
+    def __len__(self) -> int:
+        """ Returns number of elements in the table
+        :complexity: O(1)
+        """
+        return self.count
+
+    def __getitem__(self, key: str) -> T:
+        """ Get the data stored for key, reading a single slot
+        :raises KeyError: when the key is not in the table
+        :complexity: O(K) where K is the size of the key
+        """
+        if self.count == 0:
+            raise KeyError(key)
+        key_hash = self.full_hash(key)
+        item = self.table[self.__slot(key_hash, self.displacements[key_hash % self.bucket_count])]
+        if item[0] != key:
+            raise KeyError(key)
+        return item[1]
+
+    def __contains__(self, key: str) -> bool:
+        """ Checks to see if the given key is in the table
+        :complexity: see __getitem__
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """ Returns the value of each key, or default for the keys not in the table
+        :complexity: see __getitem__, per key
+        """
+        results = []
+        for key in keys:
+            try:
+                results.append(self[key])
+            except KeyError:
+                results.append(default)
+        return results
+
+    def contains_many(self, keys: Iterable[str]) -> List[bool]:
+        """ Returns whether each key is in the table
+        :complexity: see __contains__, per key
+        """
+        return [key in self for key in keys]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """ Frozen tables are read-only
+        :raises TypeError: always
+        """
+        raise TypeError("Perfect hash tables are read-only, freeze the live table again instead")
+
+    def __delitem__(self, key: str) -> None:
+        """ Frozen tables are read-only
+        :raises TypeError: always
+        """
+        raise TypeError("Perfect hash tables are read-only, freeze the live table again instead")
+
+    def __iter__(self) -> Iterator[Tuple[str, T]]:
+        """ Iterates over the slots of the table, which are all full
+        :complexity: O(N) where N is the number of items
+        """
+        for slot in range(self.count):
+            yield self.table[slot]
+
+    def is_empty(self) -> bool:
+        """ Returns whether the table is empty
+        :complexity: O(1)
+        """
+        return self.count == 0
+
+
+def freeze(hash_table: Iterable[Optional[Tuple[str, T]]]) -> PerfectHashTable:
+    """ Returns a minimal perfect hash table of the items of hash_table, which is left unchanged
+    :raises ValueError: see PerfectHashTable
+    :complexity: O(N + C*K) expected, where N is the table size, C the number of items and K the size of a key
+    """
+    return PerfectHashTable(hash_table)
@@ -0,0 +1,204 @@
+""" Profiled Hash Table
+Defines an opt-in instrumented LinearProbeHashTable, which counts and times its get, set and delete operations and
+its rehashes, splitting the time of each operation between hashing the key, rehashing and the rest, mostly probing.
+Plain LinearProbeHashTable instances are not touched, so they pay nothing for it. The profile exports as a dict or
+as JSON for a metrics pipeline.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import Callable, Iterable, List, Tuple, TypeVar
+from hash_table import LinearProbeHashTable
+import json
+import time
+
+T = TypeVar('T')
+
+
+class OperationProfile:
+    """
+    Counters, times and latency histograms of the operations of a hash table
+
+    constants:
+        GET: lookups, by __getitem__, __contains__ (which goes through __getitem__), get_many and contains_many
+        SET: inserts and updates, by __setitem__ and insert_many
+        DELETE: deletes, by __delitem__ and delete_many (which goes through __delitem__)
+        OPERATIONS: the operations profiled
+        HISTOGRAM_SIZE: number of latency histogram buckets, bucket i counting latencies below 2**i nanoseconds
+
+    attributes:
+        counts: number of calls of each operation, keys of a batch counting one each
+        total_ns: nanoseconds spent in each operation
+        hash_ns: nanoseconds of each operation spent hashing keys
+        rehash_ns: nanoseconds of each operation spent rehashing
+        histograms: latency histogram of each operation
+        rehash_count: number of rehashes
+        rehash_sizes: (old size, new size) of each rehash
+        hashing_ns: nanoseconds spent hashing keys so far, the operations take their share from it
+        rehashing_ns: nanoseconds spent rehashing so far, the operations take their share from it
+    """
+    GET = "get"
+    SET = "set"
+    DELETE = "delete"
+    OPERATIONS = (GET, SET, DELETE)
+    HISTOGRAM_SIZE = 48
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears every counter
+        :complexity: O(H) where H is the histogram size
+        """
+        self.counts = dict.fromkeys(self.OPERATIONS, 0)
+        self.total_ns = dict.fromkeys(self.OPERATIONS, 0)
+        self.hash_ns = dict.fromkeys(self.OPERATIONS, 0)
+        self.rehash_ns = dict.fromkeys(self.OPERATIONS, 0)
+        self.histograms = {operation: [0] * self.HISTOGRAM_SIZE for operation in self.OPERATIONS}
+        self.rehash_count = 0
+        self.rehash_sizes = []
+        self.hashing_ns = 0
+        self.rehashing_ns = 0
+
+    def record(self, operation: str, elapsed_ns: int, hash_ns: int, rehash_ns: int, keys: int = 1) -> None:
+        """
+        Records a call of operation on keys keys that took elapsed_ns nanoseconds, hash_ns of them hashing
+        and rehash_ns rehashing, a batch going in the histogram with the mean latency of its keys
+        :complexity: O(1)
+        """
+        self.counts[operation] += keys
+        self.total_ns[operation] += elapsed_ns
+        self.hash_ns[operation] += hash_ns
+        self.rehash_ns[operation] += rehash_ns
+        bucket = min(self.HISTOGRAM_SIZE - 1, (elapsed_ns // max(1, keys)).bit_length())
+        self.histograms[operation][bucket] += keys
+
+    def latency_percentile(self, operation: str, percent: float) -> int:
+        """
+        Returns an upper bound in nanoseconds of the latency under which percent % of the calls of operation fell,
+        the top of its histogram bucket, or 0 when there were none
+        :complexity: O(H) where H is the histogram size
+        """
+        count = self.counts[operation]
+        if count == 0:
+            return 0
+        rank = max(1, -(-count * percent // 100))
+        seen = 0
+        for bucket, size in enumerate(self.histograms[operation]):
+            seen += size
+            if seen >= rank:
+                return 1 << bucket
+        return 1 << (self.HISTOGRAM_SIZE - 1)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the profile as plain dicts, lists and numbers, times in seconds and histograms keyed by the
+        upper bound of each non-empty bucket in nanoseconds
+        :complexity: O(H) where H is the histogram size
+        """
+        operations = {}
+        for operation in self.OPERATIONS:
+            total = self.total_ns[operation]
+            probe = total - self.hash_ns[operation] - self.rehash_ns[operation]
+            operations[operation] = {
+                "count": self.counts[operation],
+                "total_seconds": total / 1e9,
+                "mean_seconds": total / 1e9 / max(1, self.counts[operation]),
+                "hash_seconds": self.hash_ns[operation] / 1e9,
+                "rehash_seconds": self.rehash_ns[operation] / 1e9,
+                "probe_seconds": probe / 1e9,
+                "p50_seconds": self.latency_percentile(operation, 50) / 1e9,
+                "p99_seconds": self.latency_percentile(operation, 99) / 1e9,
+                "latency_histogram_ns": {str(1 << bucket): size
+                                         for bucket, size in enumerate(self.histograms[operation]) if size}}
+        return {"operations": operations,
+                "rehash": {"count": self.rehash_count, "total_seconds": self.rehashing_ns / 1e9,
+                           "sizes": [list(sizes) for sizes in self.rehash_sizes]},
+                "hash_seconds": self.hashing_ns / 1e9}
+
+    def to_json(self) -> str:
+        """
+        Returns the profile as a JSON document
+        :complexity: O(H) where H is the histogram size
+        """
+        return json.dumps(self.as_dict(), sort_keys=True)
+
+
+class ProfiledHashTable(LinearProbeHashTable[T]):
+    """
+    LinearProbeHashTable recording every operation in an OperationProfile
+
+    attributes:
+        profile: the OperationProfile of the table
+        on_rehash: None, or called as on_rehash(old size, new size, seconds) after each rehash
+    """
+
+    def __init__(self, *args, on_rehash: Callable[[int, int, float], None] = None, **kwargs) -> None:
+        """
+        Takes the arguments of LinearProbeHashTable, plus a callback called after each rehash
+        :complexity: see LinearProbeHashTable.__init__
+        """
+        self.profile = OperationProfile()
+        super().__init__(*args, **kwargs)
+        self.on_rehash = on_rehash
+        self.rehash_hook = self.__rehashed
+
+    def __rehashed(self, old_size: int, new_size: int, seconds: float) -> None:
+        """
+        Records a rehash and passes it on to on_rehash
+        :complexity: O(1), plus the complexity of on_rehash
+        """
+        self.profile.rehash_count += 1
+        self.profile.rehash_sizes.append((old_size, new_size))
+        self.profile.rehashing_ns += int(seconds * 1e9)
+        if self.on_rehash is not None:
+            self.on_rehash(old_size, new_size, seconds)
+
+    def full_hash(self, key: str) -> int:
+        """
+        Times hashing the key
+        :see: LinearProbeHashTable.full_hash
+        """
+        start = time.perf_counter_ns()
+        key_hash = super().full_hash(key)
+        self.profile.hashing_ns += time.perf_counter_ns() - start
+        return key_hash
+
+    def __timed(self, operation: str, call: Callable[[], T], keys: int = 1) -> T:
+        """
+        Returns call(), recording it as operation on keys keys, also when it raises
+        :complexity: the complexity of call
+        """
+        profile = self.profile
+        hashing, rehashing = profile.hashing_ns, profile.rehashing_ns
+        start = time.perf_counter_ns()
+        try:
+            return call()
+        finally:
+            profile.record(operation, time.perf_counter_ns() - start, profile.hashing_ns - hashing,
+                           profile.rehashing_ns - rehashing, keys)
+
+    def __getitem__(self, key: str) -> T:
+        """ :see: LinearProbeHashTable.__getitem__ """
+        return self.__timed(OperationProfile.GET, lambda: super(ProfiledHashTable, self).__getitem__(key))
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """ :see: LinearProbeHashTable.__setitem__ """
+        self.__timed(OperationProfile.SET, lambda: super(ProfiledHashTable, self).__setitem__(key, data))
+
+    def __delitem__(self, key: str) -> None:
+        """ :see: LinearProbeHashTable.__delitem__ """
+        self.__timed(OperationProfile.DELETE, lambda: super(ProfiledHashTable, self).__delitem__(key))
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """ :see: LinearProbeHashTable.get_many """
+        keys = list(keys)
+        return self.__timed(OperationProfile.GET, lambda: super(ProfiledHashTable, self).get_many(keys, default),
+                            len(keys))
+
+    def insert_many(self, items: Iterable[Tuple[str, T]]) -> None:
+        """ :see: LinearProbeHashTable.insert_many """
+        items = list(items)
+        self.__timed(OperationProfile.SET, lambda: super(ProfiledHashTable, self).insert_many(items), len(items))
@@ -0,0 +1,251 @@
+""" Sharded Hash Table ADT
+Defines a thread-safe hash table that partitions the keys across several LinearProbeHashTable shards, each
+with its own lock, so threads working on keys of different shards don't wait for each other and a shard
+resizing only holds up the keys of that shard.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from hash_table import LinearProbeHashTable
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import threading
+
+T = TypeVar('T')
+
+
+class ShardedHashTable(Generic[T]):
+    """
+    Sharded Hash Table
+
+    The shard of a key is picked with Python's hash of the key, which is computed in C and is
+    independent of the polynomial hash the shard then places the key with.
+
+    constants:
+        DEFAULT_SHARD_COUNT: number of shards used when none is given
+
+    attributes:
+        hash_base: base prime used in the hash function of the shards
+        hash_function: hash function of the shards, one of LinearProbeHashTable.HASH_FUNCTIONS
+        shards: the LinearProbeHashTable of each shard
+        locks: the lock of each shard, held for every operation on it
+    """
+    DEFAULT_SHARD_COUNT = 16
+
+    def __init__(self, hash_base: int = LinearProbeHashTable.DEFAULT_HASH_BASE,
+                 table_size: int = LinearProbeHashTable.DEFAULT_TABLE_SIZE, shard_count: int = DEFAULT_SHARD_COUNT,
+                 robin_hood: bool = False, tombstones: bool = False, incremental_resize: bool = False,
+                 compact: bool = False, collect_statistics: bool = True,
+                 probe_sequence: str = LinearProbeHashTable.LINEAR_PROBING,
+                 hash_function: str = LinearProbeHashTable.POLYNOMIAL_HASH, ordered: bool = False) -> None:
+        """
+        The table_size is split evenly between the shards, which then each resize on their own
+        :complexity: O(N) where N is the table_size
+        :raises ValueError: when the shard count is not positive, or see LinearProbeHashTable
+        """
+        if shard_count <= 0:
+            raise ValueError("Shard count should be larger than 0.")
+        self.hash_base = hash_base
+        self.hash_function = hash_function
+        shard_size = max(LinearProbeHashTable.MIN_CAPACITY, table_size // shard_count)
+        self.shards = [LinearProbeHashTable(hash_base, shard_size, robin_hood, tombstones, incremental_resize, compact,
+                                            collect_statistics, probe_sequence, hash_function=hash_function,
+                                            ordered=ordered)
+                       for _ in range(shard_count)]
+        self.locks = [threading.Lock() for _ in range(shard_count)]
+
+    def __shard(self, key: str) -> int:
+        """
+        Returns the index of the shard of key
+        :complexity: O(K) where K is the size of the key, once per string as Python caches its hash
+        """
+        return hash(key) % len(self.shards)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table, each shard counted while it is locked
+        :complexity: O(S) where S is the number of shards
+        """
+        total = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                total += len(shard)
+        return total
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Get the item at a certain key
+        :raises KeyError: when the item doesn't exist
+        :complexity: see LinearProbeHashTable.__getitem__
+        """
+        index = self.__shard(key)
+        with self.locks[index]:
+            return self.shards[index][key]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+        Set an (key, data) pair in our hash table
+        :complexity: see LinearProbeHashTable.__setitem__
+        """
+        index = self.__shard(key)
+        with self.locks[index]:
+            self.shards[index][key] = data
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes an item from our hash table
+        :raises KeyError: when the key doesn't exist
+        :complexity: see LinearProbeHashTable.__delitem__
+        """
+        index = self.__shard(key)
+        with self.locks[index]:
+            del self.shards[index][key]
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks to see if the given key is in the hash table
+        :complexity: see LinearProbeHashTable.__contains__
+        """
+        index = self.__shard(key)
+        with self.locks[index]:
+            return key in self.shards[index]
+
+    def update(self, key: str, function: Callable[[Optional[T]], T]) -> T:
+        """
+        Replaces the data of key by function(data), or function(None) when the key is not in the table,
+        in one step no other thread can come in between, e.g. to count occurrences, and returns the new data
+        :complexity: see LinearProbeHashTable.__getitem__ and __setitem__, plus the complexity of function
+        """
+        index = self.__shard(key)
+        with self.locks[index]:
+            shard = self.shards[index]
+            try:
+                data = function(shard[key])
+            except KeyError:
+                data = function(None)
+            shard[key] = data
+            return data
+
+    def __group(self, keys: List[str]) -> List[List[int]]:
+        """
+        Returns the indexes in keys of the keys of each shard
+        :complexity: O(N) where N is the number of keys
+        """
+        groups = [[] for _ in self.shards]
+        for index, key in enumerate(keys):
+            groups[self.__shard(key)].append(index)
+        return groups
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Returns the data of each key, or default for the keys not in the table, locking each shard once
+        :complexity: see LinearProbeHashTable.get_many
+        """
+        keys = list(keys)
+        results = [default] * len(keys)
+        for shard, lock, group in zip(self.shards, self.locks, self.__group(keys)):
+            if group:
+                with lock:
+                    values = shard.get_many([keys[index] for index in group], default)
+                for index, value in zip(group, values):
+                    results[index] = value
+        return results
+
+    def contains_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Returns whether each key is in the table, locking each shard once
+        :complexity: see LinearProbeHashTable.contains_many
+        """
+        keys = list(keys)
+        results = [False] * len(keys)
+        for shard, lock, group in zip(self.shards, self.locks, self.__group(keys)):
+            if group:
+                with lock:
+                    found = shard.contains_many([keys[index] for index in group])
+                for index, result in zip(group, found):
+                    results[index] = result
+        return results
+
+    def insert_many(self, items: Iterable[Tuple[str, T]]) -> None:
+        """
+        Sets every (key, data) pair, locking each shard once
+        :complexity: see LinearProbeHashTable.insert_many
+        """
+        items = list(items)
+        for shard, lock, group in zip(self.shards, self.locks, self.__group([key for key, _ in items])):
+            if group:
+                with lock:
+                    shard.insert_many([items[index] for index in group])
+
+    def delete_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Deletes every key and returns whether each one was in the table, locking each shard once
+        :complexity: see LinearProbeHashTable.delete_many
+        """
+        keys = list(keys)
+        results = [False] * len(keys)
+        for shard, lock, group in zip(self.shards, self.locks, self.__group(keys)):
+            if group:
+                with lock:
+                    deleted = shard.delete_many([keys[index] for index in group])
+                for index, result in zip(group, deleted):
+                    results[index] = result
+        return results
+
+    def __iter__(self) -> Iterator[Optional[Tuple[str, T]]]:
+        """
+        Iterates over the slots of the shards one after the other, with None for empty slots.
+        Each shard is copied while it is locked, so its slots are consistent, but writes to the
+        other shards can happen in between
+        :complexity: O(N) where N is the total table size
+        """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                slots = list(shard)
+            yield from slots
+
+    def items(self) -> Iterator[Tuple[str, T]]:
+        """
+        Iterates over the (key, data) items of the shards one after the other, each shard copied
+        while it is locked as for __iter__, in insertion order within a shard when ordered
+        :complexity: O(C) when ordered where C is the number of items, O(N) otherwise where N is the total table size
+        """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                items = list(shard.items())
+            yield from items
+
+    def keys(self) -> Iterator[str]:
+        """
+        Iterates over the keys of the shards
+        :see: #self.items()
+        """
+        return (item[0] for item in self.items())
+
+    def values(self) -> Iterator[T]:
+        """
+        Iterates over the data of the shards
+        :see: #self.items()
+        """
+        return (item[1] for item in self.items())
+
+    def is_empty(self) -> bool:
+        """
+        Returns whether the hash table is empty
+        :complexity: O(S) where S is the number of shards
+        """
+        return len(self) == 0
+
+    def statistics(self) -> tuple:
+        """ Method which returns a tuple (collision count, probe total, probe max, rehash count) over all the shards
+        :complexity: O(S) where S is the number of shards
+        """
+        collision_count = probe_total = probe_max = rehash_count = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                collisions, probes, longest, rehashes = shard.statistics()
+            collision_count += collisions
+            probe_total += probes
+            probe_max = max(probe_max, longest)
+            rehash_count += rehashes
+        return collision_count, probe_total, probe_max, rehash_count
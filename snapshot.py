@@ -0,0 +1,212 @@
+""" This module saves a loaded hash table to a binary snapshot file and serves lookups straight from the file
+through mmap, so processes that only read a dictionary don't have to rebuild it and share the page cache.
+Module consist of the following class and functions:
+Class: SnapshotHashTable
+Function: save_snapshot
+
+Snapshot layout (little endian):
+    header: magic, version, hash base, table size, count, offset of the keys, name of the hash function (padded)
+    slots: table size records of (hash, key offset, key length, padding, value), hash -1 for an empty slot
+    keys: UTF-8 bytes of every key, one after the other
+The slots are laid out by linear probing on the full width hash of the hash function, at most half full.
+Version 1 snapshots, whose header has no hash function, were always hashed with the polynomial hash.
+"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+from hash_table import LinearProbeHashTable, hash_key, prime_at_least
+import mmap
+import struct
+
+MAGIC = b'LPHT'
+VERSION = 2
+HEADER = struct.Struct('<4sIQQQQ16s')
+HEADER_V1 = struct.Struct('<4sIQQQQ')
+SLOT = struct.Struct('<qQIIq')
+EMPTY = -1
+
+
+def snapshot_table_size(count: int) -> int:
+    """ Returns the smallest prime keeping count items at most half full
+    :complexity: see prime_at_least
+    """
+    return prime_at_least(2 * count + 1)
+
+
+def save_snapshot(hash_table: LinearProbeHashTable, filename: str) -> int:
+    """ Writes the items of hash_table to a snapshot file and returns the number of items written.
+
+    :pre-condition: every value in the table is an integer
+    :raises TypeError: when a value is not an integer
+    :raises ValueError: when the table uses the salted built-in hash, which changes with the process
+    :complexity: O(N + C*K) where N is the snapshot table size, C the number of items and K the size of a key
+    """
+    hash_function = getattr(hash_table, "hash_function", LinearProbeHashTable.POLYNOMIAL_HASH)
+    if hash_function == LinearProbeHashTable.SALTED_HASH:
+        raise ValueError("Python's built-in hash changes with the process, it can't be saved in a snapshot")
+    table_size = snapshot_table_size(len(hash_table))
+    slots = bytearray(SLOT.pack(EMPTY, 0, 0, 0, 0) * table_size)
+    keys = bytearray()
+    keys_offset = HEADER.size + SLOT.size * table_size
+    count = 0
+
+    for item in hash_table:
+        if item is None:
+            continue
+        key, value = item
+        if not isinstance(value, int):
+            raise TypeError("Only integer values can be saved in a snapshot, got " + type(value).__name__)
+        key_bytes = str(key).encode("UTF-8")
+        key_hash = hash_key(str(key), hash_table.hash_base, hash_function)
+
+        position = key_hash % table_size
+        while SLOT.unpack_from(slots, position * SLOT.size)[0] != EMPTY:
+            position = (position + 1) % table_size
+        SLOT.pack_into(slots, position * SLOT.size, key_hash, keys_offset + len(keys), len(key_bytes), 0, value)
+        keys += key_bytes
+        count += 1
+
+    with open(filename, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, hash_table.hash_base, table_size, count, keys_offset,
+                                 hash_function.encode("ASCII")))
+        handle.write(slots)
+        handle.write(keys)
+    return count
+
+
+class SnapshotHashTable:
+    """ Read-only hash table answering lookups from a memory mapped snapshot file.
+
+    attributes:
+        hash_base: base prime used in hash function
+        hash_function: hash function the slots were laid out with, one of LinearProbeHashTable.HASH_FUNCTIONS
+        table_size: number of slots in the snapshot
+        count: number of items in the snapshot
+        slots_offset: position of the first slot in the file, after the header
+        buffer: memory map of the snapshot file
+    """
+
+    def __init__(self, filename: str) -> None:
+        """ Maps the snapshot file, only the header is read here
+        :raises ValueError: when the file is not a snapshot of a supported version
+        :complexity: O(1)
+        """
+        with open(filename, 'rb') as handle:
+            self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER_V1.size:
+            self.buffer.close()
+            raise ValueError(filename + " is not a hash table snapshot")
+        magic, version, self.hash_base, self.table_size, self.count, self.keys_offset = \
+            HEADER_V1.unpack_from(self.buffer, 0)
+        self.hash_function = LinearProbeHashTable.POLYNOMIAL_HASH
+        self.slots_offset = HEADER_V1.size
+        if magic == MAGIC and version == VERSION and len(self.buffer) >= HEADER.size:
+            self.hash_function = HEADER.unpack_from(self.buffer, 0)[-1].rstrip(b"\0").decode("ASCII")
+            self.slots_offset = HEADER.size
+        if magic != MAGIC or version not in (1, VERSION) or \
+                self.hash_function not in LinearProbeHashTable.HASH_FUNCTIONS:
+            self.buffer.close()
+            raise ValueError(filename + " is not a hash table snapshot of version 1 to " + str(VERSION))
+
+    def __len__(self) -> int:
+        """ Returns number of elements in the snapshot
+        :complexity: O(1)
+        """
+        return self.count
+
+    def __probe(self, key: str) -> Optional[int]:
+        """ Returns the value stored for key, or None when it is not in the snapshot
+        :complexity best: O(K) first position is empty or holds the key
+                          where K is the size of the key
+        :complexity worst: O(K + N) where N is the table size
+        """
+        key_bytes = key.encode("UTF-8")
+        key_hash = hash_key(key, self.hash_base, self.hash_function)
+        position = key_hash % self.table_size
+
+        for _ in range(self.table_size):
+            slot_hash, key_offset, key_length, _, value = SLOT.unpack_from(self.buffer,
+                                                                            self.slots_offset + position * SLOT.size)
+            if slot_hash == EMPTY:
+                return None
+            if slot_hash == key_hash and key_length == len(key_bytes) and \
+                    self.buffer[key_offset:key_offset + key_length] == key_bytes:
+                return value
+            position = (position + 1) % self.table_size
+        return None
+
+    def __getitem__(self, key: str) -> int:
+        """ Get the value stored for key
+        :raises KeyError: when the key is not in the snapshot
+        :complexity: see __probe
+        """
+        value = self.__probe(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        """ Checks to see if the given key is in the snapshot
+        :complexity: see __probe
+        """
+        return self.__probe(key) is not None
+
+    def get_many(self, keys: Iterable[str], default: Optional[int] = None) -> List[Optional[int]]:
+        """ Returns the value of each key, or default for the keys not in the snapshot
+        :complexity: see __getitem__, per key
+        """
+        results = []
+        for key in keys:
+            try:
+                results.append(self[key])
+            except KeyError:
+                results.append(default)
+        return results
+
+    def contains_many(self, keys: Iterable[str]) -> List[bool]:
+        """ Returns whether each key is in the snapshot
+        :complexity: see __contains__, per key
+        """
+        return [key in self for key in keys]
+
+    def __setitem__(self, key: str, data: int) -> None:
+        """ Snapshots are read-only
+        :raises TypeError: always
+        """
+        raise TypeError("Hash table snapshots are read-only")
+
+    def __delitem__(self, key: str) -> None:
+        """ Snapshots are read-only
+        :raises TypeError: always
+        """
+        raise TypeError("Hash table snapshots are read-only")
+
+    def __iter__(self) -> Iterator[Optional[Tuple[str, int]]]:
+        """ Iterates over the slots of the snapshot, with None for empty slots, like LinearProbeHashTable
+        :complexity: O(N) where N is the table size
+        """
+        for position in range(self.table_size):
+            slot_hash, key_offset, key_length, _, value = SLOT.unpack_from(self.buffer,
+                                                                            self.slots_offset + position * SLOT.size)
+            if slot_hash == EMPTY:
+                yield None
+            else:
+                yield self.buffer[key_offset:key_offset + key_length].decode("UTF-8"), value
+
+    def is_empty(self) -> bool:
+        """ Returns whether the snapshot is empty
+        :complexity: O(1)
+        """
+        return self.count == 0
+
+    def close(self) -> None:
+        """ Unmaps the snapshot file """
+        self.buffer.close()
+
+    def __enter__(self) -> 'SnapshotHashTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
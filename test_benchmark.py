@@ -0,0 +1,60 @@
+"""Unit Testing for the benchmark suite"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import os
+import tempfile
+import unittest
+from benchmark import RESULTS_VERSION, compare, load_results, resize_benchmarks, run_benchmarks, save_results, \
+    table_benchmarks
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_table_benchmarks(self) -> None:
+        """ Every operation is timed at every load factor """
+        results = table_benchmarks(200, load_factors=(0.25, 0.5), repeats=1)
+        self.assertEqual(len(results), 8)
+        for operation in ("insert", "lookup_hit", "lookup_miss", "delete"):
+            entry = results["table.{}[load=0.5]".format(operation)]
+            self.assertEqual(entry["operations"], 200)
+            self.assertGreater(entry["seconds"], 0)
+            self.assertAlmostEqual(entry["per_operation"], entry["seconds"] / 200)
+        with self.assertRaises(RuntimeError):
+            table_benchmarks(200, load_factors=(0.9,), repeats=1)
+
+    def test_resize_benchmarks(self) -> None:
+        """ Higher load factors end with fewer slots """
+        results = resize_benchmarks(500, policies=((0.5, 2.0), (0.9, 2.0)), repeats=1)
+        self.assertEqual(len(results), 6)
+        self.assertGreater(results["resize.insert[max_load=0.5,growth=2.0]"]["slots"],
+                           results["resize.insert[max_load=0.9,growth=2.0]"]["slots"])
+        self.assertGreaterEqual(results["resize.lookup_miss[max_load=0.9,growth=2.0]"]["slots"], 500)
+
+    def test_save_compare(self) -> None:
+        """ Saved results load back, and only benchmarks slower than the tolerance are flagged """
+        results = run_benchmarks(100, repeats=1, macro=False)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "results.json")
+            save_results(results, filename)
+            baseline = load_results(filename)
+            self.assertEqual(baseline, results)
+
+            name = "table.insert[load=0.5]"
+            self.assertEqual(compare(results, baseline), [])
+            baseline["benchmarks"][name]["per_operation"] = results["benchmarks"][name]["per_operation"] / 2
+            self.assertEqual(compare(results, baseline, 0.2), [(name, baseline["benchmarks"][name]["per_operation"],
+                                                                results["benchmarks"][name]["per_operation"])])
+            self.assertEqual(compare(results, baseline, 1.5), [])
+            del baseline["benchmarks"][name]
+            self.assertEqual(compare(results, baseline), [])
+
+            save_results(dict(results, version=RESULTS_VERSION + 1), filename)
+            with self.assertRaises(ValueError):
+                load_results(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
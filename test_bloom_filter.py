@@ -0,0 +1,39 @@
+"""Unit Testing for the Bloom filter"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import unittest
+from bloom_filter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(1000)]
+    MISSING = ["missing" + str(i) for i in range(10000)]
+    
+    def test_membership(self) -> None:
+        """ Every key added is maybe in the filter, and few others are """
+        bloom = BloomFilter(len(self.WORDS), 0.01)
+        for word in self.WORDS:
+            bloom.add(word)
+        self.assertEqual(len(bloom), len(self.WORDS))
+        self.assertTrue(bloom.is_full())
+        for word in self.WORDS:
+            self.assertTrue(word in bloom, "Could not find item: " + word)
+        false_positives = sum(word in bloom for word in self.MISSING)
+        self.assertLess(false_positives, 3 * 0.01 * len(self.MISSING))
+        self.assertEqual(bloom.statistics(), (len(self.WORDS) + false_positives, len(self.MISSING) - false_positives))
+    
+    def test_error_rate(self) -> None:
+        """ A lower error rate takes more bits and hashes """
+        loose, tight = BloomFilter(1000, 0.1), BloomFilter(1000, 0.001)
+        self.assertLess(loose.size, tight.size)
+        self.assertLess(loose.hash_count, tight.hash_count)
+        for error_rate in (0, 1, -0.5, 2):
+            with self.assertRaises(ValueError):
+                BloomFilter(1000, error_rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
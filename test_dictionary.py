@@ -7,9 +7,13 @@ __since__ = '22/05/2020'
 
 
 
+import os
+import time
+import tempfile
+import threading
 import unittest
 from hash_table import LinearProbeHashTable
-from dictionary import Statistics, Dictionary
+from dictionary import Statistics, Dictionary, SharedDictionary, load_statistics_job, shared_dictionary
 
 
 def file_len(filename: str) -> int:
@@ -119,6 +123,130 @@ class TestDictionary(unittest.TestCase):
         
         self.dictionary.delete_word('test')
         self.assertEqual(len(self.dictionary.hash_table), table_size - 1)
+    
+    def test_bloom_filter(self) -> None:
+        print("... Testing Bloom filter ...")
+        dictionary = Dictionary(TestDictionary.DEFAULT_HASH_BASE, 7, bloom_error_rate=0.01)
+        words = ["word" + str(i) for i in range(100)]
+        for word in words:
+            dictionary.add_word(word)
+        
+        # test case 1: # checking that the filter grew with the words and still lets them all through
+        self.assertGreaterEqual(dictionary.bloom.capacity, len(words))
+        for word in words:
+            self.assertTrue(dictionary.find_word(word))
+        self.assertEqual(dictionary.bloom.statistics(), (len(words), 0))
+        
+        # test case 2: # checking that most missing words are ruled out by the filter
+        for i in range(1000):
+            self.assertFalse(dictionary.find_word("missing" + str(i)))
+        hits, misses = dictionary.bloom.statistics()
+        self.assertEqual(hits + misses, len(words) + 1000)
+        self.assertGreater(misses, 900)
+    
+    def test_batch_words(self) -> None:
+        print("... Testing batch methods ...")
+        words = ["Word" + str(i) for i in range(500)]
+        missing = ["missing" + str(i) for i in range(100)]
+        for dictionary in (self.dictionary, Dictionary(TestDictionary.DEFAULT_HASH_BASE, 7, bloom_error_rate=0.01)):
+            
+            # test case 1: # checking that the batch of words is added in lower case
+            dictionary.add_words(words)
+            self.assertEqual(len(dictionary.hash_table), len(words))
+            self.assertEqual(dictionary.find_words(words + missing), [True] * len(words) + [False] * len(missing))
+            self.assertTrue(dictionary.find_word("word42"))
+            
+            # test case 2: # checking that the frozen table answers batches too
+            dictionary.freeze()
+            self.assertEqual(dictionary.find_words(missing + words[:10]), [False] * len(missing) + [True] * 10)
+            
+            # test case 3: # checking that deleting a batch tells which words were there and drops the frozen table
+            self.assertEqual(dictionary.delete_words(words[:10] + missing[:5]), [True] * 10 + [False] * 5)
+            self.assertIsNone(dictionary.frozen)
+            self.assertEqual(dictionary.find_words(words[:20]), [False] * 10 + [True] * 10)
+    
+    def test_freeze(self) -> None:
+        print("... Testing freeze method ...")
+        for word in ["apple", "banana", "cherry"]:
+            self.dictionary.add_word(word)
+        
+        # test case 1: # checking that the frozen table holds the words
+        frozen = self.dictionary.freeze()
+        self.assertEqual(len(frozen), 3)
+        self.assertTrue(self.dictionary.find_word("Banana"))
+        self.assertFalse(self.dictionary.find_word("durian"))
+        
+        # test case 2: # checking that adding and deleting words drops the frozen table and is seen by find_word
+        self.dictionary.add_word("durian")
+        self.assertIsNone(self.dictionary.frozen)
+        self.assertTrue(self.dictionary.find_word("durian"))
+        self.dictionary.freeze()
+        self.dictionary.delete_word("apple")
+        self.assertIsNone(self.dictionary.frozen)
+        self.assertFalse(self.dictionary.find_word("apple"))
+        
+        # test case 3: # checking that the frozen table is rebuilt from the hash table
+        self.assertEqual(len(self.dictionary.freeze()), 3)
+        self.assertTrue(self.dictionary.find_word("durian"))
+    
+    def test_shared_dictionary(self) -> None:
+        print("... Testing shared dictionary ...")
+        handle, filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, 'w', encoding="UTF-8") as file:
+            file.write("apple\nbanana\n")
+        try:
+            shared = SharedDictionary(filename, TestDictionary.DEFAULT_HASH_BASE, TestDictionary.DEFAULT_TABLE_SIZE)
+            
+            # test case 1: # checking that readers starting together all get the one dictionary loaded
+            dictionaries = []
+            threads = [threading.Thread(target=lambda: dictionaries.append(shared.get())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(dictionaries), 8)
+            for dictionary in dictionaries:
+                self.assertIs(dictionary, dictionaries[0])
+            self.assertTrue(dictionaries[0].find_word("apple"))
+            self.assertIs(shared.get(), dictionaries[0])
+            
+            # test case 2: # checking that a modified word list is loaded again
+            with open(filename, 'a', encoding="UTF-8") as file:
+                file.write("cherry\n")
+            modified = os.stat(filename).st_mtime_ns + 10 ** 9
+            os.utime(filename, ns=(modified, modified))
+            reloaded = shared.get()
+            self.assertIsNot(reloaded, dictionaries[0])
+            self.assertTrue(reloaded.find_word("cherry"))
+            self.assertFalse(dictionaries[0].find_word("cherry"))
+            
+            # test case 3: # checking that the process-wide shared dictionary is the same for the same word list
+            self.assertIs(shared_dictionary(filename, 31, 101), shared_dictionary(filename, 31, 101))
+            self.assertIsNot(shared_dictionary(filename, 31, 101), shared_dictionary(filename, 37, 101))
+            self.assertIsNot(shared_dictionary(filename, 31, 101), shared_dictionary(filename, 31, 101, 0.01))
+            self.assertIsNotNone(shared_dictionary(filename, 31, 101, 0.01).get().bloom)
+        finally:
+            os.remove(filename)
+    
+    def test_load_statistics_job(self) -> None:
+        """ A sweep job gives the csv line of its combination and stops at the sweep deadline """
+        print("Testing load statistics job......")
+        filename = TestDictionary.FILENAMES[0]
+        line = load_statistics_job((filename, TestDictionary.DEFAULT_HASH_BASE, TestDictionary.DEFAULT_TABLE_SIZE,
+                                    TestDictionary.DEFAULT_TIMEOUT, None))
+        self.assertEqual(line[:3], (filename, TestDictionary.DEFAULT_TABLE_SIZE, TestDictionary.DEFAULT_HASH_BASE))
+        self.assertEqual(line[3], file_len(filename))
+        
+        # test case 1: # the sweep ran out of time before the job started, so nothing gets loaded
+        line = load_statistics_job((filename, TestDictionary.DEFAULT_HASH_BASE, TestDictionary.DEFAULT_TABLE_SIZE,
+                                    TestDictionary.DEFAULT_TIMEOUT, time.time() - 1))
+        self.assertEqual(line[3:], (0, 0, 0, 0, 0, 0))
+        
+        # test case 2: # a job with a probe sequence loads the same words with it and adds it to the line
+        line = load_statistics_job((filename, TestDictionary.DEFAULT_HASH_BASE, TestDictionary.DEFAULT_TABLE_SIZE,
+                                    TestDictionary.DEFAULT_TIMEOUT, None, LinearProbeHashTable.DOUBLE_HASHING))
+        self.assertEqual(line[3], file_len(filename))
+        self.assertEqual(line[-1], LinearProbeHashTable.DOUBLE_HASHING)
 
     
 if __name__ == '__main__':
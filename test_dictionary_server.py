@@ -0,0 +1,74 @@
+"""Unit Testing for the dictionary server"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import asyncio
+import os
+import tempfile
+import unittest
+from dictionary import Dictionary
+from dictionary_server import load_test, serve
+
+
+class TestDictionaryServer(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(100)]
+    
+    def setUp(self) -> None:
+        self.dictionary = Dictionary(31, 17)
+        for word in self.WORDS:
+            self.dictionary.add_word(word)
+    
+    def run_with_server(self, test) -> None:
+        """ Runs the coroutine test(server, port) against a server of the dictionary on a free port """
+        async def run() -> None:
+            server, listener = await serve(self.dictionary)
+            async with listener:
+                await test(server, listener.sockets[0].getsockname()[1])
+        asyncio.run(run())
+    
+    def test_requests(self) -> None:
+        """ Pipelined requests are answered in order """
+        async def test(server, port) -> None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"FIND word1\nFIND missing\nADD Missing\nFIND missing\nDELETE word1\nDELETE word1\n"
+                         b"FIND word1\nJUMP word1\nFIND\n")
+            answers = [(await reader.readline()).decode().strip() for _ in range(9)]
+            writer.close()
+            self.assertEqual(answers, ["1", "0", "OK", "1", "OK", "MISSING", "0", "ERROR unknown command JUMP",
+                                       "ERROR expected a command and a word"])
+        self.run_with_server(test)
+    
+    def test_read_only(self) -> None:
+        """ Writes to a read-only dictionary are answered with an error, and the requests around them still are """
+        handle, filename = tempfile.mkstemp(suffix=".snapshot")
+        os.close(handle)
+        self.addCleanup(os.remove, filename)
+        self.dictionary.save_snapshot(filename)
+        self.dictionary.load_snapshot(filename)
+        
+        async def test(server, port) -> None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"FIND word1\nADD cherry\nFIND missing\nDELETE word2\nFIND word2\n")
+            answers = [(await asyncio.wait_for(reader.readline(), 5)).decode().strip() for _ in range(5)]
+            writer.close()
+            self.assertEqual(answers[0::2], ["1", "0", "1"])
+            self.assertTrue(answers[1].startswith("ERROR "), answers[1])
+            self.assertTrue(answers[3].startswith("ERROR "), answers[3])
+        self.run_with_server(test)
+    
+    def test_batching(self) -> None:
+        """ Many clients pipelining requests get all their answers, in fewer batches than requests """
+        async def test(server, port) -> None:
+            result = await load_test(self.WORDS, clients=20, requests=50, pipeline=10, port=port)
+            self.assertEqual(result["requests"], 20 * 50)
+            self.assertEqual(server.request_count, 20 * 50)
+            self.assertLess(server.batch_count, server.request_count // 10)
+            self.assertGreater(result["throughput"], 0)
+            self.assertLessEqual(result["p50"], result["p99"])
+        self.run_with_server(test)
+
+
+if __name__ == '__main__':
+    unittest.main()
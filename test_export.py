@@ -0,0 +1,78 @@
+"""Unit Testing for the streaming export"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import csv
+import io
+import unittest
+from hash_table import LinearProbeHashTable
+from sharded_hash_table import ShardedHashTable
+from export import BINARY, CSV, TEXT, export_table, read_binary, write_items
+
+
+class TestExport(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.table = LinearProbeHashTable(31, 17, ordered=True)
+        for i in range(1000):
+            self.table["word" + str(i)] = i
+        self.table["café, \"quoted\""] = -1
+        self.items = list(self.table.items())
+    
+    def test_text(self) -> None:
+        """ The text export is what __str__ prints """
+        handle = io.StringIO()
+        self.assertEqual(export_table(self.table, handle, TEXT, chunk_size=7), len(self.items))
+        self.assertEqual(handle.getvalue(), str(self.table))
+        self.assertEqual(handle.getvalue().splitlines()[0], "(word0,0)")
+    
+    def test_csv(self) -> None:
+        """ The csv export reads back with a header row, keys with commas and quotes included """
+        handle = io.StringIO(newline="")
+        export_table(self.table, handle, CSV, chunk_size=7)
+        handle.seek(0)
+        rows = list(csv.reader(handle))
+        self.assertEqual(rows[0], ["Key", "Value"])
+        self.assertEqual(rows[1:], [[key, str(value)] for key, value in self.items])
+    
+    def test_binary(self) -> None:
+        """ The binary export reads back item for item, from any table, and damaged files are refused """
+        for table in (self.table, ShardedHashTable(31, 17, shard_count=4)):
+            if isinstance(table, ShardedHashTable):
+                table.insert_many(self.items)
+            handle = io.BytesIO()
+            self.assertEqual(export_table(table, handle, BINARY, chunk_size=7), len(self.items))
+            self.assertEqual(sorted(read_binary(io.BytesIO(handle.getvalue()))), sorted(self.items))
+        
+        data = handle.getvalue()
+        for damaged in (b"", b"XXXX" + data[4:], data[:-1], data[:-20]):
+            with self.assertRaises(ValueError):
+                list(read_binary(io.BytesIO(damaged)))
+        with self.assertRaises(TypeError):
+            write_items([("word", "one")], io.BytesIO(), BINARY)
+    
+    def test_streaming(self) -> None:
+        """ Items are pulled and written a chunk at a time, empty inputs and bad arguments are handled """
+        writes = []
+        
+        class Recorder(io.StringIO):
+            def write(self, text: str) -> int:
+                writes.append(text)
+                return len(text)
+        
+        self.assertEqual(write_items(((str(i), i) for i in range(100)), Recorder(), TEXT, chunk_size=30), 100)
+        self.assertEqual([text.count("\n") for text in writes], [30, 30, 30, 10])
+        
+        handle = io.BytesIO()
+        self.assertEqual(write_items([], handle, BINARY), 0)
+        self.assertEqual(list(read_binary(io.BytesIO(handle.getvalue()))), [])
+        with self.assertRaises(ValueError):
+            write_items([], io.StringIO(), "xml")
+        with self.assertRaises(ValueError):
+            write_items([], io.StringIO(), TEXT, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
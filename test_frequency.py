@@ -7,9 +7,15 @@ __modified__ = '30/05/2020'
 __since__ = '22/05/2020'
 
 
+import csv
+import io
+import os
 import sys
+import tempfile
 from hash_table import LinearProbeHashTable
 from frequency import Frequency, Rarity
+from dictionary import shared_dictionary
+from export import BINARY, CSV, read_binary
 import unittest
 from list import ArrayList
 
@@ -20,7 +26,9 @@ class TestFrequency(unittest.TestCase):
     VALID_FILE_2 = "215-0.txt"
     
     def setUp(self) -> None:
-        self.frequency = Frequency()
+        # the word list is loaded once for all the tests
+        self.frequency = Frequency(dictionary=shared_dictionary("english_large.txt", Frequency.HASH_BASE,
+                                                                Frequency.TABLE_SIZE))
         # self.rarity = Rarity()
     
     def test_init(self) -> None:
@@ -40,6 +48,46 @@ class TestFrequency(unittest.TestCase):
         # test case 4: # checking that the max_word is None and 0
         self.assertEqual(self.frequency.max_word, (None, 0))
     
+    def test_shared_dictionary(self) -> None:
+        print("... Testing shared dictionary ...")
+        other = Frequency(dictionary=self.frequency.shared)
+        
+        # test case 1: # checking that both instances look words up in the same dictionary
+        self.assertIs(other.warehouse, self.frequency.warehouse)
+        
+        # test case 2: # checking that the counts of each instance are kept apart
+        other.add_file(self.VALID_FILE)
+        self.assertEqual(len(self.frequency.hash_table), 0)
+        self.assertGreater(len(other.hash_table), 0)
+        
+        # test case 3: # checking that a snapshot can't be given along with the shared dictionary
+        with self.assertRaises(ValueError):
+            Frequency(snapshot="english_large.snapshot", dictionary=self.frequency.shared)
+    
+    def test_bloom_filter(self) -> None:
+        print("... Testing Bloom filter in front of the dictionary ...")
+        filtered = Frequency(bloom_error_rate=0.01)
+        filtered.add_file(self.VALID_FILE)
+        self.frequency.add_file(self.VALID_FILE)
+        
+        # test case 1: # checking that the filter doesn't change the counts
+        self.assertEqual(len(filtered.hash_table), len(self.frequency.hash_table))
+        for item in self.frequency.hash_table:
+            if item is not None:
+                self.assertEqual(filtered.hash_table[item[0]], item[1])
+        
+        # test case 2: # checking that every word of the file went through the filter
+        hits, misses = filtered.dictionary.bloom.statistics()
+        self.assertGreaterEqual(hits, sum(item[1] for item in filtered.hash_table if item is not None))
+        
+        # test case 3: # checking that a shared dictionary gets its filter from shared_dictionary
+        shared = Frequency(dictionary=shared_dictionary("english_large.txt", Frequency.HASH_BASE,
+                                                        Frequency.TABLE_SIZE, bloom_error_rate=0.01))
+        self.assertIsNotNone(shared.dictionary.bloom)
+        self.assertIsNone(self.frequency.dictionary.bloom)
+        with self.assertRaises(ValueError):
+            Frequency(dictionary=self.frequency.shared, bloom_error_rate=0.01)
+    
     def test_add_file(self) -> None:
         # TODO: Add 3 or more unit tests
         invalid_file = "849.txt"
@@ -82,6 +130,49 @@ class TestFrequency(unittest.TestCase):
         result = self.frequency.rarity("road")
         self.assertEqual(result, Rarity.UNCOMMON)
     
+    def test_read_words(self) -> None:
+        print("... Testing read_words method ...")
+        text = "The  call\nof the   wild,\tBuck did not read the newspapers  "
+        handle, filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, 'w', encoding="UTF-8") as file:
+            file.write(text)
+        try:
+            # test case 1: # checking that words cut in two by the chunks are put back together
+            for chunk_size in (1, 2, 3, 5, 8, 1000):
+                self.assertEqual(list(self.frequency.read_words(filename, chunk_size)), text.split())
+            
+            # test case 2: # checking that the ingestion rate of the file is reported
+            self.frequency.add_file(filename)
+            self.assertGreater(self.frequency.ingestion_rate, 0)
+            self.assertEqual(self.frequency.hash_table["the"], 3)
+        finally:
+            os.remove(filename)
+    
+    def test_add_files(self) -> None:
+        print("... Testing add_files method ...")
+        # test case 1: # checking that counting in chunks across processes gives the same counts as add_file
+        self.frequency.add_files([self.VALID_FILE, self.INVALID_FILE, self.VALID_FILE_2], workers=2,
+                                 chunk_size=4096)
+        expected = Frequency()
+        expected.add_file(self.VALID_FILE)
+        expected.add_file(self.VALID_FILE_2)
+        self.assertEqual(len(self.frequency.hash_table), len(expected.hash_table))
+        for item in expected.hash_table:
+            if item is not None:
+                self.assertEqual(self.frequency.hash_table[item[0]], item[1])
+        
+        # test case 2: # checking that the most occurring word is the one with the highest count after the merge
+        highest = max(item[1] for item in self.frequency.hash_table if item is not None)
+        self.assertEqual(self.frequency.highest_occurrence, highest)
+        self.assertEqual(self.frequency.max_word[1], highest)
+        self.assertEqual(self.frequency.hash_table[self.frequency.max_word[0]], highest)
+        
+        # test case 3: # checking that chunks end between words
+        for start, end in self.frequency.file_chunks(self.VALID_FILE, 4096):
+            with open(self.VALID_FILE, 'rb') as handle:
+                handle.seek(end - 1)
+                self.assertTrue(end == os.path.getsize(self.VALID_FILE) or handle.read(1).isspace())
+    
     def test_normalize_word(self) -> None:
         print("... Testing normalize_word method ...")
         text_1 = "///!!Python"
@@ -100,6 +191,62 @@ class TestFrequency(unittest.TestCase):
         result = self.frequency.normalize_word(text_3)
         self.assertEqual(result, '')
     
+    def test_top_k(self) -> None:
+        print("... Testing top_k method ...")
+        # test case 1: # checking that an empty table has no top words
+        self.assertEqual(len(self.frequency.top_k(5)), 0)
+        
+        # test case 2: # checking that the top words are the most occurring ones in descending order
+        self.frequency.add_file(self.VALID_FILE)
+        ranking = self.frequency.ranking()
+        top = self.frequency.top_k(10)
+        self.assertEqual(len(top), 10)
+        for index in range(len(top)):
+            self.assertEqual(top[index][1], ranking[index][1])
+        self.assertEqual(top[0][1], max(item[1] for item in self.frequency.hash_table.items()))
+        
+        # test case 3: # checking that asking for more words than the table holds returns all of them
+        self.assertEqual(len(self.frequency.top_k(len(ranking) + 10)), len(ranking))
+        self.assertEqual(len(self.frequency.top_k(0)), 0)
+    
+    def test_ranking_ties(self) -> None:
+        print("... Testing ranking method with tied frequencies ...")
+        words = ["word" + str(number) for number in range(1000)]
+        for number, word in enumerate(words):
+            self.frequency.hash_table[word] = number % 7 + 1
+        table_order = [item[0] for item in self.frequency.hash_table if item is not None]
+        
+        # test case 1: # checking that frequencies are in descending order
+        ranking = self.frequency.ranking()
+        self.assertEqual(len(ranking), len(words))
+        for index in range(1, len(ranking)):
+            self.assertGreaterEqual(ranking[index - 1][1], ranking[index][1])
+        
+        # test case 2: # checking that words of equal frequency keep the order of the table
+        for frequency in range(1, 8):
+            tied = [ranking[index][0] for index in range(len(ranking)) if ranking[index][1] == frequency]
+            self.assertEqual(tied, [word for word in table_order if self.frequency.hash_table[word] == frequency])
+    
+    def test_export_ranking(self) -> None:
+        print("... Testing export_ranking method ...")
+        # test case 1: # checking that an empty table exports no words
+        handle = io.StringIO(newline="")
+        self.assertEqual(self.frequency.export_ranking(handle, CSV), 0)
+        self.assertEqual(handle.getvalue().splitlines(), ["Word,Frequency"])
+        
+        # test case 2: # checking that the csv and binary exports follow the ranking
+        for number in range(100):
+            self.frequency.hash_table["word" + str(number)] = number % 7 + 1
+        ranking = self.frequency.ranking()
+        expected = [ranking[index] for index in range(len(ranking))]
+        handle = io.StringIO(newline="")
+        self.assertEqual(self.frequency.export_ranking(handle, CSV), 100)
+        handle.seek(0)
+        self.assertEqual(list(csv.reader(handle))[1:], [[word, str(count)] for word, count in expected])
+        handle = io.BytesIO()
+        self.frequency.export_ranking(handle, BINARY)
+        self.assertEqual(list(read_binary(io.BytesIO(handle.getvalue()))), expected)
+    
     def test_ranking(self) -> None:
         print("... Testing ranking method ...")
         sys.setrecursionlimit(50000)
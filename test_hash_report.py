@@ -0,0 +1,47 @@
+"""Unit Testing for the hash quality report"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import os
+import tempfile
+import unittest
+from itertools import permutations
+from hash_table import LinearProbeHashTable
+from hash_report import COLUMNS, hash_quality, hash_report, read_words
+
+
+class TestHashReport(unittest.TestCase):
+    WORDS = ["".join(chars) for chars in permutations("abcdef")]
+    
+    def test_hash_quality(self) -> None:
+        """ Anagrams pile up with the polynomial hash in base 1 and spread out with a good hash """
+        clustered = hash_quality(self.WORDS, LinearProbeHashTable.POLYNOMIAL_HASH, 1, 7919)
+        spread = hash_quality(self.WORDS, LinearProbeHashTable.FNV1A_HASH, 1, 7919)
+        self.assertEqual(clustered["max_bucket"], len(self.WORDS))
+        self.assertEqual(clustered["probe_max"], len(self.WORDS) - 1)
+        self.assertEqual(clustered["probe_mean"], (len(self.WORDS) - 1) / 2)
+        self.assertGreater(clustered["chi_square_ratio"], 100)
+        self.assertLess(spread["chi_square_ratio"], 2)
+        self.assertLess(spread["probe_mean"], 2 * spread["uniform_probe_mean"] + 0.1)
+        self.assertAlmostEqual(spread["buckets_used"] * 7919, len(self.WORDS), delta=len(self.WORDS) / 5)
+        with self.assertRaises(ValueError):
+            hash_quality(self.WORDS, LinearProbeHashTable.FNV1A_HASH, 1, 7)
+    
+    def test_hash_report(self) -> None:
+        """ The report has a row per hash function and base, and one for FNV-1a, of each word list """
+        handle, filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w", encoding="UTF-8") as word_list:
+            word_list.write("\n".join(self.WORDS + [word.upper() for word in self.WORDS[:10]]) + "\n")
+        try:
+            self.assertEqual(read_words(filename), self.WORDS)
+            rows = hash_report((filename, filename + ".missing"), bases=(1, 31), table_size=7919)
+            self.assertEqual(len(rows), 7)
+            self.assertTrue(all(len(row) == len(COLUMNS) and row[3] == len(self.WORDS) for row in rows))
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
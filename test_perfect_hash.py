@@ -0,0 +1,56 @@
+"""Unit Testing for the frozen perfect hash tables"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import unittest
+from hash_table import LinearProbeHashTable
+from perfect_hash import PerfectHashTable, freeze
+
+
+class TestPerfectHashTable(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(1000)] + ["café", "naïve", "a", "b", ""]
+    
+    def test_freeze(self) -> None:
+        """ Every item of the live table is found in its single slot, and nothing else """
+        for options in ({}, {"robin_hood": True}, {"tombstones": True}, {"compact": True}):
+            hash_table = LinearProbeHashTable(31, 17, **options)
+            for i, word in enumerate(self.WORDS):
+                hash_table[word] = i
+            del hash_table["word0"]
+            
+            frozen = freeze(hash_table)
+            self.assertEqual(len(frozen), len(self.WORDS) - 1)
+            self.assertEqual(len(frozen.table), len(frozen))  # no empty slot
+            for i, word in enumerate(self.WORDS[1:], 1):
+                self.assertEqual(frozen[word], i, "Could not find item: " + word)
+            self.assertFalse("word0" in frozen)
+            self.assertFalse("missing" in frozen)
+            with self.assertRaises(KeyError):
+                _ = frozen["missing"]
+            self.assertEqual(sorted(frozen), sorted((word, i) for i, word in enumerate(self.WORDS) if i > 0))
+    
+    def test_small_tables(self) -> None:
+        """ Tables of a few single character keys, whose hash doesn't depend on the hash base """
+        for size in range(20):
+            frozen = PerfectHashTable((str(i), i) for i in range(size))
+            self.assertEqual(len(frozen), size)
+            self.assertEqual(frozen.is_empty(), size == 0)
+            for i in range(size):
+                self.assertEqual(frozen[str(i)], i)
+            self.assertFalse("missing" in frozen)
+    
+    def test_read_only(self) -> None:
+        """ Frozen tables can't be changed and keys can't be repeated """
+        frozen = freeze([("test", 1)])
+        with self.assertRaises(TypeError):
+            frozen["test"] = 2
+        with self.assertRaises(TypeError):
+            del frozen["test"]
+        with self.assertRaises(ValueError):
+            freeze([("test", 1), ("test", 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Unit Testing for the profiled hash table"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import json
+import unittest
+from hash_table import LinearProbeHashTable
+from profiled_hash_table import OperationProfile, ProfiledHashTable
+from dictionary import Dictionary
+
+
+class TestProfiledHashTable(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(500)]
+    
+    def test_counters(self) -> None:
+        """ Every operation is counted once, misses included, and behaves like LinearProbeHashTable """
+        table = ProfiledHashTable(31, 17)
+        for i, word in enumerate(self.WORDS):
+            table[word] = i
+        for word in self.WORDS[:100]:
+            self.assertTrue(word in table)
+        self.assertFalse("missing" in table)
+        with self.assertRaises(KeyError):
+            _ = table["missing"]
+        self.assertEqual(table.get_many(self.WORDS[:10]), list(range(10)))
+        self.assertEqual(table.delete_many(self.WORDS[:50] + ["missing"]), [True] * 50 + [False])
+        table.insert_many((word, 0) for word in self.WORDS[:50])
+        
+        profile = table.profile
+        self.assertEqual(profile.counts, {OperationProfile.GET: 112, OperationProfile.SET: 550,
+                                          OperationProfile.DELETE: 51})
+        for operation in OperationProfile.OPERATIONS:
+            self.assertEqual(sum(profile.histograms[operation]), profile.counts[operation])
+            self.assertGreater(profile.total_ns[operation], profile.hash_ns[operation])
+            self.assertGreater(profile.hash_ns[operation], 0)
+            self.assertGreater(profile.latency_percentile(operation, 99), 0)
+        self.assertEqual(profile.rehash_count, table.rehash_count)
+        self.assertGreater(profile.rehash_ns[OperationProfile.SET], 0)
+        self.assertEqual(profile.rehash_ns[OperationProfile.GET], 0)
+        
+        profile.reset()
+        self.assertEqual(profile.counts[OperationProfile.GET], 0)
+        self.assertEqual(profile.latency_percentile(OperationProfile.GET, 50), 0)
+    
+    def test_rehash_callback(self) -> None:
+        """ The callback hears of every rehash with the old and new sizes """
+        rehashes = []
+        table = ProfiledHashTable(31, 17, incremental_resize=True, on_rehash=lambda *rehash: rehashes.append(rehash))
+        for word in self.WORDS:
+            table[word] = 1
+        self.assertEqual(len(rehashes), table.rehash_count)
+        self.assertEqual([rehash[:2] for rehash in rehashes], table.profile.rehash_sizes)
+        self.assertEqual(rehashes[0][:2], (17, 23))
+        self.assertTrue(all(seconds >= 0 for _, _, seconds in rehashes))
+        self.assertIsNone(LinearProbeHashTable().rehash_hook)
+    
+    def test_export(self) -> None:
+        """ The profile exports as JSON with the times split between hashing, rehashing and probing """
+        dictionary = Dictionary(31, 17, profile=True)
+        for word in self.WORDS:
+            dictionary.add_word(word)
+            dictionary.find_word(word)
+        exported = json.loads(dictionary.hash_table.profile.to_json())
+        self.assertEqual(exported, json.loads(json.dumps(dictionary.hash_table.profile.as_dict())))
+        get = exported["operations"][OperationProfile.GET]
+        self.assertEqual(get["count"], len(self.WORDS))
+        self.assertAlmostEqual(get["hash_seconds"] + get["rehash_seconds"] + get["probe_seconds"],
+                               get["total_seconds"])
+        self.assertEqual(sum(get["latency_histogram_ns"].values()), len(self.WORDS))
+        self.assertLessEqual(get["p50_seconds"], get["p99_seconds"])
+        self.assertEqual(exported["rehash"]["count"], len(exported["rehash"]["sizes"]))
+        with self.assertRaises(ValueError):
+            Dictionary(31, 17, shards=2, profile=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
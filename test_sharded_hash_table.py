@@ -0,0 +1,136 @@
+"""Unit Testing for the sharded hash table"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import threading
+import unittest
+from hash_table import LinearProbeHashTable
+from sharded_hash_table import ShardedHashTable
+from dictionary import Dictionary
+
+
+class TestShardedHashTable(unittest.TestCase):
+    THREADS = 8
+    WORDS_PER_THREAD = 2000
+    
+    def run_threads(self, target) -> None:
+        """ Runs target(thread number) in THREADS threads started together and re-raises their first failure """
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+        
+        def run(number: int) -> None:
+            barrier.wait()
+            try:
+                target(number)
+            except Exception as error:  # reported in the main thread
+                errors.append(error)
+        
+        threads = [threading.Thread(target=run, args=(number,)) for number in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+    
+    def test_get_set_del(self) -> None:
+        """ Behaves like a single hash table """
+        table = ShardedHashTable(31, 17, shard_count=4)
+        self.assertTrue(table.is_empty())
+        for i in range(1000):
+            table[str(i)] = i
+        del table["0"]
+        self.assertEqual(len(table), 999)
+        self.assertFalse("0" in table)
+        with self.assertRaises(KeyError):
+            _ = table["0"]
+        items = sorted(item for item in table if item is not None)
+        self.assertEqual(items, sorted((str(i), i) for i in range(1, 1000)))
+        self.assertGreater(table.statistics()[3], 0)
+        with self.assertRaises(ValueError):
+            ShardedHashTable(shard_count=0)
+    
+    def test_stress(self) -> None:
+        """ Threads writing, reading and deleting their own words while the shards resize leave every word right """
+        for probe_sequence in (LinearProbeHashTable.LINEAR_PROBING, LinearProbeHashTable.DOUBLE_HASHING):
+            table = ShardedHashTable(31, 17, shard_count=4, probe_sequence=probe_sequence)
+            
+            def work(number: int) -> None:
+                words = [str(number) + "-" + str(i) for i in range(self.WORDS_PER_THREAD)]
+                for i, word in enumerate(words):
+                    table[word] = i
+                    self.assertEqual(table[word], i)
+                for word in words[::2]:
+                    del table[word]
+                for i, word in enumerate(words):
+                    self.assertEqual(word in table, i % 2 == 1, word)
+            
+            self.run_threads(work)
+            self.assertEqual(len(table), self.THREADS * self.WORDS_PER_THREAD // 2)
+            for number in range(self.THREADS):
+                for i in range(1, self.WORDS_PER_THREAD, 2):
+                    self.assertEqual(table[str(number) + "-" + str(i)], i)
+    
+    def test_update(self) -> None:
+        """ Threads counting the same words with update never lose a count """
+        table = ShardedHashTable(31, 17, shard_count=4)
+        words = ["word" + str(i) for i in range(50)]
+        
+        def work(number: int) -> None:
+            for _ in range(20):
+                for word in words:
+                    table.update(word, lambda count: 1 if count is None else count + 1)
+        
+        self.run_threads(work)
+        for word in words:
+            self.assertEqual(table[word], self.THREADS * 20)
+    
+    def test_batches(self) -> None:
+        """ Threads inserting, looking up and deleting batches of their own words leave every word right """
+        table = ShardedHashTable(31, 17, shard_count=4)
+        
+        def work(number: int) -> None:
+            words = [str(number) + "-" + str(i) for i in range(self.WORDS_PER_THREAD)]
+            table.insert_many((word, i) for i, word in enumerate(words))
+            self.assertEqual(table.get_many(words), list(range(self.WORDS_PER_THREAD)))
+            self.assertEqual(table.delete_many(words[::2] + ["missing"]), [True] * len(words[::2]) + [False])
+            self.assertEqual(table.contains_many(words), [i % 2 == 1 for i in range(self.WORDS_PER_THREAD)])
+        
+        self.run_threads(work)
+        self.assertEqual(len(table), self.THREADS * self.WORDS_PER_THREAD // 2)
+    
+    def test_items(self) -> None:
+        """ items(), keys() and values() give every item once, in insertion order within a shard when ordered """
+        for ordered in (False, True):
+            table = ShardedHashTable(31, 17, shard_count=4, ordered=ordered)
+            for i in range(500):
+                table[str(i)] = i
+            for i in range(0, 500, 2):
+                del table[str(i)]
+            items = list(table.items())
+            self.assertEqual(sorted(items), sorted((str(i), i) for i in range(1, 500, 2)))
+            self.assertEqual(list(table.keys()), [key for key, _ in items])
+            self.assertEqual(list(table.values()), [data for _, data in items])
+            if ordered:
+                for shard in table.shards:
+                    self.assertEqual([int(key) for key in shard.keys()], sorted(int(key) for key in shard.keys()))
+    
+    def test_dictionary(self) -> None:
+        """ A sharded dictionary serves find_word and add_word from several threads """
+        dictionary = Dictionary(31, 17, shards=4)
+        
+        def work(number: int) -> None:
+            for i in range(500):
+                dictionary.add_word("Word" + str(number) + "x" + str(i))
+                self.assertTrue(dictionary.find_word("word" + str(number) + "x" + str(i)))
+        
+        self.run_threads(work)
+        self.assertEqual(len(dictionary.hash_table), self.THREADS * 500)
+        with self.assertRaises(ValueError):
+            Dictionary(31, 17, bloom_error_rate=0.01, shards=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Unit Testing for the hash table snapshots"""
+
+__author__ = "Derek Chukwudi Anyanwu"
+__docformat__ = 'reStructuredText'
+
+
+import os
+import tempfile
+import unittest
+from hash_table import LinearProbeHashTable, polynomial_hash
+from dictionary import Dictionary
+from snapshot import EMPTY, HEADER_V1, MAGIC, SLOT, SnapshotHashTable, save_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    WORDS = ["word" + str(i) for i in range(1000)] + ["café", "naïve"]
+    
+    def setUp(self) -> None:
+        """ Used by our test cases """
+        handle, self.filename = tempfile.mkstemp(suffix=".snapshot")
+        os.close(handle)
+    
+    def tearDown(self) -> None:
+        os.remove(self.filename)
+    
+    def test_save_load(self) -> None:
+        """ Every item saved can be looked up from the mapped file, and nothing else """
+        for options in ({}, {"robin_hood": True}, {"tombstones": True}, {"compact": True}):
+            hash_table = LinearProbeHashTable(31, 17, **options)
+            for i, word in enumerate(self.WORDS):
+                hash_table[word] = i
+            del hash_table["word0"]
+            
+            self.assertEqual(save_snapshot(hash_table, self.filename), len(self.WORDS) - 1)
+            with SnapshotHashTable(self.filename) as snapshot:
+                self.assertEqual(len(snapshot), len(self.WORDS) - 1)
+                for i, word in enumerate(self.WORDS[1:], 1):
+                    self.assertEqual(snapshot[word], i, "Could not find item: " + word)
+                self.assertFalse("word0" in snapshot)
+                self.assertFalse("missing" in snapshot)
+                with self.assertRaises(KeyError):
+                    _ = snapshot["missing"]
+                self.assertEqual(sorted(item for item in snapshot if item is not None),
+                                 sorted((word, i) for i, word in enumerate(self.WORDS) if i > 0))
+    
+    def test_read_only(self) -> None:
+        """ Snapshots can't be changed and only integer values can be saved """
+        hash_table = LinearProbeHashTable()
+        hash_table["test"] = "test"
+        with self.assertRaises(TypeError):
+            save_snapshot(hash_table, self.filename)
+        
+        hash_table["test"] = 1
+        save_snapshot(hash_table, self.filename)
+        with SnapshotHashTable(self.filename) as snapshot:
+            with self.assertRaises(TypeError):
+                snapshot["test"] = 2
+            with self.assertRaises(TypeError):
+                del snapshot["test"]
+    
+    def test_invalid_file(self) -> None:
+        """ Files that aren't snapshots are rejected """
+        with open(self.filename, 'wb') as handle:
+            handle.write(b"not a snapshot" * 10)
+        with self.assertRaises(ValueError):
+            SnapshotHashTable(self.filename)
+    
+    def test_dictionary(self) -> None:
+        """ A dictionary loaded from a snapshot finds the same words """
+        dictionary = Dictionary(31, 250727)
+        for word in self.WORDS:
+            dictionary.add_word(word)
+        self.assertEqual(dictionary.save_snapshot(self.filename), len(self.WORDS))
+        
+        mapped = Dictionary(31, 17)
+        self.assertEqual(mapped.load_snapshot(self.filename), len(self.WORDS))
+        self.assertTrue(mapped.find_word("WORD10"))
+        self.assertTrue(mapped.find_word("café"))
+        self.assertFalse(mapped.find_word("AMAKOHIA"))
+        mapped.hash_table.close()
+    
+    def test_hash_functions(self) -> None:
+        """ The snapshot records the hash function it was laid out with and looks keys up with it """
+        for hash_function in LinearProbeHashTable.HASH_FUNCTIONS[:-1]:
+            dictionary = Dictionary(1, 17, hash_function=hash_function)
+            for word in self.WORDS:
+                dictionary.add_word(word)
+            dictionary.save_snapshot(self.filename)
+            with SnapshotHashTable(self.filename) as snapshot:
+                self.assertEqual(snapshot.hash_function, hash_function)
+                self.assertEqual(snapshot.get_many(self.WORDS[:3] + ["missing"]), [1, 1, 1, None])
+        
+        salted = LinearProbeHashTable(31, 17, hash_function=LinearProbeHashTable.SALTED_HASH)
+        salted["word"] = 1
+        with self.assertRaises(ValueError):
+            save_snapshot(salted, self.filename)
+    
+    def test_version_1(self) -> None:
+        """ Snapshots written before the header had a hash function are read with the polynomial hash """
+        key = "word".encode("UTF-8")
+        keys_offset = HEADER_V1.size + 3 * SLOT.size
+        key_hash = polynomial_hash("word", 31)
+        slots = [SLOT.pack(EMPTY, 0, 0, 0, 0)] * 3
+        slots[key_hash % 3] = SLOT.pack(key_hash, keys_offset, len(key), 0, 5)
+        with open(self.filename, 'wb') as handle:
+            handle.write(HEADER_V1.pack(MAGIC, 1, 31, 3, 1, keys_offset) + b"".join(slots) + key)
+        with SnapshotHashTable(self.filename) as snapshot:
+            self.assertEqual(snapshot.hash_function, LinearProbeHashTable.POLYNOMIAL_HASH)
+            self.assertEqual(snapshot["word"], 5)
+            self.assertFalse("other" in snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()